@@ -0,0 +1,213 @@
+"""
+Vectorized evaluation of many 3x3 positions at once
+
+Boards are given as a NumPy integer array of shape (N, 9), one row per board in
+cell order (row * 3 + col), with 0 for an empty cell, 1 for X and 2 for O. Win
+detection tests the eight line masks of all boards in one pass and best moves
+are gathered from the opening book with a single indexed lookup, so the cost
+per board is a few array operations instead of a Python call chain.
+
+Usage:
+    python Batch_Eval.py [--count 1000000] [--scalar-count N] [--seed 0]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import Bitboard as bitboard
+import Opening_Book as book
+import Transposition_Table as tt
+
+EMPTY, X, O = 0, 1, 2
+
+_CELL_WEIGHTS = np.array(bitboard.CELL_BITS, np.int32)
+_WIN_MASKS = np.array(bitboard.WIN_MASKS, np.int32)
+_TERNARY = np.array(book.TERNARY, np.int32)
+# Lowest cell of every move mask, -1 for the empty mask
+_FIRST_CELL = np.array([cells[0] if cells else -1 for cells in book.MASK_CELLS], np.int8)
+
+# Function to convert boards to bitboards
+def to_bitboards(boards):
+    """
+    Convert encoded boards to one bitboard array per side.
+
+    Args:
+        boards (np.ndarray): Integer array of shape (N, 9).
+
+    Returns:
+        tuple: The X and O bitboards, each an int32 array of shape (N,).
+    """
+    boards = np.asarray(boards)
+    x_bits = (boards == X).astype(np.int32) @ _CELL_WEIGHTS
+    o_bits = (boards == O).astype(np.int32) @ _CELL_WEIGHTS
+    return x_bits, o_bits
+
+# Function to check many bitboards for a winning line
+def has_line(bits):
+    """
+    Check every bitboard against the eight winning lines.
+
+    Args:
+        bits (np.ndarray): Bitboards of shape (N,).
+
+    Returns:
+        np.ndarray: Boolean array of shape (N,), True where a line is complete.
+    """
+    return ((bits[:, None] & _WIN_MASKS) == _WIN_MASKS).any(axis=1)
+
+# Function to evaluate many boards at once
+def evaluate(boards, to_move=None, entries=None):
+    """
+    Compute the winner, draw flag, legal moves and best move of every board.
+
+    Args:
+        boards (np.ndarray): Integer array of shape (N, 9) with 0 (empty), 1 (X) or 2 (O) per cell.
+        to_move (int or np.ndarray): The side to move (1 or 2), for all boards or per board; by
+            default X moves when both sides have as many marks, otherwise O.
+        entries (array): The opening book to use; defaults to the lazily loaded table file.
+
+    Returns:
+        tuple: Four arrays:
+            winner (int8, shape (N,)): 1 or 2 for the side with a complete line, else 0.
+            draw (bool, shape (N,)): True where the board is full without a winner.
+            legal (bool, shape (N, 9)): True for the empty cells of a board that is still being played.
+            best_move (int8, shape (N,)): The cell Tic_Tac_Toe.computer_move would play for the side
+                to move, or -1 when the game is over.
+    """
+    boards = np.asarray(boards)
+    if boards.ndim != 2 or boards.shape[1] != 9:
+        raise ValueError(f"expected boards of shape (N, 9), got {boards.shape}")
+    x_bits, o_bits = to_bitboards(boards)
+
+    x_won = has_line(x_bits)
+    o_won = has_line(o_bits)
+    winner = np.where(x_won, X, np.where(o_won, O, EMPTY)).astype(np.int8)
+    full = (x_bits | o_bits) == bitboard.FULL_BOARD
+    draw = full & (winner == EMPTY)
+    playing = ~full & (winner == EMPTY)
+    legal = (boards == EMPTY) & playing[:, None]
+
+    if to_move is None:
+        x_to_move = np.count_nonzero(boards == X, axis=1) == np.count_nonzero(boards == O, axis=1)
+    else:
+        x_to_move = np.broadcast_to(np.asarray(to_move) == X, x_bits.shape)
+    cs_bits = np.where(x_to_move, x_bits, o_bits)
+    ps_bits = np.where(x_to_move, o_bits, x_bits)
+
+    if entries is None:
+        entries = book.get_entries()
+    if entries is not None:
+        table = np.frombuffer(entries, np.uint16)
+        masks = table[_TERNARY[cs_bits] + 2 * _TERNARY[ps_bits]] & book.MOVE_MASK
+        best_move = np.where(playing, _FIRST_CELL[masks], -1).astype(np.int8)
+        missing = np.flatnonzero(playing & (masks == 0))
+    else:
+        best_move = np.full(len(boards), -1, np.int8)
+        missing = np.flatnonzero(playing)
+
+    # Positions the book does not store (no book file, or unreachable mark counts) are searched
+    if len(missing):
+        shared = tt.get_shared_table()
+        for index in missing:
+            best_move[index] = bitboard.computer_move(int(cs_bits[index]), int(ps_bits[index]), shared)
+    return winner, draw, legal, best_move
+
+# Function to generate random reachable boards
+def random_boards(count, seed=0):
+    """
+    Generate boards by playing a random number of random moves, X first.
+
+    Games may continue past a win, so every outcome is represented.
+
+    Args:
+        count (int): The number of boards.
+        seed (int): The random seed.
+
+    Returns:
+        np.ndarray: Integer array of shape (count, 9).
+    """
+    rng = np.random.default_rng(seed)
+    order = np.argsort(rng.random((count, 9)), axis=1).argsort(axis=1)  # Move number of every cell
+    moves = rng.integers(0, 10, size=(count, 1))
+    return np.where(order < moves, np.where(order % 2 == 0, X, O), EMPTY).astype(np.int8)
+
+# Function to evaluate boards one at a time through the list API
+def evaluate_scalar(boards):
+    """
+    Reference implementation of evaluate() built on Tic_Tac_Toe, one board at a time.
+
+    Args:
+        boards (np.ndarray): Integer array of shape (N, 9).
+
+    Returns:
+        tuple: The same four arrays as evaluate().
+    """
+    return _evaluate_lists(_to_lists(boards))
+
+# Function to convert boards to the list representation of Tic_Tac_Toe
+def _to_lists(boards):
+    symbols = (None, 'X', 'O')
+    return [[[symbols[value] for value in row[start:start + 3]] for start in (0, 3, 6)]
+            for row in np.asarray(boards).tolist()]
+
+# Function to evaluate list boards one at a time
+def _evaluate_lists(lists):
+    import Tic_Tac_Toe as ttt
+    count = len(lists)
+    winner = np.zeros(count, np.int8)
+    draw = np.zeros(count, bool)
+    legal = np.zeros((count, 9), bool)
+    best_move = np.full(count, -1, np.int8)
+    for index, board in enumerate(lists):
+        if ttt.is_win(board, 'X'):
+            winner[index] = X
+        elif ttt.is_win(board, 'O'):
+            winner[index] = O
+        elif ttt.is_draw(board):
+            draw[index] = True
+        else:
+            legal[index] = [ttt.is_valid_move(board, *divmod(cell, 3)) for cell in range(9)]
+            marks = sum(row.count('X') - row.count('O') for row in board)
+            cs, ps = ('X', 'O') if marks == 0 else ('O', 'X')
+            row, col = ttt.computer_move(board, cs, ps)
+            best_move[index] = row * 3 + col
+    return winner, draw, legal, best_move
+
+# Command line entry point
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark batched against one-at-a-time position evaluation.")
+    parser.add_argument('--count', type=int, default=10 ** 6, help="boards evaluated by the batch API")
+    parser.add_argument('--scalar-count', type=int, help="boards evaluated one at a time (defaults to --count)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    scalar_count = min(args.scalar_count or args.count, args.count)
+
+    boards = random_boards(args.count, args.seed)
+    book.get_entries()  # Load the book outside the timed sections
+
+    start = time.perf_counter()
+    batch = evaluate(boards)
+    batch_seconds = time.perf_counter() - start
+
+    lists = _to_lists(boards[:scalar_count])  # Conversion to the list API is not timed
+    start = time.perf_counter()
+    scalar = _evaluate_lists(lists)
+    scalar_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        int(np.count_nonzero((b[:scalar_count] != s).reshape(scalar_count, -1).any(axis=1)))
+        for b, s in zip(batch, scalar)
+    )
+    batch_rate = args.count / batch_seconds
+    scalar_rate = scalar_count / scalar_seconds
+    print(f"batch:  {args.count:>9} boards in {batch_seconds:7.3f} s  ({batch_rate:,.0f} boards/s)")
+    print(f"scalar: {scalar_count:>9} boards in {scalar_seconds:7.3f} s  ({scalar_rate:,.0f} boards/s)")
+    print(f"speed-up: {batch_rate / scalar_rate:.0f}x, mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+# Run the command line entry point if the script is executed
+if __name__ == "__main__":
+    sys.exit(main())
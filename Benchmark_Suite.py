@@ -0,0 +1,388 @@
+"""
+Reproducible benchmark suite
+
+Measures the engine (computer_move from every reachable position, is_win and
+is_draw), the vision helpers (get_cell_number, end-to-end frames per second of
+the game and MediaPipe time per frame with and without the hand region of
+interest on recorded video), rendering (draw_grid, draw_marks, the cached
+overlay and the allocation-free capture-to-overlay frame path) and the import
+time of the engine modules. Inputs are fixed and every timing is the best of
+several repeats, so runs on the same machine are comparable.
+
+Results are written as JSON. Given a baseline file, every metric is compared
+against it and the run fails when one regressed by more than the threshold:
+
+    python Benchmark_Suite.py --save-baseline baseline.json
+    python Benchmark_Suite.py --baseline baseline.json [--threshold 0.10] [--output results.json]
+    python Benchmark_Suite.py --group engine --group rendering
+"""
+
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import Import_Benchmark
+import Opening_Book as book
+import Tic_Tac_Toe as ttt
+import Transposition_Table as tt
+
+GROUPS = ('engine', 'vision', 'rendering', 'imports')
+FRAME_SHAPE = (720, 1280, 3)  # The camera resolution the game is played at
+DEFAULT_THRESHOLD = 0.10
+
+
+# Function to time a callable
+def best_time(func, number, repeat=5):
+    """
+    Time func() called number times, keeping the fastest of several repeats.
+
+    Args:
+        func (callable): The code to time.
+        number (int): Calls per repeat.
+        repeat (int): The number of repeats.
+
+    Returns:
+        float: The fastest time per call in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+# Function to build a metric entry
+def _metric(value, unit, better='lower'):
+    return {'value': value, 'unit': unit, 'better': better}
+
+# Function to get the list board of every reachable position
+def _reachable_boards():
+    boards = []
+    for cs_bits, ps_bits in book.reachable_positions():
+        board = [[None] * 3 for _ in range(3)]
+        for cell in range(9):
+            if cs_bits >> cell & 1:
+                board[cell // 3][cell % 3] = 'O'
+            elif ps_bits >> cell & 1:
+                board[cell // 3][cell % 3] = 'X'
+        boards.append(board)
+    return boards
+
+# Function to benchmark the game engine
+def bench_engine():
+    """
+    Benchmark the engine on every reachable 3x3 position.
+
+    Returns:
+        dict: Metrics by name.
+    """
+    boards = _reachable_boards()
+    book.get_entries()  # Load the book before timing
+
+    def all_moves(**options):
+        for board in boards:
+            ttt.computer_move(board, 'O', 'X', **options)
+
+    def all_moves_searched():
+        all_moves(use_book=False, table=tt.TranspositionTable())  # Cold table every repeat
+
+    metrics = {
+        'computer_move_all_positions_book': _metric(best_time(all_moves, 5, repeat=7), 's'),
+        'computer_move_all_positions_search': _metric(best_time(all_moves_searched, 1, repeat=3), 's'),
+        'is_win_us': _metric(1e6 * best_time(lambda: [ttt.is_win(board, 'X') for board in boards], 10, repeat=7)
+                             / len(boards), 'us'),
+        'is_draw_us': _metric(1e6 * best_time(lambda: [ttt.is_draw(board) for board in boards], 10, repeat=7)
+                              / len(boards), 'us'),
+    }
+    metrics['computer_move_book_us'] = _metric(
+        1e6 * metrics['computer_move_all_positions_book']['value'] / len(boards), 'us')
+    return metrics
+
+# Function to write a synthetic clip to a video file
+def _write_clip(path, frame_count):
+    import cv2
+    from Frame_Source import SyntheticSource
+    source = SyntheticSource(frame_count)
+    writer = None
+    while True:
+        ok, frame = source.read()
+        if not ok:
+            break
+        if writer is None:
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), source.fps,
+                                     (frame.shape[1], frame.shape[0]))
+        writer.write(frame)
+    writer.release()
+
+# Function to measure the game's frame rate on recorded input
+def _game_fps(video):
+    try:
+        import mediapipe  # noqa: F401 (the game needs it)
+    except ImportError:
+        return None
+    import Handy_Tic_Tac_Toe as game
+    frame_times = []
+
+    def on_frame(name, image):
+        if name == 'Webcam Frame':
+            frame_times.append(time.perf_counter())
+
+    with contextlib.redirect_stdout(io.StringIO()):  # The game prints its own reports
+        game.main(source=video, realtime=False, headless=True, on_frame=on_frame, record_path=None)
+    if len(frame_times) < 2:
+        return None
+    return (len(frame_times) - 1) / (frame_times[-1] - frame_times[0])
+
+# Function to measure hand tracking time per frame on recorded input
+def _hand_tracking_ms(video, roi_tracking):
+    try:
+        import mediapipe as mp
+    except ImportError:
+        return None
+    import cv2
+    from Hand_ROI import RoiHands
+    hands = mp.solutions.hands.Hands(max_num_hands=1, min_detection_confidence=0.7)
+    tracker = RoiHands(hands) if roi_tracking else hands
+    capture = cv2.VideoCapture(video)
+    times = []
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frame_rgb = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+        start = time.perf_counter()
+        tracker.process(frame_rgb)
+        times.append(time.perf_counter() - start)
+    capture.release()
+    hands.close()
+    if not times:
+        return None
+    return 1e3 * sum(times) / len(times)
+
+# Function to benchmark the vision path
+def bench_vision(video=None, frame_count=600):
+    """
+    Benchmark cell lookup and the whole game on recorded input.
+
+    Args:
+        video (str): A recorded video to play; by default a synthetic clip is generated.
+        frame_count (int): The length of the generated clip.
+
+    Returns:
+        dict: Metrics by name; end-to-end FPS and hand tracking times (whole frame and
+            region of interest) are left out when MediaPipe is not installed.
+    """
+    import numpy as np
+    import Helper_Functions as helper
+    frame = np.zeros(FRAME_SHAPE, np.uint8)
+    points = [(x, y) for x in range(0, 1280, 37) for y in range(0, 720, 41)]
+    metrics = {
+        'get_cell_number_us': _metric(
+            1e6 * best_time(lambda: [helper.get_cell_number(frame, point) for point in points], 50) / len(points),
+            'us'),
+    }
+
+    def recorded(clip):
+        fps = _game_fps(clip)
+        if fps is not None:
+            metrics['game_fps_recorded'] = _metric(fps, 'fps', better='higher')
+        for name, roi_tracking in (('hands_process_full_ms', False), ('hands_process_roi_ms', True)):
+            ms = _hand_tracking_ms(clip, roi_tracking)
+            if ms is not None:
+                metrics[name] = _metric(ms, 'ms')
+
+    if video is None:
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            clip = os.path.join(directory, 'clip.mp4')
+            _write_clip(clip, frame_count)
+            recorded(clip)
+    else:
+        recorded(video)
+    return metrics
+
+# Function to count frames of the game's frame path that allocate a full-size array
+def _allocating_frames(step, frames, frame_bytes):
+    import tracemalloc
+    tracemalloc.start()
+    allocating = 0
+    try:
+        for _ in range(frames):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            step()
+            if tracemalloc.get_traced_memory()[1] - current >= frame_bytes // 2:
+                allocating += 1
+    finally:
+        tracemalloc.stop()
+    return allocating
+
+# Function to benchmark rendering
+def bench_rendering():
+    """
+    Benchmark drawing the board onto a camera-sized frame, and the whole per-frame
+    path of the game (capture into a pooled buffer, flip, RGB conversion, overlay).
+
+    Returns:
+        dict: Metrics by name, in milliseconds per frame, plus the number of steady-state
+            frames of the frame path that allocated a full-size array (should be 0).
+    """
+    import cv2
+    import numpy as np
+    import Helper_Functions as helper
+    from Frame_Buffers import FramePool
+    from Frame_Source import SyntheticSource
+    from Overlay import BoardOverlay
+    frame = np.zeros(FRAME_SHAPE, np.uint8)
+    board = [['X', None, 'O'], [None, 'X', None], ['O', None, 'X']]
+    overlay = BoardOverlay()
+    overlay.composite(frame, board)  # Render the cached layer once
+
+    pool = FramePool()
+    source = SyntheticSource(None, FRAME_SHAPE[1], FRAME_SHAPE[0], pool=pool)
+
+    def frame_path():
+        captured = source.read()[1]
+        cv2.flip(captured, 1, dst=captured)
+        pool.keep('rgb', cv2.cvtColor(captured, cv2.COLOR_BGR2RGB, dst=pool.slot('rgb')))
+        overlay.composite(captured, board)
+        pool.release(captured)
+
+    for _ in range(3):
+        frame_path()  # Fill the pool
+    return {
+        'draw_grid_ms': _metric(1e3 * best_time(lambda: helper.draw_grid(frame), 100), 'ms'),
+        'draw_marks_ms': _metric(1e3 * best_time(lambda: helper.draw_marks(frame, board), 100), 'ms'),
+        'overlay_composite_ms': _metric(1e3 * best_time(lambda: overlay.composite(frame, board), 50), 'ms'),
+        'frame_path_ms': _metric(1e3 * best_time(frame_path, 50), 'ms'),
+        'frame_path_allocating_frames': _metric(_allocating_frames(frame_path, 100, frame.nbytes), 'frames'),
+    }
+
+# Function to benchmark module import times
+def bench_imports():
+    """
+    Measure the import time of the engine modules in fresh interpreters.
+
+    Returns:
+        dict: Metrics by name, in milliseconds.
+    """
+    return {f'import_{module}_ms': _metric(Import_Benchmark.measure(module, repeat=3)['ms'], 'ms')
+            for module in Import_Benchmark.ENGINE_MODULES}
+
+# Function to describe the machine and revision a run was made on
+def environment():
+    """
+    Describe the run.
+
+    Returns:
+        dict: Python version, platform, CPU count, library versions, git revision and time.
+    """
+    info = {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    for name in ('numpy', 'cv2', 'mediapipe'):
+        try:
+            info[name] = getattr(__import__(name), '__version__', None)
+        except ImportError:
+            info[name] = None
+    try:
+        info['revision'] = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                          cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        info['revision'] = None
+    return info
+
+# Function to run the suite
+def run(groups=GROUPS, video=None):
+    """
+    Run the selected benchmark groups.
+
+    Args:
+        groups (tuple): Names from GROUPS.
+        video (str): Recorded video for the end-to-end benchmark.
+
+    Returns:
+        dict: 'environment' and 'metrics' (name -> {'value', 'unit', 'better'}).
+    """
+    benches = {'engine': bench_engine, 'vision': lambda: bench_vision(video), 'rendering': bench_rendering,
+               'imports': bench_imports}
+    metrics = {}
+    for group in groups:
+        metrics.update({f'{group}.{name}': metric for name, metric in benches[group]().items()})
+    return {'environment': environment(), 'metrics': metrics}
+
+# Function to compare results with a baseline
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare every metric present in both runs.
+
+    Args:
+        results (dict): The current run.
+        baseline (dict): The baseline run.
+        threshold (float): Relative change in the worse direction counted as a regression; for metrics
+            with a zero baseline (such as allocation counts) the absolute change.
+
+    Returns:
+        list: (name, baseline value, current value, relative change, status) tuples, where the change
+            is positive when the metric got worse (infinite when it left a zero baseline) and status
+            is 'ok', 'REGRESSION' or 'improved'.
+    """
+    rows = []
+    for name, metric in results['metrics'].items():
+        old = baseline['metrics'].get(name)
+        if old is None:
+            continue
+        change = metric['value'] - old['value']
+        if metric['better'] == 'higher':
+            change = -change
+        if old['value']:
+            change /= old['value']
+        elif abs(change) > threshold:
+            change = math.copysign(math.inf, change)  # Any real move away from zero
+        else:
+            change = 0.0
+        status = 'REGRESSION' if change > threshold else 'improved' if change < -threshold else 'ok'
+        rows.append((name, old['value'], metric['value'], change, status))
+    return rows
+
+# Command line entry point
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare it with a baseline.")
+    parser.add_argument('--group', action='append', choices=GROUPS, dest='groups',
+                        help="benchmark group to run (repeatable; defaults to all)")
+    parser.add_argument('--video', help="recorded video for the end-to-end benchmark (default: synthetic clip)")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    parser.add_argument('--baseline', help="compare with the results in this file")
+    parser.add_argument('--save-baseline', help="write the results to this file as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown reported as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    results = run(tuple(args.groups or GROUPS), args.video)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as results_file:
+                json.dump(results, results_file, indent=2)
+
+    if not args.baseline:
+        for name, metric in results['metrics'].items():
+            print(f"{name:<50} {metric['value']:12.4f} {metric['unit']}")
+        return 0
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    rows = compare(results, baseline, args.threshold)
+    for name, old, new, change, status in rows:
+        unit = results['metrics'][name]['unit']
+        print(f"{name:<50} {old:12.4f} -> {new:12.4f} {unit:<3} {100 * change:+7.1f}%  {status}")
+    return 1 if any(status == 'REGRESSION' for *_, status in rows) else 0
+
+# Run the command line entry point if the script is executed
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+Bitboard Tic Tac Toe engine
+
+Each player's marks are stored in a 9-bit integer where bit ``row * 3 + col``
+is set when the player owns that cell (the same numbering used by
+``Helper_Functions.get_cell_number``).
+"""
+
+import time
+
+import Transposition_Table as tt
+
+FULL_BOARD = 0b111111111  # All nine cells occupied
+
+# Bit masks of the eight winning lines
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # Rows
+    0b001001001, 0b010010010, 0b100100100,  # Columns
+    0b100010001, 0b001010100,  # Diagonals
+)
+
+# Bit of every cell, indexed by cell number
+CELL_BITS = tuple(1 << cell for cell in range(9))
+
+# WIN_TABLE[bits] is True when the marks in bits complete a winning line
+WIN_TABLE = tuple(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(1 << 9))
+
+# Function to initialize the bitboards and turn
+def initialization():
+    """
+    Initialize empty bitboards and the starting turn.
+
+    Returns:
+        tuple: A tuple (x_bits, o_bits, turn) with both bitboards empty and turn 0 (player).
+    """
+    return 0, 0, 0
+
+# Function to check for a win condition
+def is_win(bits):
+    """
+    Check if the given bitboard contains a winning line.
+
+    Args:
+        bits (int): The bitboard of one player.
+
+    Returns:
+        bool: True if the player has won, False otherwise.
+    """
+    return WIN_TABLE[bits]
+
+# Function to check if the game is a draw
+def is_draw(x_bits, o_bits):
+    """
+    Check if all cells are filled.
+
+    Args:
+        x_bits (int): The bitboard of X.
+        o_bits (int): The bitboard of O.
+
+    Returns:
+        bool: True if the board is full, False otherwise.
+    """
+    return (x_bits | o_bits) == FULL_BOARD
+
+# Function to determine if a move is valid
+def is_valid_move(x_bits, o_bits, cell):
+    """
+    Check if a move is valid (i.e., the selected cell is empty).
+
+    Args:
+        x_bits (int): The bitboard of X.
+        o_bits (int): The bitboard of O.
+        cell (int): The cell number (0-8) of the move.
+
+    Returns:
+        bool: True if the move is valid, False otherwise.
+    """
+    return not (x_bits | o_bits) & CELL_BITS[cell]
+
+# Function to convert a list board into a bitboard
+def from_list(board, player_symbol):
+    """
+    Build the bitboard of one player from a 3x3 list board.
+
+    Args:
+        board (list): The 3x3 game board.
+        player_symbol (str): The symbol of the player ('X' or 'O').
+
+    Returns:
+        int: The bitboard of the player's marks.
+    """
+    bits = 0
+    for ri in range(3):
+        row = board[ri]
+        for ci in range(3):
+            if row[ci] == player_symbol:
+                bits |= CELL_BITS[ri * 3 + ci]
+    return bits
+
+# Function to convert bitboards back into a list board
+def to_list(x_bits, o_bits):
+    """
+    Build a 3x3 list board from the two bitboards.
+
+    Args:
+        x_bits (int): The bitboard of X.
+        o_bits (int): The bitboard of O.
+
+    Returns:
+        list: The 3x3 game board with 'X', 'O' or None in each cell.
+    """
+    board = [[None for _ in range(3)] for _ in range(3)]
+    for cell in range(9):
+        if x_bits & CELL_BITS[cell]:
+            board[cell // 3][cell % 3] = 'X'
+        elif o_bits & CELL_BITS[cell]:
+            board[cell // 3][cell % 3] = 'O'
+    return board
+
+# Alpha-Beta Pruning algorithm to evaluate game states
+def alpha_beta(cs_bits, ps_bits, depth, alpha, beta, is_maximizing, table=None, stats=None):
+    """
+    Alpha-Beta Pruning over bitboards.
+
+    Args:
+        cs_bits (int): The bitboard of the computer.
+        ps_bits (int): The bitboard of the player.
+        depth (int): The current depth in the game tree.
+        alpha (float): The best value that the maximizer can guarantee.
+        beta (float): The best value that the minimizer can guarantee.
+        is_maximizing (bool): Flag indicating if the computer is to move.
+        table (TranspositionTable): Optional table used to reuse results of already searched positions.
+        stats (SearchStats): Optional statistics to count nodes, cutoffs and the depth reached into.
+
+    Returns:
+        int: The evaluation score of the current game state (1 win, 0 draw, -1 loss).
+    """
+    if stats is not None:
+        return _alpha_beta_instrumented(cs_bits, ps_bits, depth, alpha, beta, is_maximizing, table, stats)
+
+    # Check for terminal states (win/loss/draw) and return their scores
+    if WIN_TABLE[cs_bits]:
+        return 1
+    if WIN_TABLE[ps_bits]:
+        return -1
+    occupied = cs_bits | ps_bits
+    if occupied == FULL_BOARD:
+        return 0
+
+    # Reuse a stored score when its bound settles this window
+    if table is not None:
+        alpha_orig, beta_orig = alpha, beta
+        key = tt.canonical_key(cs_bits, ps_bits, is_maximizing)
+        entry = table.get(key)
+        if entry is not None:
+            score, flag = entry
+            if flag == tt.EXACT:
+                return score
+            if flag == tt.LOWER and score > alpha:
+                alpha = score
+            elif flag == tt.UPPER and score < beta:
+                beta = score
+            if beta <= alpha:
+                return score
+
+    # Maximizing player's turn
+    if is_maximizing:
+        max_eval = -2  # Below any reachable score
+        for bit in CELL_BITS:
+            if not occupied & bit:
+                eval = alpha_beta(cs_bits | bit, ps_bits, depth + 1, alpha, beta, False, table)
+                if eval > max_eval:
+                    max_eval = eval
+                    if eval > alpha:
+                        alpha = eval
+                    if beta <= alpha:
+                        break
+        best_eval = max_eval
+    # Minimizing player's turn
+    else:
+        min_eval = 2  # Above any reachable score
+        for bit in CELL_BITS:
+            if not occupied & bit:
+                eval = alpha_beta(cs_bits, ps_bits | bit, depth + 1, alpha, beta, True, table)
+                if eval < min_eval:
+                    min_eval = eval
+                    if eval < beta:
+                        beta = eval
+                    if beta <= alpha:
+                        break
+        best_eval = min_eval
+
+    if table is not None:
+        if best_eval <= alpha_orig:
+            table.store(key, best_eval, tt.UPPER)
+        elif best_eval >= beta_orig:
+            table.store(key, best_eval, tt.LOWER)
+        else:
+            table.store(key, best_eval, tt.EXACT)
+    return best_eval
+
+# Alpha-Beta Pruning that also records statistics (kept separate so alpha_beta stays lean)
+def _alpha_beta_instrumented(cs_bits, ps_bits, depth, alpha, beta, is_maximizing, table, stats):
+    stats.nodes += 1
+    if depth > stats.max_depth:
+        stats.max_depth = depth
+    if WIN_TABLE[cs_bits]:
+        return 1
+    if WIN_TABLE[ps_bits]:
+        return -1
+    occupied = cs_bits | ps_bits
+    if occupied == FULL_BOARD:
+        return 0
+
+    if table is not None:
+        alpha_orig, beta_orig = alpha, beta
+        key = tt.canonical_key(cs_bits, ps_bits, is_maximizing)
+        entry = table.get(key)
+        if entry is not None:
+            score, flag = entry
+            if flag == tt.EXACT:
+                return score
+            if flag == tt.LOWER and score > alpha:
+                alpha = score
+            elif flag == tt.UPPER and score < beta:
+                beta = score
+            if beta <= alpha:
+                return score
+
+    best_eval = -2 if is_maximizing else 2
+    for bit in CELL_BITS:
+        if not occupied & bit:
+            if is_maximizing:
+                eval = _alpha_beta_instrumented(cs_bits | bit, ps_bits, depth + 1, alpha, beta, False, table, stats)
+                if eval > best_eval:
+                    best_eval = eval
+                    if eval > alpha:
+                        alpha = eval
+            else:
+                eval = _alpha_beta_instrumented(cs_bits, ps_bits | bit, depth + 1, alpha, beta, True, table, stats)
+                if eval < best_eval:
+                    best_eval = eval
+                    if eval < beta:
+                        beta = eval
+            if beta <= alpha:
+                stats.cutoffs += 1
+                break
+
+    if table is not None:
+        if best_eval <= alpha_orig:
+            table.store(key, best_eval, tt.UPPER)
+        elif best_eval >= beta_orig:
+            table.store(key, best_eval, tt.LOWER)
+        else:
+            table.store(key, best_eval, tt.EXACT)
+    return best_eval
+
+# Function to determine the computer's move using Alpha-Beta Pruning
+def computer_move(cs_bits, ps_bits, table=None, stats=None):
+    """
+    Determine the optimal move for the computer using the Alpha-Beta Pruning algorithm.
+
+    Args:
+        cs_bits (int): The bitboard of the computer.
+        ps_bits (int): The bitboard of the player.
+        table (TranspositionTable): Optional table reused across calls and games.
+        stats (SearchStats): Optional statistics filled in with the search work and the time per root move.
+
+    Returns:
+        int: The cell number (0-8) of the best move or None if no valid move is found.
+    """
+    if stats is not None:
+        return _instrumented_computer_move(cs_bits, ps_bits, table, stats)
+    best_score = -2
+    best_move = None
+    occupied = cs_bits | ps_bits
+    for cell in range(9):
+        bit = CELL_BITS[cell]
+        if not occupied & bit:
+            score = alpha_beta(cs_bits | bit, ps_bits, 0, -float('inf'), float('inf'), False, table)
+            if score > best_score:
+                best_score = score
+                best_move = cell
+    return best_move
+
+# Function to run computer_move while recording statistics
+def _instrumented_computer_move(cs_bits, ps_bits, table, stats):
+    start = time.perf_counter()
+    if table is not None:
+        hits, probes = table.hits, table.hits + table.misses
+    best_score = -2
+    best_move = None
+    occupied = cs_bits | ps_bits
+    for cell in range(9):
+        bit = CELL_BITS[cell]
+        if not occupied & bit:
+            move_start = time.perf_counter()
+            score = alpha_beta(cs_bits | bit, ps_bits, 1, -float('inf'), float('inf'), False, table, stats)
+            stats.add_root_move(cell, score, 1000 * (time.perf_counter() - move_start))
+            if score > best_score:
+                best_score = score
+                best_move = cell
+    if table is not None:
+        stats.tt_hits += table.hits - hits
+        stats.tt_probes += table.hits + table.misses - probes
+    stats.nodes += 1  # The root
+    stats.elapsed_ms += 1000 * (time.perf_counter() - start)
+    return best_move
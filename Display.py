@@ -0,0 +1,143 @@
+"""
+Output targets for rendered frames
+
+WindowDisplay shows frames with OpenCV HighGUI windows. HeadlessDisplay never
+opens a window or waits for keys; it writes frames to a video file and/or
+hands them to a callback, so games can run on display-less servers.
+"""
+
+import cv2
+
+
+class WindowDisplay:
+    """
+    Show frames in OpenCV windows.
+    """
+
+    def __init__(self):
+        self._sizes = {}
+        self._created = set()
+
+    def configure(self, name, width, height):
+        """
+        Set the size of a resizable window; takes effect when it is first shown.
+
+        Args:
+            name (str): The window name.
+            width (int): The window width in pixels.
+            height (int): The window height in pixels.
+        """
+        self._sizes[name] = (width, height)
+
+    def show(self, name, image):
+        """
+        Show an image in the named window, creating the window on first use.
+
+        Args:
+            name (str): The window name.
+            image (np.ndarray): The BGR image to show.
+        """
+        if name not in self._created:
+            if name in self._sizes:
+                cv2.namedWindow(name, cv2.WINDOW_NORMAL)
+                cv2.resizeWindow(name, *self._sizes[name])
+            self._created.add(name)
+        cv2.imshow(name, image)
+
+    def wait_key(self, delay=1):
+        """
+        Process window events and read a key press.
+
+        Args:
+            delay (int): Milliseconds to wait for a key.
+
+        Returns:
+            int: The key code or -1 if no key was pressed.
+        """
+        return cv2.waitKey(delay)
+
+    def hide(self, name):
+        """
+        Close one window if it is open.
+
+        Args:
+            name (str): The window name.
+        """
+        if name in self._created:
+            cv2.destroyWindow(name)
+            self._created.discard(name)
+
+    def close(self):
+        """
+        Close all windows.
+        """
+        cv2.destroyAllWindows()
+        self._created.clear()
+
+
+class HeadlessDisplay:
+    """
+    Record frames without any windowing.
+
+    Args:
+        output_path (str): Optional video file receiving the frames of the recorded window.
+        callback (callable): Optional function called as callback(name, image) for every shown frame.
+        record (str): The window whose frames are written to output_path.
+        fps (float): The frame rate of the output video.
+    """
+
+    def __init__(self, output_path=None, callback=None, record='Webcam Frame', fps=30.0):
+        self.output_path = output_path
+        self.callback = callback
+        self.record = record
+        self.fps = fps
+        self.frames_written = 0
+        self._writer = None
+        self._size = None
+
+    def configure(self, name, width, height):
+        """
+        Accepted for compatibility with WindowDisplay; there are no windows to size.
+        """
+
+    def show(self, name, image):
+        """
+        Pass a frame to the callback and, for the recorded window, the output video.
+
+        Args:
+            name (str): The window the frame would be shown in.
+            image (np.ndarray): The BGR image.
+        """
+        if self.callback is not None:
+            self.callback(name, image)
+        if self.output_path is None or name != self.record:
+            return
+        if self._writer is None:
+            self._size = (image.shape[1], image.shape[0])
+            self._writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, self._size)
+        if (image.shape[1], image.shape[0]) != self._size:
+            image = cv2.resize(image, self._size)
+        self._writer.write(image)
+        self.frames_written += 1
+
+    def wait_key(self, delay=1):
+        """
+        Return immediately; no keys can be pressed without a window.
+
+        Returns:
+            int: Always -1.
+        """
+        return -1
+
+    def hide(self, name):
+        """
+        Accepted for compatibility with WindowDisplay; there are no windows to close.
+        """
+
+    def close(self):
+        """
+        Finish the output video.
+        """
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
@@ -0,0 +1,164 @@
+"""
+Reusable frame buffers
+
+A 1280x720 BGR frame is 2.7 MB, and every cv2.flip, cv2.cvtColor or copy
+without a destination allocates a new one. FramePool keeps full-size buffers
+for reuse instead:
+
+    - acquire()/release() hand out buffers that travel between threads (a
+      captured frame moving down the pipeline) and come back when done with;
+    - slot()/keep() hold one named scratch buffer per step for code running on
+      a single thread, to pass as dst= to OpenCV.
+
+The pool counts every full-size array it had to allocate, and every OpenCV
+result that was not written into the buffer passed as dst=, so report() shows
+whether steady-state frames allocate at all.
+
+Usage:
+    frame = cv2.flip(captured, 1, dst=pool.acquire())
+    rgb = pool.keep('rgb', cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=pool.slot('rgb')))
+    ...
+    pool.release(frame)
+    pool.frame()  # Once per frame, to date allocations
+"""
+
+import threading
+
+import numpy as np
+
+
+class FramePool:
+    """
+    Free list of same-shape frame buffers plus named scratch buffers, with allocation counting.
+
+    Args:
+        max_free (int): Buffers kept on the free list; more released buffers are left to the garbage collector.
+    """
+
+    def __init__(self, max_free=8):
+        self.max_free = max_free
+        self.shape = None  # Shape of the frames, learned from the first released or kept buffer
+        self._free = []
+        self._slots = {}
+        self._lock = threading.Lock()
+        self.allocations = 0  # Full-size arrays created by the pool or by OpenCV calls
+        self.reuses = 0
+        self.frames = 0
+        self.last_allocation_frame = None
+
+    def _count_allocation(self):
+        with self._lock:
+            self.allocations += 1
+            self.last_allocation_frame = self.frames
+
+    def acquire(self, shape=None):
+        """
+        Get a buffer for a frame; its contents are undefined.
+
+        Args:
+            shape (tuple): The buffer shape; defaults to the shape of the frames seen so far.
+
+        Returns:
+            np.ndarray: A uint8 buffer, or None while the frame shape is not known yet.
+        """
+        shape = shape or self.shape
+        if shape is None:
+            return None
+        with self._lock:
+            while self._free:
+                buffer = self._free.pop()
+                if buffer.shape == shape:
+                    self.reuses += 1
+                    return buffer
+        self._count_allocation()
+        return np.empty(shape, np.uint8)
+
+    def release(self, buffer):
+        """
+        Return a buffer once nothing refers to it any more.
+
+        Args:
+            buffer (np.ndarray): A buffer from acquire() or a frame to adopt; None is ignored.
+        """
+        if buffer is None or buffer.base is not None:
+            return  # Views share memory with another array and cannot be handed out again
+        with self._lock:
+            self.shape = buffer.shape
+            if len(self._free) < self.max_free and not any(free is buffer for free in self._free):
+                self._free.append(buffer)
+
+    def track(self, result, buffer):
+        """
+        Count an allocation if an operation did not write into the buffer it was given.
+
+        Args:
+            result (np.ndarray): What the operation returned.
+            buffer (np.ndarray): The dst= buffer it was given (None counts as an allocation).
+
+        Returns:
+            np.ndarray: result.
+        """
+        if result is not None:
+            if result is not buffer:
+                self._count_allocation()
+            self.shape = self.shape or result.shape
+        return result
+
+    def slot(self, name):
+        """
+        Get the named scratch buffer, to pass as dst=.
+
+        Args:
+            name (str): The buffer name.
+
+        Returns:
+            np.ndarray: The buffer kept under name, or None before the first keep().
+        """
+        return self._slots.get(name)
+
+    def keep(self, name, result):
+        """
+        Store the result of an operation as the named scratch buffer.
+
+        Args:
+            name (str): The buffer name.
+            result (np.ndarray): The array written by the operation given slot(name) as dst=.
+
+        Returns:
+            np.ndarray: result.
+        """
+        if self._slots.get(name) is not result:
+            self._count_allocation()  # First use, or OpenCV reallocated because the shape changed
+            self._slots[name] = result
+            self.shape = self.shape or result.shape
+        return result
+
+    def frame(self):
+        """
+        Mark the end of a frame.
+        """
+        self.frames += 1
+
+    def stats(self):
+        """
+        Summarize buffer use.
+
+        Returns:
+            dict: Full-size 'allocations', 'reuses' of pooled buffers, 'frames' and the
+                'last_allocation_frame' (None if nothing was allocated).
+        """
+        return {'allocations': self.allocations, 'reuses': self.reuses, 'frames': self.frames,
+                'last_allocation_frame': self.last_allocation_frame}
+
+    def report(self):
+        """
+        Format the statistics as one line.
+
+        Returns:
+            str: A human-readable summary.
+        """
+        stats = self.stats()
+        last = stats['last_allocation_frame']
+        when = f"the last before frame {last + 1}" if last is not None else "none"
+        return (f"Frame buffers: {stats['allocations']} full-size allocations ({when}) in {stats['frames']} frames, "
+                f"{stats['reuses']} reuses")
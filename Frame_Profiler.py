@@ -0,0 +1,270 @@
+"""
+Frame-loop profiler
+
+Times named spans of the frame loop (capture, colour conversion, hand
+inference, drawing, display...) on whichever thread runs them, keeps a rolling
+window per span for p50/p95/p99 latencies, measures FPS and capture-to-display
+latency per frame, and can record every span as a Chrome trace event. The
+trace file opens in chrome://tracing or https://ui.perfetto.dev.
+
+Usage:
+    profiler = FrameProfiler(trace_path='trace.json')
+    with profiler.span('inference'):  # Any thread
+        ...
+    profiler.lap('render')  # Frame-loop thread: time since the previous lap or frame
+    profiler.frame(capture_time)
+    ...
+    profiler.write_trace()
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+PERCENTILES = (50, 95, 99)
+
+
+class _Span:
+    """
+    Context manager timing one block for a profiler.
+    """
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class _NoSpan:
+    """
+    Context manager that does nothing, used while profiling is disabled.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+# Function to compute percentiles of a list of durations
+def percentiles(values, points=PERCENTILES):
+    """
+    Compute nearest-rank percentiles.
+
+    Args:
+        values (iterable): The samples.
+        points (tuple): The percentiles to compute (0-100).
+
+    Returns:
+        dict: The value at each percentile, or 0.0 for each when there are no samples.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return {point: 0.0 for point in points}
+    last = len(ordered) - 1
+    return {point: ordered[min(int(round(point / 100 * last)), last)] for point in points}
+
+
+class FrameProfiler:
+    """
+    Rolling per-span latency statistics, FPS and an optional Chrome trace.
+
+    Args:
+        window (int): The number of recent samples kept per span and for frame statistics.
+        trace_path (str): Optional Chrome trace JSON file written by write_trace().
+        max_trace_events (int): Trace events kept in memory; later events are not recorded.
+        enabled (bool): When False, span() returns a no-op and nothing is recorded.
+        hud_interval (float): Seconds between recomputations of the HUD text.
+    """
+
+    def __init__(self, window=300, trace_path=None, max_trace_events=500000, enabled=True, hud_interval=0.5):
+        self.window = window
+        self.trace_path = trace_path
+        self.max_trace_events = max_trace_events
+        self.enabled = enabled
+        self.hud_interval = hud_interval
+        self.spans = {}  # Span name -> deque of recent durations in seconds
+        self.counts = {}  # Span name -> total number of samples
+        self.frame_times = deque(maxlen=window)  # perf_counter time at the end of each frame
+        self.frame_latencies = deque(maxlen=window)  # Capture-to-display seconds of recent frames
+        self.frames = 0
+        self._origin = time.perf_counter()
+        self._lap = self._origin  # End of the previous lap on the frame-loop thread
+        self._events = [] if trace_path else None
+        self._threads = {}  # Thread id -> name, for the trace
+        self._hud_cache = ([], 0.0)
+
+    def span(self, name):
+        """
+        Time a block of code.
+
+        Args:
+            name (str): The span name.
+
+        Returns:
+            context manager: Records the block's duration under name when it exits.
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start, end):
+        """
+        Record one span from explicit perf_counter times.
+
+        Args:
+            name (str): The span name.
+            start (float): The perf_counter time the span started.
+            end (float): The perf_counter time the span ended.
+        """
+        if not self.enabled:
+            return
+        samples = self.spans.get(name)
+        if samples is None:
+            samples = self.spans.setdefault(name, deque(maxlen=self.window))
+        samples.append(end - start)
+        self.counts[name] = self.counts.get(name, 0) + 1
+        events = self._events
+        if events is not None and len(events) < self.max_trace_events:
+            thread_id = threading.get_ident()
+            if thread_id not in self._threads:
+                self._threads[thread_id] = threading.current_thread().name
+            events.append((name, start, end, thread_id))
+
+    def lap(self, name):
+        """
+        Record the time since the previous lap (or the end of the previous frame) under name.
+
+        Meant for the frame-loop thread, whose steps run one after another.
+
+        Args:
+            name (str): The span name.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.record(name, self._lap, now)
+        self._lap = now
+
+    def frame(self, capture_time=None):
+        """
+        Mark the end of a frame.
+
+        Args:
+            capture_time (float): The perf_counter time the frame was captured, for the latency statistics.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._lap = now
+        self.frame_times.append(now)
+        if capture_time is not None:
+            self.frame_latencies.append(now - capture_time)
+        self.frames += 1
+
+    def fps(self):
+        """
+        Get the recent frame rate.
+
+        Returns:
+            float: Frames per second over the window.
+        """
+        times = self.frame_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def stats(self):
+        """
+        Summarize the recent frames and spans.
+
+        Returns:
+            dict: 'frames', 'fps', 'latency_ms' percentiles (capture to display) and a 'spans'
+                dict with the sample count and 'p50'/'p95'/'p99'/'mean' in milliseconds per span.
+        """
+        spans = {}
+        for name, samples in list(self.spans.items()):
+            samples = list(samples)
+            entry = {f'p{point}': 1000 * value for point, value in percentiles(samples).items()}
+            entry['mean'] = 1000 * sum(samples) / len(samples) if samples else 0.0
+            entry['count'] = self.counts.get(name, 0)
+            spans[name] = entry
+        latency = {f'p{point}': 1000 * value for point, value in percentiles(list(self.frame_latencies)).items()}
+        return {'frames': self.frames, 'fps': self.fps(), 'latency_ms': latency, 'spans': spans}
+
+    def report(self):
+        """
+        Format the statistics as one line per span.
+
+        Returns:
+            str: A human-readable summary.
+        """
+        stats = self.stats()
+        latency = stats['latency_ms']
+        lines = [f"Frame loop: {stats['frames']} frames, {stats['fps']:.1f} FPS, capture-to-display "
+                 f"p50 {latency['p50']:.1f} / p95 {latency['p95']:.1f} / p99 {latency['p99']:.1f} ms"]
+        for name, span in stats['spans'].items():
+            lines.append(f"  {name:<16} p50 {span['p50']:6.2f}  p95 {span['p95']:6.2f}  p99 {span['p99']:6.2f} ms"
+                         f"  ({span['count']} samples)")
+        return '\n'.join(lines)
+
+    def hud_lines(self):
+        """
+        Get the HUD text, recomputed at most every hud_interval seconds.
+
+        Returns:
+            list: An FPS/latency line followed by one p50/p95/p99 line per span.
+        """
+        lines, computed_at = self._hud_cache
+        now = time.perf_counter()
+        if now - computed_at >= self.hud_interval:
+            stats = self.stats()
+            latency = stats['latency_ms']
+            lines = [f"{stats['fps']:.1f} FPS  latency p50 {latency['p50']:.0f} p95 {latency['p95']:.0f} "
+                     f"p99 {latency['p99']:.0f} ms"]
+            for name, span in stats['spans'].items():
+                lines.append(f"{name}: {span['p50']:.1f} / {span['p95']:.1f} / {span['p99']:.1f} ms")
+            self._hud_cache = (lines, now)
+        return lines
+
+    def write_trace(self, path=None):
+        """
+        Write the recorded spans as a Chrome trace (JSON object format).
+
+        Args:
+            path (str): The output file; defaults to trace_path.
+
+        Returns:
+            int: The number of span events written (0 when tracing is off).
+        """
+        path = path or self.trace_path
+        if path is None or self._events is None:
+            return 0
+        origin = self._origin
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': thread_id, 'args': {'name': name}}
+                  for thread_id, name in self._threads.items()]
+        events.extend({'name': name, 'ph': 'X', 'pid': 1, 'tid': thread_id,
+                       'ts': round(1e6 * (start - origin), 1), 'dur': round(1e6 * (end - start), 1)}
+                      for name, start, end, thread_id in list(self._events))
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
+        return len(events) - len(self._threads)
+
+
+DISABLED = FrameProfiler(enabled=False)  # Stand-in when no profiler is given
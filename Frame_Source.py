@@ -0,0 +1,276 @@
+"""
+Pluggable frame sources for live, recorded and synthetic input
+
+Every source follows the cv2.VideoCapture protocol (read([image]), isOpened(),
+release()) and also offers read_timestamped() like Video_Capture.ThreadedCapture,
+so the game loop and benchmarks can run without a webcam. Recorded and
+synthetic sources either deliver frames as fast as they are asked for
+(realtime=False) or pace them to their frame rate (realtime=True).
+"""
+
+import os
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+
+class FrameSource:
+    """
+    Base class for frame sources; subclasses implement _grab().
+
+    Args:
+        fps (float): The nominal frame rate used for real-time pacing.
+        realtime (bool): Deliver frames no faster than fps instead of as fast as possible.
+        pool (FramePool): Optional pool frames are read into when read() is not given a buffer;
+            the reader then releases each frame back to it.
+    """
+
+    def __init__(self, fps=30.0, realtime=False, pool=None):
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.realtime = realtime
+        self.pool = pool
+        self.frame_id = 0
+        self._next_time = None
+        self._opened = True
+
+    def _grab(self, image=None):
+        """
+        Produce the next frame.
+
+        Args:
+            image (np.ndarray): Optional buffer to write the frame into when it has the right shape.
+
+        Returns:
+            np.ndarray: The BGR frame or None at the end of the input.
+        """
+        raise NotImplementedError
+
+    def read(self, image=None):
+        """
+        Read the next frame, like cv2.VideoCapture.read().
+
+        Args:
+            image (np.ndarray): Optional buffer to reuse for the frame (taken from the pool if not given).
+
+        Returns:
+            tuple: (ret, frame) where ret is False at the end of the input.
+        """
+        if not self._opened:
+            return False, None
+        if image is None and self.pool is not None:
+            image = self.pool.acquire()
+            frame = self.pool.track(self._grab(image), image)
+        else:
+            frame = self._grab(image)
+        if frame is None:
+            self._opened = False
+            return False, None
+        if self.realtime:
+            now = time.perf_counter()
+            if self._next_time is None:
+                self._next_time = now
+            elif self._next_time > now:
+                time.sleep(self._next_time - now)
+            self._next_time = max(self._next_time, now) + 1 / self.fps
+        self.frame_id += 1
+        return True, frame
+
+    def read_timestamped(self, timeout=None):
+        """
+        Read the next frame with its id and time of delivery.
+
+        Args:
+            timeout (float): Unused; present for compatibility with ThreadedCapture.
+
+        Returns:
+            tuple: (frame_id, timestamp, frame) or None at the end of the input.
+        """
+        ret, frame = self.read()
+        if not ret:
+            return None
+        return self.frame_id - 1, time.perf_counter(), frame
+
+    def isOpened(self):
+        """
+        Check if the source can still deliver frames.
+
+        Returns:
+            bool: True until the input has ended or the source was released.
+        """
+        return self._opened
+
+    def release(self):
+        """
+        Close the source.
+        """
+        self._opened = False
+
+
+class CameraSource(FrameSource):
+    """
+    Live webcam input; the camera itself sets the pace.
+
+    Args:
+        index (int): The camera device index.
+    """
+
+    def __init__(self, index=0, pool=None):
+        super().__init__(realtime=False, pool=pool)
+        self.capture = cv2.VideoCapture(index)
+        self._opened = self.capture.isOpened()
+
+    def _grab(self, image=None):
+        ret, frame = self.capture.read(image)
+        return frame if ret else None
+
+    def release(self):
+        super().release()
+        self.capture.release()
+
+
+class VideoFileSource(FrameSource):
+    """
+    Frames of a recorded video file.
+
+    Args:
+        path (str): The video file.
+        realtime (bool): Pace frames to the file's frame rate.
+        loop (bool): Restart from the first frame at the end of the file.
+    """
+
+    def __init__(self, path, realtime=False, loop=False, pool=None):
+        self.capture = cv2.VideoCapture(path)
+        super().__init__(self.capture.get(cv2.CAP_PROP_FPS), realtime, pool)
+        self.path = path
+        self.loop = loop
+        self._opened = self.capture.isOpened()
+
+    def _grab(self, image=None):
+        ret, frame = self.capture.read(image)
+        if not ret and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read(image)
+        return frame if ret else None
+
+    def release(self):
+        super().release()
+        self.capture.release()
+
+
+class ImageSequenceSource(FrameSource):
+    """
+    Frames read from the image files of a directory in name order.
+
+    Args:
+        directory (str): The directory holding the images.
+        fps (float): The frame rate used for real-time pacing.
+        realtime (bool): Pace frames to fps.
+        loop (bool): Restart from the first image after the last one.
+    """
+
+    def __init__(self, directory, fps=30.0, realtime=False, loop=False, pool=None):
+        super().__init__(fps, realtime, pool)
+        self.paths = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.loop = loop
+        self._index = 0
+        self._data = bytearray()  # File contents, reused while the files fit
+        self._opened = bool(self.paths)
+
+    def _read_file(self, path):
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if len(self._data) < size:
+                self._data = bytearray(size)
+            view = memoryview(self._data)[:size]
+            return view[:file.readinto(view)]
+
+    def _grab(self, image=None):
+        if self._index >= len(self.paths):
+            if not self.loop:
+                return None
+            self._index = 0
+        # The Python binding of imdecode has no dst: decode, then copy into the pooled buffer,
+        # so the decoder's output is freed right away and the frames handed out are recycled
+        data = self._read_file(self.paths[self._index])
+        self._index += 1
+        decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR) if len(data) else None
+        if decoded is None or image is None or image.shape != decoded.shape:
+            return decoded
+        np.copyto(image, decoded)
+        return image
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames with a bright marker sweeping across the play area.
+
+    The content is deterministic, which makes it suitable for throughput
+    benchmarks of everything except hand detection quality.
+
+    Args:
+        frame_count (int): The number of frames to produce (None for endless).
+        width (int): The frame width in pixels.
+        height (int): The frame height in pixels.
+        fps (float): The frame rate used for real-time pacing.
+        realtime (bool): Pace frames to fps.
+        pool (FramePool): Optional pool frames are drawn into.
+    """
+
+    def __init__(self, frame_count=300, width=1280, height=720, fps=30.0, realtime=False, pool=None):
+        super().__init__(fps, realtime, pool)
+        self.frame_count = frame_count
+        self.width = width
+        self.height = height
+        ramp = np.linspace(40, 120, width, dtype=np.uint8)
+        self._background = np.repeat(np.repeat(ramp[np.newaxis, :, np.newaxis], height, axis=0), 3, axis=2)
+
+    def _grab(self, image=None):
+        if self.frame_count is not None and self.frame_id >= self.frame_count:
+            return None
+        if image is not None and image.shape == self._background.shape:
+            frame = image
+            np.copyto(frame, self._background)
+        else:
+            frame = self._background.copy()
+        # Visit the nine cells in turn, dwelling two seconds on each (long enough to select it)
+        cell = (self.frame_id // int(2 * self.fps)) % 9
+        row, col = divmod(cell, 3)
+        center = (col * self.width // 3 + self.width // 6, row * self.height // 3 + self.height // 6)
+        cv2.circle(frame, center, 20, (255, 255, 255), -1)
+        return frame
+
+
+# Function to open a frame source from a specification
+def open_source(spec=0, realtime=False, loop=False, pool=None):
+    """
+    Open the frame source described by spec.
+
+    Args:
+        spec: A camera index (int or digit string), 'synthetic' (optionally
+            'synthetic:<frame count>'), a directory of images or a video file path.
+        realtime (bool): Pace recorded and synthetic input to its frame rate.
+        loop (bool): Restart recorded input when it ends.
+        pool (FramePool): Optional pool the source reads frames into.
+
+    Returns:
+        FrameSource: The opened source.
+
+    Raises:
+        FileNotFoundError: If spec names a path that does not exist.
+    """
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraSource(int(spec), pool)
+    if spec == 'synthetic' or spec.startswith('synthetic:'):
+        _, _, count = spec.partition(':')
+        return SyntheticSource(int(count) if count else 300, realtime=realtime, pool=pool)
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, realtime=realtime, loop=loop, pool=pool)
+    if os.path.isfile(spec):
+        return VideoFileSource(spec, realtime=realtime, loop=loop, pool=pool)
+    raise FileNotFoundError(f"No such video file or image directory: {spec}")
@@ -0,0 +1,115 @@
+"""
+Non-blocking game flow
+
+The screens of a game (splash, name entry, play, result, rematch prompt) are
+states of a GameFlow. The frame loop calls update() once per frame with the
+key pressed, so timed screens end by themselves and keys take effect at once,
+and capture and hand tracking keep running through every screen instead of
+waiting in cv2.waitKey or time.sleep.
+
+    splash --(time or any key)--> name entry --(finish_name)--> play
+    play --(finish_game)--> result --(time)--> rematch
+    result / rematch --'r'--> play        any state --quit key--> quit
+"""
+
+import time
+
+SPLASH, NAME_ENTRY, PLAY, RESULT, REMATCH, QUIT = 'splash', 'name_entry', 'play', 'result', 'rematch', 'quit'
+ESCAPE = 27
+
+
+class GameFlow:
+    """
+    State machine for the screens of a game.
+
+    Args:
+        splash_time (float): Seconds the splash screen is shown (0 skips it).
+        result_time (float): Seconds the result is shown before the rematch prompt.
+        need_name (bool): Go through name entry after the splash screen.
+        rematch (bool): Offer a rematch after the result; when False the flow quits after result_time.
+        clock (callable): Time source in seconds.
+    """
+
+    def __init__(self, splash_time=5.0, result_time=3.0, need_name=True, rematch=True, clock=time.monotonic):
+        self.splash_time = splash_time
+        self.result_time = result_time
+        self.need_name = need_name
+        self.rematch = rematch
+        self.clock = clock
+        self.result = None  # The outcome passed to finish_game
+        self.games = 0  # Games started
+        self.state = None
+        self._since = 0.0
+        self._enter(SPLASH if splash_time > 0 else self._after_splash())
+
+    def _after_splash(self):
+        return NAME_ENTRY if self.need_name else PLAY
+
+    def _enter(self, state):
+        self.state = state
+        self._since = self.clock()
+        if state == PLAY:
+            self.games += 1
+            self.result = None
+
+    def elapsed(self):
+        """
+        Get the time spent in the current state.
+
+        Returns:
+            float: Seconds since the state was entered.
+        """
+        return self.clock() - self._since
+
+    def finish_name(self):
+        """
+        Leave name entry and start playing.
+        """
+        if self.state == NAME_ENTRY:
+            self._enter(PLAY)
+
+    def finish_game(self, result):
+        """
+        End the current game.
+
+        Args:
+            result: The outcome to show (any value the caller uses to draw the result screen).
+        """
+        if self.state == PLAY:
+            self._enter(RESULT)
+            self.result = result
+
+    def quit(self):
+        """
+        End the flow.
+        """
+        self._enter(QUIT)
+
+    def update(self, key=-1):
+        """
+        Advance the flow for one frame.
+
+        'q' quits from the play, result and rematch screens; Escape quits from any screen
+        (name entry needs 'q' as a letter).
+
+        Args:
+            key (int): The key pressed this frame, -1 for none.
+
+        Returns:
+            str: The new state if it changed, otherwise None.
+        """
+        state = self.state
+        if state == QUIT:
+            return None
+        key = key & 0xFF if key != -1 else -1
+        if key == ESCAPE or (key == ord('q') and state in (PLAY, RESULT, REMATCH)):
+            self._enter(QUIT)
+        elif state == SPLASH:
+            if key != -1 or self.elapsed() >= self.splash_time:
+                self._enter(self._after_splash())
+        elif state in (RESULT, REMATCH):
+            if key == ord('r') and self.rematch:
+                self._enter(PLAY)
+            elif state == RESULT and self.elapsed() >= self.result_time:
+                self._enter(REMATCH if self.rematch else QUIT)
+        return self.state if self.state != state else None
@@ -0,0 +1,429 @@
+"""
+Compact append-only game records
+
+Every game is written as a stream of small tagged events, so a record file can
+grow for as long as games are played and a crash loses at most the event being
+written. A move takes 6 bytes; the optional fingertip trace leading up to it
+takes 8 bytes per point.
+
+File layout (little-endian):
+    header:      magic b'TTTR', format version (uint16), reserved (uint16)
+    GAME_START:  tag, start time (float64, Unix seconds), size, win length (uint8 each),
+                 then the X and O player names (uint8 length + UTF-8 each)
+    TRACE:       tag, point count (uint16), then per point: time (uint32 ms since the
+                 game start) and x, y (int16 pixels each)
+    MOVE:        tag, cell (uint8), time (uint32 ms since the game start)
+    GAME_END:    tag, result (uint8: 0 draw, 1 X won, 2 O won, 3 abandoned), time (uint32 ms)
+
+Moves alternate between X and O, X first. A TRACE belongs to the MOVE that follows it.
+
+Games played elsewhere (such as Self_Play tournaments) can be encoded in one go
+with encode_game() and appended to a file opened with open_for_append().
+
+Recording is opt-in; the default file lives in the user's data directory
+(DEFAULT_PATH), not next to the code.
+
+Usage:
+    python Game_Record.py summary [path]
+    python Game_Record.py export [path] --format json|csv [--output FILE]
+"""
+
+import os
+import struct
+import sys
+import time
+
+MAGIC = b'TTTR'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHH')  # Magic, format version, reserved
+
+
+# Function to get the per-user directory for application data
+def _user_data_dir():
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Application Support')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(base, 'handy_tic_tac_toe')
+
+
+DEFAULT_PATH = os.path.join(_user_data_dir(), 'game_records.bin')
+
+GAME_START, TRACE, MOVE, GAME_END = 1, 2, 3, 4
+_START = struct.Struct('<dBB')  # Start time, size, win length
+_TRACE = struct.Struct('<H')  # Point count
+_POINT = struct.Struct('<Ihh')  # Time, x, y
+_MOVE = struct.Struct('<BI')  # Cell, time
+_END = struct.Struct('<BI')  # Result, time
+
+DRAW, X_WON, O_WON, ABANDONED = 0, 1, 2, 3
+RESULT_NAMES = ('draw', 'x_won', 'o_won', 'abandoned')
+MAX_SIZE = 16  # Cell numbers are stored as uint8
+
+_CHUNK_SIZE = 1 << 20  # Bytes read at a time when scanning a file
+
+
+class GameRecorder:
+    """
+    Append games to a record file as they are played.
+
+    Args:
+        path (str): The record file; created with a header (and its directory) if it does not exist.
+        clock (callable): Monotonic time source in seconds used for event times.
+        max_trace_points (int): Trace points kept per move; older points are dropped.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, clock=time.monotonic, max_trace_points=512):
+        self.path = path
+        self.clock = clock
+        self.max_trace_points = max_trace_points
+        self._file = open_for_append(path)
+        self._start = None  # Clock time of the current game's start, None between games
+        self._trace = []
+
+    @property
+    def in_game(self):
+        """
+        bool: Whether a game has been started and not yet ended.
+        """
+        return self._start is not None
+
+    def _elapsed_ms(self, timestamp):
+        if timestamp is None:
+            timestamp = self.clock()
+        return min(max(int(1000 * (timestamp - self._start)), 0), 0xFFFFFFFF)
+
+    def start_game(self, x_name, o_name, size=3, win_length=None):
+        """
+        Begin a new game, abandoning the current one if it was not ended.
+
+        Args:
+            x_name (str): The name of the X player.
+            o_name (str): The name of the O player.
+            size (int): The number of rows and columns.
+            win_length (int): The number of marks in a row needed to win (defaults to size).
+        """
+        if self.in_game:
+            self.end_game(ABANDONED)
+        event = _encode_start(x_name, o_name, size, win_length, time.time())
+        self._start = self.clock()
+        self._trace = []
+        self._file.write(event)
+
+    def add_point(self, x, y, timestamp=None):
+        """
+        Add a fingertip position to the trace of the next move.
+
+        Args:
+            x (int): The x pixel coordinate.
+            y (int): The y pixel coordinate.
+            timestamp (float): The clock time of the position; defaults to now.
+        """
+        if not self.in_game:
+            return
+        if len(self._trace) >= self.max_trace_points:
+            del self._trace[0]
+        self._trace.append((self._elapsed_ms(timestamp), max(min(int(x), 32767), -32768),
+                            max(min(int(y), 32767), -32768)))
+
+    def record_move(self, cell, timestamp=None):
+        """
+        Record a move, preceded by the trace collected since the previous move.
+
+        Args:
+            cell (int): The cell number of the move.
+            timestamp (float): The clock time of the move; defaults to now.
+        """
+        if not self.in_game:
+            return
+        parts = []
+        if self._trace:
+            parts.append(bytes((TRACE,)) + _TRACE.pack(len(self._trace)))
+            parts.extend(_POINT.pack(*point) for point in self._trace)
+            self._trace = []
+        parts.append(bytes((MOVE,)) + _MOVE.pack(cell, self._elapsed_ms(timestamp)))
+        self._file.write(b''.join(parts))
+        self._file.flush()
+
+    def end_game(self, result, timestamp=None):
+        """
+        Record the result of the current game.
+
+        Args:
+            result (int): DRAW, X_WON, O_WON or ABANDONED.
+            timestamp (float): The clock time of the end; defaults to now.
+        """
+        if not self.in_game:
+            return
+        self._file.write(bytes((GAME_END,)) + _END.pack(result, self._elapsed_ms(timestamp)))
+        self._file.flush()
+        self._start = None
+        self._trace = []
+
+    def close(self):
+        """
+        Record an unfinished game as abandoned and close the file.
+        """
+        if self._file.closed:
+            return
+        self.end_game(ABANDONED)
+        self._file.close()
+
+
+# Function to open a record file for appending
+def open_for_append(path):
+    """
+    Open a record file for appending, writing the header if the file is new.
+
+    Args:
+        path (str): The record file.
+
+    Returns:
+        file: The file, opened in binary append mode.
+
+    Raises:
+        ValueError: If the file exists but is not a record file of the current format version.
+    """
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, 'rb') as record_file:
+            header = record_file.read(HEADER.size)
+        if len(header) != HEADER.size or HEADER.unpack(header)[:2] != (MAGIC, FORMAT_VERSION):
+            raise ValueError(f"{path}: not a version {FORMAT_VERSION} game record file")
+        return open(path, 'ab')
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    record_file = open(path, 'ab')
+    record_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+    record_file.flush()
+    return record_file
+
+# Function to encode a GAME_START event
+def _encode_start(x_name, o_name, size, win_length, start):
+    win_length = win_length or size
+    if not 1 <= win_length <= size <= MAX_SIZE:
+        raise ValueError(f"board {size}x{size} with win length {win_length} cannot be recorded")
+    parts = [bytes((GAME_START,)), _START.pack(start, size, win_length)]
+    for name in (x_name, o_name):
+        encoded = name.encode('utf-8')[:255]
+        parts.append(bytes((len(encoded),)) + encoded)
+    return b''.join(parts)
+
+# Function to encode a whole game
+def encode_game(x_name, o_name, moves, result, size=3, win_length=None, start=None):
+    """
+    Encode a finished game (without traces) as record file events.
+
+    Args:
+        x_name (str): The name of the X player.
+        o_name (str): The name of the O player.
+        moves (list): (cell, ms since the start) of every move, X first.
+        result (int): DRAW, X_WON, O_WON or ABANDONED.
+        size (int): The number of rows and columns.
+        win_length (int): The number of marks in a row needed to win (defaults to size).
+        start (float): The start time in Unix seconds; defaults to now.
+
+    Returns:
+        bytes: The encoded events, to append to a file from open_for_append().
+
+    Raises:
+        ValueError: If the board, a cell or the result cannot be recorded.
+    """
+    if not 0 <= result < len(RESULT_NAMES):
+        raise ValueError(f"unknown result: {result}")
+    parts = [_encode_start(x_name, o_name, size, win_length, time.time() if start is None else start)]
+    elapsed = 0
+    for cell, elapsed in moves:
+        if not 0 <= cell < size * size:
+            raise ValueError(f"cell {cell} is not on a {size}x{size} board")
+        elapsed = min(max(int(elapsed), 0), 0xFFFFFFFF)
+        parts.append(bytes((MOVE,)) + _MOVE.pack(cell, elapsed))
+    parts.append(bytes((GAME_END,)) + _END.pack(result, elapsed))
+    return b''.join(parts)
+
+# Function to read fixed-size pieces from a file through a large buffer
+def _chunked(record_file):
+    buffer = b''
+    offset = 0
+
+    def take(size):
+        nonlocal buffer, offset
+        if offset + size > len(buffer):
+            buffer = buffer[offset:] + record_file.read(max(size, _CHUNK_SIZE))
+            offset = 0
+            if size > len(buffer):
+                raise EOFError
+        start = offset
+        offset += size
+        return buffer, start
+
+    return take
+
+# Function to stream the games of a record file
+def read_games(path=DEFAULT_PATH, traces=True):
+    """
+    Stream the games of a record file one at a time.
+
+    Only the current game is held in memory, so files of any size can be scanned.
+    A game cut short by a crash or by a new GAME_START is yielded with result None.
+
+    Args:
+        path (str): The record file.
+        traces (bool): Decode the fingertip traces; skipping them makes scans faster.
+
+    Yields:
+        dict: 'start' (Unix seconds), 'players' (X name, O name), 'size', 'win_length',
+            'moves' (list of (cell, ms since the start)), 'traces' (list of [(ms, x, y), ...],
+            one per move, empty when not recorded or not decoded), 'result' and 'duration_ms'.
+
+    Raises:
+        ValueError: If the file is not a record file of the current format version.
+    """
+    with open(path, 'rb') as record_file:
+        header = record_file.read(HEADER.size)
+        if len(header) != HEADER.size or HEADER.unpack(header)[0] != MAGIC:
+            raise ValueError(f"{path}: not a game record file")
+        version = HEADER.unpack(header)[1]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: format version {version}, expected {FORMAT_VERSION}")
+
+        take = _chunked(record_file)
+        game = None
+        trace = []
+        while True:
+            try:
+                buffer, offset = take(1)
+            except EOFError:
+                break
+            tag = buffer[offset]
+            try:
+                if tag == GAME_START:
+                    if game is not None:
+                        yield game
+                    buffer, offset = take(_START.size)
+                    start, size, win_length = _START.unpack_from(buffer, offset)
+                    names = []
+                    for _ in range(2):
+                        buffer, offset = take(1)
+                        length = buffer[offset]
+                        buffer, offset = take(length)
+                        names.append(buffer[offset:offset + length].decode('utf-8', 'replace'))
+                    game = {'start': start, 'players': tuple(names), 'size': size, 'win_length': win_length,
+                            'moves': [], 'traces': [], 'result': None, 'duration_ms': 0}
+                    trace = []
+                elif tag == TRACE:
+                    buffer, offset = take(_TRACE.size)
+                    (count,) = _TRACE.unpack_from(buffer, offset)
+                    buffer, offset = take(count * _POINT.size)
+                    if traces:
+                        trace = [_POINT.unpack_from(buffer, offset + index * _POINT.size) for index in range(count)]
+                elif tag == MOVE:
+                    buffer, offset = take(_MOVE.size)
+                    cell, elapsed = _MOVE.unpack_from(buffer, offset)
+                    if game is not None:
+                        game['moves'].append((cell, elapsed))
+                        game['traces'].append(trace)
+                        game['duration_ms'] = elapsed
+                    trace = []
+                elif tag == GAME_END:
+                    buffer, offset = take(_END.size)
+                    result, elapsed = _END.unpack_from(buffer, offset)
+                    if game is not None:
+                        game['result'] = result
+                        game['duration_ms'] = elapsed
+                        yield game
+                    game = None
+                else:
+                    raise ValueError(f"{path}: unknown event tag {tag}")
+            except EOFError:
+                break  # Truncated final event
+        if game is not None:
+            yield game
+
+# Function to write games as JSON lines
+def export_json(games, output):
+    """
+    Write games as JSON, one object per line.
+
+    Args:
+        games (iterable): Games from read_games().
+        output (file): A text file to write to.
+
+    Returns:
+        int: The number of games written.
+    """
+    import json
+    count = 0
+    for game in games:
+        result = game['result']
+        exported = dict(game, result=RESULT_NAMES[result] if result is not None else None)
+        output.write(json.dumps(exported) + '\n')
+        count += 1
+    return count
+
+# Function to write games as CSV rows
+def export_csv(games, output):
+    """
+    Write one CSV row per move.
+
+    Args:
+        games (iterable): Games from read_games().
+        output (file): A text file opened with newline=''.
+
+    Returns:
+        int: The number of games written.
+    """
+    import csv
+    writer = csv.writer(output)
+    writer.writerow(['game', 'start', 'x_player', 'o_player', 'size', 'win_length', 'result',
+                     'ply', 'player', 'cell', 'ms', 'trace_points'])
+    count = 0
+    for count, game in enumerate(games, 1):
+        result = RESULT_NAMES[game['result']] if game['result'] is not None else ''
+        for ply, (cell, elapsed) in enumerate(game['moves']):
+            writer.writerow([count, f"{game['start']:.3f}", game['players'][0], game['players'][1], game['size'],
+                             game['win_length'], result, ply, 'XO'[ply % 2], cell, elapsed,
+                             len(game['traces'][ply])])
+    return count
+
+# Command line entry point
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Inspect or export game record files.")
+    parser.add_argument('command', choices=('summary', 'export'))
+    parser.add_argument('path', nargs='?', default=DEFAULT_PATH)
+    parser.add_argument('--format', choices=('json', 'csv'), default='json')
+    parser.add_argument('--output', help="output file (defaults to standard output)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'summary':
+        games = moves = points = 0
+        results = [0] * len(RESULT_NAMES)
+        unfinished = 0
+        for game in read_games(args.path):
+            games += 1
+            moves += len(game['moves'])
+            points += sum(len(trace) for trace in game['traces'])
+            if game['result'] is None:
+                unfinished += 1
+            else:
+                results[game['result']] += 1
+        size = os.path.getsize(args.path)
+        print(f"{games} games, {moves} moves, {points} trace points, {size} bytes")
+        print(", ".join(f"{name}: {count}" for name, count in zip(RESULT_NAMES, results))
+              + f", unfinished: {unfinished}")
+        return 0
+
+    output = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        export = export_json if args.format == 'json' else export_csv
+        count = export(read_games(args.path), output)
+    finally:
+        if args.output:
+            output.close()
+    print(f"Exported {count} games", file=sys.stderr)
+    return 0
+
+# Run the command line entry point if the script is executed
+if __name__ == "__main__":
+    sys.exit(main())
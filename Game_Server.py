@@ -0,0 +1,455 @@
+"""
+Multi-session game server
+
+Hosts many concurrent games in one process behind an asyncio TCP server that
+speaks JSON lines. Each game is a compact GameSession holding two bitboards.
+3x3 moves come straight from the opening book; searches on larger boards are
+dispatched to a process pool shared by all sessions, so a long search never
+blocks the event loop.
+
+Protocol (one JSON object per line, one response line per request):
+    {"op": "new", "size": 3, "win_length": 3}  -> session state (size 3-10, win_length 3-size)
+    {"op": "move", "session": id, "cell": n}    -> session state after the player's and computer's moves
+    {"op": "state", "session": id}              -> session state
+    {"op": "close", "session": id}              -> {"closed": id}
+    {"op": "stats"}                             -> server counters
+Errors are answered with {"error": message}, including request lines longer
+than the stream limit (64 KiB), which are skipped.
+
+Usage:
+    python Game_Server.py serve [--host 127.0.0.1] [--port 8765] [--workers N]
+    python Game_Server.py load-test [--clients 200] [--games 5] [--size 3] [--connect HOST:PORT]
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import Bitboard as bitboard
+import Grid_Engine as grid
+import Opening_Book as book
+import Transposition_Table as tt
+
+PLAYING = 'playing'
+PLAYER_WON = 'player_won'
+COMPUTER_WON = 'computer_won'
+DRAW = 'draw'
+
+DEFAULT_PORT = 8765
+MIN_SIZE, MAX_SIZE = 3, 10  # Board sizes a client may ask for; building larger games would stall the event loop
+
+
+# Function to compute the computer's move (runs in the server process or a pool worker)
+def compute_move(size, win_length, cs_bits, ps_bits, time_budget_ms):
+    """
+    Find the computer's move on bitboards.
+
+    Args:
+        size (int): The number of rows and columns.
+        win_length (int): The number of marks in a row needed to win.
+        cs_bits (int): The bitboard of the computer.
+        ps_bits (int): The bitboard of the player.
+        time_budget_ms (float): Search time limit for boards larger than 3x3.
+
+    Returns:
+        int: The cell number of the move or None if the board is full.
+    """
+    if size == 3 and win_length == 3:
+        cell = book.best_move(cs_bits, ps_bits)
+        if cell is None:
+            cell = bitboard.computer_move(cs_bits, ps_bits, tt.get_shared_table())
+        return cell
+    cell, _, _ = grid.search(grid.get_game(size, win_length), cs_bits, ps_bits, time_budget_ms)
+    return cell
+
+
+# Function to read one request line, skipping lines longer than the stream limit
+async def read_request(reader):
+    """
+    Read the next line from a client.
+
+    Args:
+        reader (asyncio.StreamReader): The client's stream.
+
+    Returns:
+        bytes: The line (the last one may lack its newline), b'' at the end of the stream, or
+            None if the line was longer than the stream limit and was discarded up to its newline.
+    """
+    try:
+        return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        consumed = error.consumed
+    # The data stays buffered after an overrun: drop it chunk by chunk until the newline
+    while True:
+        try:
+            await reader.readexactly(consumed)
+            await reader.readuntil(b'\n')
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+
+class GameSession:
+    """
+    State of one game: the player plays X and moves first, the computer plays O.
+
+    Args:
+        session_id (int): The session identifier.
+        size (int): The number of rows and columns.
+        win_length (int): The number of marks in a row needed to win (defaults to size).
+    """
+
+    __slots__ = ('session_id', 'game', 'player_bits', 'computer_bits', 'status', 'busy', 'last_active')
+
+    def __init__(self, session_id, size=3, win_length=None):
+        self.session_id = session_id
+        self.game = grid.get_game(size, win_length)
+        self.player_bits = 0
+        self.computer_bits = 0
+        self.status = PLAYING
+        self.busy = False  # True while the computer is searching
+        self.last_active = time.monotonic()
+
+    def play(self, cell, by_computer=False):
+        """
+        Place a mark and update the game status.
+
+        Args:
+            cell (int): The cell number of the move.
+            by_computer (bool): Whether the computer or the player moves.
+
+        Raises:
+            ValueError: If the game is over or the cell is not an empty cell of the board.
+        """
+        game = self.game
+        if self.status != PLAYING:
+            raise ValueError("game is over")
+        if not 0 <= cell < game.cell_count or (self.player_bits | self.computer_bits) >> cell & 1:
+            raise ValueError(f"invalid move: {cell}")
+        if by_computer:
+            self.computer_bits |= 1 << cell
+            if game.wins_through(self.computer_bits, cell):
+                self.status = COMPUTER_WON
+        else:
+            self.player_bits |= 1 << cell
+            if game.wins_through(self.player_bits, cell):
+                self.status = PLAYER_WON
+        if self.status == PLAYING and game.is_draw(self.player_bits, self.computer_bits):
+            self.status = DRAW
+
+    def board_string(self):
+        """
+        Get the board as one character per cell, row by row.
+
+        Returns:
+            str: 'X' for the player, 'O' for the computer and '.' for empty cells.
+        """
+        return ''.join(
+            'X' if self.player_bits >> cell & 1 else 'O' if self.computer_bits >> cell & 1 else '.'
+            for cell in range(self.game.cell_count)
+        )
+
+    def to_dict(self):
+        """
+        Get the state sent to clients.
+
+        Returns:
+            dict: Session id, board size, win length, board string and status.
+        """
+        return {
+            'session': self.session_id,
+            'size': self.game.size,
+            'win_length': self.game.win_length,
+            'board': self.board_string(),
+            'status': self.status,
+        }
+
+
+class GameServer:
+    """
+    Asyncio server hosting many GameSessions.
+
+    Args:
+        host (str): The interface to listen on.
+        port (int): The TCP port (0 picks a free port).
+        workers (int): Processes in the shared search pool (defaults to the CPU count).
+        time_budget_ms (float): Search time limit per computer move on boards larger than 3x3.
+        max_sessions (int): The maximum number of open sessions.
+        idle_timeout (float): Seconds after which an untouched session is closed.
+    """
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, workers=None, time_budget_ms=200,
+                 max_sessions=10000, idle_timeout=600.0):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.time_budget_ms = time_budget_ms
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self._ids = itertools.count(1)
+        self._pool = None
+        self._server = None
+        self._sweeper = None
+        self._clients = set()  # Tasks of the open connections
+        self.requests = 0
+        self.searches = 0
+
+    async def start(self):
+        """
+        Start listening; the actual port is available as self.port afterwards.
+        """
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._sweeper = asyncio.ensure_future(self._sweep_idle())
+
+    async def serve_forever(self):
+        """
+        Start the server and serve until cancelled.
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+        Stop listening and shut down the search pool.
+        """
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._clients):
+                task.cancel()
+            await asyncio.gather(*self._clients, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _sweep_idle(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 30.0))
+            cutoff = time.monotonic() - self.idle_timeout
+            for session_id in [sid for sid, s in self.sessions.items() if s.last_active < cutoff and not s.busy]:
+                del self.sessions[session_id]
+
+    async def _handle_client(self, reader, writer):
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            while True:
+                line = await read_request(reader)
+                if line is None:
+                    response = {'error': "request line too long"}
+                elif not line:
+                    break
+                else:
+                    try:
+                        response = await self.dispatch(json.loads(line))
+                    except (ValueError, KeyError, TypeError) as error:
+                        response = {'error': str(error)}
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.discard(task)
+            writer.close()
+
+    def _session(self, request):
+        session = self.sessions.get(request['session'])
+        if session is None:
+            raise KeyError(f"unknown session: {request['session']}")
+        session.last_active = time.monotonic()
+        return session
+
+    async def dispatch(self, request):
+        """
+        Handle one request.
+
+        Args:
+            request (dict): The decoded request (see the module docstring).
+
+        Returns:
+            dict: The response.
+
+        Raises:
+            ValueError, KeyError, TypeError: For malformed or invalid requests.
+        """
+        self.requests += 1
+        op = request['op']
+        if op == 'new':
+            if len(self.sessions) >= self.max_sessions:
+                raise ValueError("server full")
+            size = int(request.get('size', 3))
+            win_length = request.get('win_length')
+            win_length = size if win_length is None else int(win_length)
+            if not MIN_SIZE <= size <= MAX_SIZE:
+                raise ValueError(f"size must be between {MIN_SIZE} and {MAX_SIZE}")
+            if not MIN_SIZE <= win_length <= size:
+                raise ValueError(f"win_length must be between {MIN_SIZE} and size")
+            session = GameSession(next(self._ids), size, win_length)
+            self.sessions[session.session_id] = session
+            return session.to_dict()
+        if op == 'move':
+            session = self._session(request)
+            if session.busy:
+                raise ValueError("computer is still thinking")
+            session.play(int(request['cell']))
+            if session.status == PLAYING:
+                await self._computer_turn(session)
+            return session.to_dict()
+        if op == 'state':
+            return self._session(request).to_dict()
+        if op == 'close':
+            self.sessions.pop(request['session'], None)
+            return {'closed': request['session']}
+        if op == 'stats':
+            return {'sessions': len(self.sessions), 'requests': self.requests, 'searches': self.searches,
+                    'workers': self.workers}
+        raise ValueError(f"unknown op: {op}")
+
+    async def _computer_turn(self, session):
+        game = session.game
+        args = (game.size, game.win_length, session.computer_bits, session.player_bits, self.time_budget_ms)
+        if game.size == 3 and game.win_length == 3:
+            cell = compute_move(*args)  # Opening book lookup, cheaper than a round trip to the pool
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            session.busy = True
+            try:
+                cell = await asyncio.get_running_loop().run_in_executor(self._pool, compute_move, *args)
+            finally:
+                session.busy = False
+            self.searches += 1
+        if cell is not None and session.status == PLAYING:
+            session.play(cell, by_computer=True)
+
+
+# Function to play random games against a server
+async def _simulated_client(host, port, games, size, win_length, rng, latencies, outcomes):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def call(request):
+        writer.write(json.dumps(request).encode() + b'\n')
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    try:
+        for _ in range(games):
+            state = await call({'op': 'new', 'size': size, 'win_length': win_length})
+            while state['status'] == PLAYING:
+                empty = [cell for cell, mark in enumerate(state['board']) if mark == '.']
+                start = time.perf_counter()
+                state = await call({'op': 'move', 'session': state['session'], 'cell': rng.choice(empty)})
+                latencies.append(time.perf_counter() - start)
+            outcomes[state['status']] = outcomes.get(state['status'], 0) + 1
+            await call({'op': 'close', 'session': state['session']})
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+# Function to load-test a server with simulated clients
+async def load_test(host, port, clients=200, games=5, size=3, win_length=None, seed=0):
+    """
+    Play random games from many concurrent simulated clients.
+
+    Args:
+        host (str): The server host.
+        port (int): The server port.
+        clients (int): The number of concurrent connections.
+        games (int): Games played by each client, one after another.
+        size (int): The board size.
+        win_length (int): The number of marks in a row needed to win.
+        seed (int): Seed of the random move choice.
+
+    Returns:
+        dict: Games played, elapsed seconds, games and moves per second, move latency
+            percentiles in milliseconds and the game outcomes.
+    """
+    rng = random.Random(seed)
+    latencies = []
+    outcomes = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _simulated_client(host, port, games, size, win_length, random.Random(rng.random()), latencies, outcomes)
+        for _ in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def percentile(fraction):
+        return 1000 * latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] if latencies else 0.0
+
+    return {
+        'games': clients * games,
+        'seconds': elapsed,
+        'games_per_second': clients * games / elapsed,
+        'moves_per_second': len(latencies) / elapsed,
+        'latency_ms': {'p50': percentile(0.5), 'p95': percentile(0.95), 'p99': percentile(0.99)},
+        'outcomes': outcomes,
+    }
+
+# Function to run a load test against a server started in this process
+async def _local_load_test(args):
+    server = GameServer(port=0, workers=args.workers, time_budget_ms=args.time_budget_ms)
+    await server.start()
+    try:
+        return await load_test('127.0.0.1', server.port, args.clients, args.games, args.size, args.win_length)
+    finally:
+        await server.close()
+
+# Command line entry point
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve many Tic Tac Toe games or load-test a server.")
+    parser.add_argument('command', choices=('serve', 'load-test'))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, help="search processes (defaults to the CPU count)")
+    parser.add_argument('--time-budget-ms', type=float, default=200)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--games', type=int, default=5)
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    parser.add_argument('--connect', help="HOST:PORT of a running server; by default one is started in-process")
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        server = GameServer(args.host, args.port, args.workers, args.time_budget_ms)
+        print(f"Serving on {args.host}:{args.port}")
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.connect:
+        host, _, port = args.connect.rpartition(':')
+        summary = asyncio.run(load_test(host, int(port), args.clients, args.games, args.size, args.win_length))
+    else:
+        summary = asyncio.run(_local_load_test(args))
+    print(json.dumps(summary, indent=2))
+    return 0
+
+# Run the command line entry point if the script is executed
+if __name__ == "__main__":
+    sys.exit(main())
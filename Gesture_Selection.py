@@ -0,0 +1,316 @@
+"""
+Time-based, jitter-filtered cell selection
+
+The fingertip position is smoothed with a One-Euro filter, the pointed cell
+only changes once the smoothed point is clearly past a cell border
+(hysteresis), and a cell is confirmed after the finger dwells on it for a
+fixed wall-clock time. Confirmation latency is therefore the same on slow and
+fast machines, and a single noisy landmark does not restart the dwell. A
+confirmed cell is kept until the game takes it, so it survives frames dropped
+between the selection stage and the game loop.
+
+For several players sharing one camera, assign_hands() gives each player
+their hand, and each hand gets its own PinchDetector, which reports a pinch
+once per press without ever pausing the frame loop.
+"""
+
+import math
+import threading
+
+THUMB_TIP, INDEX_FINGER_TIP, WRIST = 4, 8, 0  # MediaPipe hand landmark indices
+
+
+class OneEuroFilter:
+    """
+    One-Euro low-pass filter: smooths strongly when the signal is slow, lags little when it is fast.
+
+    Args:
+        min_cutoff (float): Cutoff frequency in Hz at low speed; lower means smoother.
+        beta (float): How quickly the cutoff rises with speed; higher means less lag.
+        d_cutoff (float): Cutoff frequency in Hz for the speed estimate.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.05, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the filter state.
+        """
+        self._value = None
+        self._speed = 0.0
+        self._time = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, value, timestamp):
+        """
+        Filter one sample.
+
+        Args:
+            value (float): The raw sample.
+            timestamp (float): The sample time in seconds.
+
+        Returns:
+            float: The filtered value.
+        """
+        if self._value is None or timestamp <= self._time:
+            self._value = value
+            self._time = timestamp
+            return value
+        dt = timestamp - self._time
+        speed = (value - self._value) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self._speed = a_d * speed + (1 - a_d) * self._speed
+        a = self._alpha(self.min_cutoff + self.beta * abs(self._speed), dt)
+        self._value = a * value + (1 - a) * self._value
+        self._time = timestamp
+        return self._value
+
+
+class CellSelector:
+    """
+    Turn a stream of fingertip positions into confirmed cell selections.
+
+    Args:
+        dwell_time (float): Seconds the finger must stay on a cell to select it.
+        hysteresis (float): Fraction of a cell's size the finger must move past its border before
+            another cell counts as pointed.
+        lost_grace (float): Seconds the hand may be undetected without restarting the dwell.
+        grid_size (int): The number of rows and columns.
+        min_cutoff (float): One-Euro filter cutoff at low speed, in Hz.
+        beta (float): One-Euro filter speed coefficient (per pixel/second).
+    """
+
+    def __init__(self, dwell_time=1.0, hysteresis=0.15, lost_grace=0.25, grid_size=3, min_cutoff=1.0, beta=0.005):
+        self.dwell_time = dwell_time
+        self.hysteresis = hysteresis
+        self.lost_grace = lost_grace
+        self.grid_size = grid_size
+        self._filter_x = OneEuroFilter(min_cutoff, beta)
+        self._filter_y = OneEuroFilter(min_cutoff, beta)
+        self._lock = threading.Lock()  # Guards the state shared with the game thread
+        self._selected = None  # (cell, timestamp) of the confirmation not yet taken
+        self._restart_at = None  # Dwell restart requested by restart_dwell(), applied by update()
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the current cell, dwell and filter state (a confirmed selection is kept).
+        """
+        self._filter_x.reset()
+        self._filter_y.reset()
+        self.cell = None  # The cell currently pointed at (after hysteresis)
+        self.point = None  # The smoothed fingertip position
+        self._dwell_start = None
+        self._last_seen = None
+
+    def restart_dwell(self, timestamp):
+        """
+        Start the dwell on the pointed cell over, e.g. when the player's turn begins, so a finger
+        already resting on a cell needs a full dwell time to select it. A confirmation not yet
+        taken is dropped.
+
+        May be called from another thread than update(): the restart is queued and applied by
+        the next update(), which owns the dwell state.
+
+        Args:
+            timestamp (float): The frame time in seconds the new dwell starts at.
+        """
+        with self._lock:
+            self._selected = None
+            if self._restart_at is None or timestamp > self._restart_at:
+                self._restart_at = timestamp
+
+    def take_selection(self):
+        """
+        Take the confirmed selection, if any; may be called from another thread than update().
+
+        Returns:
+            tuple: (cell, timestamp) of the last confirmation not yet taken, otherwise None.
+        """
+        with self._lock:
+            selected, self._selected = self._selected, None
+        return selected
+
+    def _cell_at(self, x, y, width, height):
+        cell_w = width // self.grid_size
+        cell_h = height // self.grid_size
+        col = min(int(x) // cell_w, self.grid_size - 1)
+        row = min(int(y) // cell_h, self.grid_size - 1)
+        return max(row, 0) * self.grid_size + max(col, 0)
+
+    def _inside_with_margin(self, cell, x, y, width, height):
+        cell_w = width // self.grid_size
+        cell_h = height // self.grid_size
+        row, col = divmod(cell, self.grid_size)
+        margin_x = self.hysteresis * cell_w
+        margin_y = self.hysteresis * cell_h
+        return (col * cell_w - margin_x <= x < (col + 1) * cell_w + margin_x
+                and row * cell_h - margin_y <= y < (row + 1) * cell_h + margin_y)
+
+    def update(self, fingertip, timestamp, frame_size):
+        """
+        Feed one frame's fingertip position.
+
+        Args:
+            fingertip (tuple): The (x, y) pixel position of the index finger tip, or None if no hand was found.
+            timestamp (float): The frame time in seconds.
+            frame_size (tuple): The (width, height) of the frame in pixels.
+
+        Returns:
+            int: The confirmed cell number (0-8) on the frame the dwell completes, otherwise None.
+        """
+        with self._lock:
+            restart_at, self._restart_at = self._restart_at, None
+        if restart_at is not None and self._dwell_start is not None and restart_at > self._dwell_start:
+            self._dwell_start = restart_at  # The dwell only counts from the restart on
+
+        if fingertip is None:
+            if self._last_seen is None or timestamp - self._last_seen > self.lost_grace:
+                self.reset()
+            return None
+        self._last_seen = timestamp
+
+        width, height = frame_size
+        x = self._filter_x(fingertip[0], timestamp)
+        y = self._filter_y(fingertip[1], timestamp)
+        self.point = (int(x), int(y))
+
+        # Keep the current cell until the finger is clearly past its border
+        if self.cell is None or not self._inside_with_margin(self.cell, x, y, width, height):
+            cell = self._cell_at(x, y, width, height)
+            if cell != self.cell:
+                self.cell = cell
+                self._dwell_start = timestamp
+
+        if timestamp - self._dwell_start >= self.dwell_time:
+            with self._lock:
+                if self._restart_at is not None and self._restart_at > self._dwell_start:
+                    return None  # Restarted meanwhile: the next update() applies it
+                self._selected = (self.cell, timestamp)  # Kept until take_selection()
+            self._dwell_start = timestamp  # A further dwell is needed to select again
+            return self.cell
+        return None
+
+    def progress(self, timestamp):
+        """
+        Get how far the current dwell has progressed.
+
+        Args:
+            timestamp (float): The current frame time in seconds.
+
+        Returns:
+            float: 0.0 (just started or no cell) to 1.0 (about to be confirmed).
+        """
+        if self.cell is None or self._dwell_start is None:
+            return 0.0
+        return min((timestamp - self._dwell_start) / self.dwell_time, 1.0)
+
+
+class PinchDetector:
+    """
+    Debounced thumb-index pinch detection for one hand.
+
+    A pinch is reported on the frame it begins. The fingers must open past the release
+    distance before another pinch counts, and pinches closer together than the cooldown
+    are ignored, so a single press cannot place two marks.
+
+    Args:
+        press_distance (float): Thumb-index tip distance, in normalized image units, that starts a pinch.
+        release_distance (float): Distance the tips must open past to end it.
+        cooldown (float): Minimum seconds between reported pinches.
+        lost_grace (float): Seconds the hand may be undetected without forgetting that it was pinching.
+    """
+
+    def __init__(self, press_distance=0.05, release_distance=0.07, cooldown=0.5, lost_grace=0.25):
+        self.press_distance = press_distance
+        self.release_distance = release_distance
+        self.cooldown = cooldown
+        self.lost_grace = lost_grace
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the pinch state.
+        """
+        self.pinching = False
+        self._last_pinch = None
+        self._last_seen = None
+
+    def update(self, hand_landmarks, timestamp):
+        """
+        Feed one frame's landmarks of the hand.
+
+        Args:
+            hand_landmarks: The MediaPipe landmarks of the hand, or None if it was not found.
+            timestamp (float): The frame time in seconds.
+
+        Returns:
+            bool: True on the frame a new pinch begins.
+        """
+        if hand_landmarks is None:
+            if self._last_seen is not None and timestamp - self._last_seen > self.lost_grace:
+                self.pinching = False
+            return False
+        self._last_seen = timestamp
+        thumb = hand_landmarks.landmark[THUMB_TIP]
+        index = hand_landmarks.landmark[INDEX_FINGER_TIP]
+        distance = math.hypot(index.x - thumb.x, index.y - thumb.y)
+        if self.pinching:
+            if distance > self.release_distance:
+                self.pinching = False
+            return False
+        if distance >= self.press_distance:
+            return False
+        self.pinching = True
+        if self._last_pinch is not None and timestamp - self._last_pinch < self.cooldown:
+            return False
+        self._last_pinch = timestamp
+        return True
+
+
+# Function to assign the hands found in a frame to two players
+def assign_hands(multi_hand_landmarks, multi_handedness=None, mode='side', split=0.5, single=None):
+    """
+    Decide which detected hand belongs to which of two players.
+
+    In 'side' mode player 1 stands on the left of the (mirrored) image and player 2 on
+    the right: with two hands the leftmost wrist is player 1's, a single hand goes to
+    single, or by which side of split its wrist is on when single is None. In 'handedness' mode player 1 plays with the
+    left hand and player 2 with the right, falling back to 'side' when MediaPipe labels
+    both hands alike.
+
+    Args:
+        multi_hand_landmarks (list): The MediaPipe landmarks of each hand, or None.
+        multi_handedness (list): The MediaPipe handedness of each hand (needed for 'handedness' mode).
+        mode (str): 'side' or 'handedness'.
+        split (float): The normalized x coordinate dividing the two sides.
+        single (int): The player (0 or 1) a lone hand belongs to in 'side' mode, e.g. the player
+            whose turn it is when both play over the same board.
+
+    Returns:
+        list: [player 1's hand landmarks, player 2's hand landmarks], None where a player's hand was not found.
+    """
+    players = [None, None]
+    hands = list(multi_hand_landmarks or [])[:2]
+    if mode == 'handedness' and multi_handedness:
+        labels = [handedness.classification[0].label for handedness in multi_handedness[:len(hands)]]
+        if len(set(labels)) == len(hands):
+            for hand, label in zip(hands, labels):
+                players[0 if label == 'Left' else 1] = hand
+            return players
+    if len(hands) == 2:
+        hands.sort(key=lambda hand: hand.landmark[WRIST].x)
+        return hands
+    if hands:
+        if single is None:
+            single = 0 if hands[0].landmark[WRIST].x < split else 1
+        players[single] = hands[0]
+    return players
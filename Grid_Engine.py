@@ -0,0 +1,376 @@
+"""
+Generalized N x N, K-in-a-row engine
+
+Boards are stored as bitboards (bit ``row * size + col``) like Bitboard.py. Full
+minimax is infeasible past 3x3, so the computer's move is found with an
+iterative deepening Alpha-Beta search with move ordering, a heuristic
+evaluation and a hard time budget: when time runs out the best move of the
+deepest finished iteration is returned.
+"""
+
+import time
+from functools import lru_cache
+
+WIN_SCORE = 1000000  # Score of a won position, reduced by the number of plies to reach it
+LINE_WEIGHT_BASE = 8  # Each extra mark in an open line is worth this many times more
+DEFAULT_TIME_BUDGET_MS = 500
+_CHECK_INTERVAL = 31  # Look at the clock every 32 nodes (leaf evaluations are costly on large boards)
+
+
+class _SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget is exhausted or the search is stopped.
+    """
+
+
+class GridGame:
+    """
+    Precomputed line and neighbour masks for one board size and win length.
+
+    Args:
+        size (int): The number of rows and columns.
+        win_length (int): The number of marks in a row needed to win (defaults to size).
+    """
+
+    def __init__(self, size=3, win_length=None):
+        if win_length is None:
+            win_length = size
+        if not 1 <= win_length <= size:
+            raise ValueError("win_length must be between 1 and size")
+        self.size = size
+        self.win_length = win_length
+        self.cell_count = size * size
+        self.full_board = (1 << self.cell_count) - 1
+
+        # Every run of win_length cells in a row, column or diagonal
+        lines = []
+        for row in range(size):
+            for col in range(size):
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row = row + d_row * (win_length - 1)
+                    end_col = col + d_col * (win_length - 1)
+                    if 0 <= end_row < size and 0 <= end_col < size:
+                        mask = 0
+                        for step in range(win_length):
+                            mask |= 1 << ((row + d_row * step) * size + col + d_col * step)
+                        lines.append(mask)
+        self.line_masks = tuple(lines)
+
+        # Heuristic value of an open line by mark count: 0, 1, 8, 64, ... kept well below WIN_SCORE
+        # by a smaller base for long lines (a line of win_length marks is a win, not a heuristic)
+        base = min(LINE_WEIGHT_BASE, int((WIN_SCORE // 4) ** (1 / max(win_length - 2, 1))))
+        self.line_weights = (0,) + tuple(base ** count for count in range(win_length))
+        self.cell_lines = tuple(
+            tuple(mask for mask in lines if mask >> cell & 1) for cell in range(self.cell_count)
+        )
+
+        # Cells adjacent to each cell, used to focus the search on the contested area
+        neighbours = []
+        for cell in range(self.cell_count):
+            row, col = divmod(cell, size)
+            mask = 0
+            for n_row in range(max(row - 1, 0), min(row + 2, size)):
+                for n_col in range(max(col - 1, 0), min(col + 2, size)):
+                    mask |= 1 << (n_row * size + n_col)
+            neighbours.append(mask)
+        self.neighbour_masks = tuple(neighbours)
+
+        # Cells ordered from the centre outwards, the static move ordering
+        centre = (size - 1) / 2
+        self.cells_by_centre = tuple(sorted(
+            range(self.cell_count),
+            key=lambda cell: abs(cell // size - centre) + abs(cell % size - centre),
+        ))
+
+    def from_list(self, board, player_symbol):
+        """
+        Build the bitboard of one player from a list board.
+
+        Args:
+            board (list): The size x size game board.
+            player_symbol (str): The symbol of the player ('X' or 'O').
+
+        Returns:
+            int: The bitboard of the player's marks.
+        """
+        bits = 0
+        size = self.size
+        for ri in range(size):
+            row = board[ri]
+            for ci in range(size):
+                if row[ci] == player_symbol:
+                    bits |= 1 << (ri * size + ci)
+        return bits
+
+    def is_win(self, bits):
+        """
+        Check if the given bitboard contains win_length marks in a row.
+
+        Args:
+            bits (int): The bitboard of one player.
+
+        Returns:
+            bool: True if the player has won, False otherwise.
+        """
+        for mask in self.line_masks:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def wins_through(self, bits, cell):
+        """
+        Check if a winning line passes through the given cell, i.e. the last move won.
+
+        Args:
+            bits (int): The bitboard of the player who played cell.
+            cell (int): The cell number of the last move.
+
+        Returns:
+            bool: True if the move completed a line, False otherwise.
+        """
+        for mask in self.cell_lines[cell]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def is_draw(self, x_bits, o_bits):
+        """
+        Check if all cells are filled.
+
+        Args:
+            x_bits (int): The bitboard of X.
+            o_bits (int): The bitboard of O.
+
+        Returns:
+            bool: True if the board is full, False otherwise.
+        """
+        return (x_bits | o_bits) == self.full_board
+
+    def evaluate(self, me_bits, opp_bits):
+        """
+        Heuristic score of a position for the side to move.
+
+        Every line still open to only one player counts for that player, weighted
+        by how many marks it already holds.
+
+        Args:
+            me_bits (int): The bitboard of the side to move.
+            opp_bits (int): The bitboard of the opponent.
+
+        Returns:
+            int: Positive when the side to move stands better.
+        """
+        score = 0
+        for mask in self.line_masks:
+            mine = me_bits & mask
+            theirs = opp_bits & mask
+            if mine and not theirs:
+                score += self.line_weights[bin(mine).count('1')]
+            elif theirs and not mine:
+                score -= self.line_weights[bin(theirs).count('1')]
+        return score
+
+    def candidate_moves(self, me_bits, opp_bits):
+        """
+        List the moves worth searching, best first by the static ordering.
+
+        On boards larger than 3x3 only empty cells next to an existing mark are
+        considered.
+
+        Args:
+            me_bits (int): The bitboard of the side to move.
+            opp_bits (int): The bitboard of the opponent.
+
+        Returns:
+            list: Cell numbers of the candidate moves.
+        """
+        occupied = me_bits | opp_bits
+        if self.size > 3 and occupied:
+            near = 0
+            for cell in range(self.cell_count):
+                if occupied >> cell & 1:
+                    near |= self.neighbour_masks[cell]
+            near &= ~occupied
+            if near:
+                return [cell for cell in self.cells_by_centre if near >> cell & 1]
+        return [cell for cell in self.cells_by_centre if not occupied >> cell & 1]
+
+
+@lru_cache(maxsize=32)
+def get_game(size=3, win_length=None):
+    """
+    Get the shared GridGame for a board size and win length (the 32 most recently used are kept).
+
+    Args:
+        size (int): The number of rows and columns.
+        win_length (int): The number of marks in a row needed to win (defaults to size).
+
+    Returns:
+        GridGame: The precomputed game description.
+    """
+    return GridGame(size, win_length)
+
+
+class _Search:
+    """
+    State of one time-limited iterative deepening search.
+    """
+
+    def __init__(self, game, deadline, stop_event=None, stats=None):
+        self.game = game
+        self.deadline = deadline
+        self.stop_event = stop_event
+        self.stats = stats
+        self.nodes = 0
+        self.best_moves = {}  # Best move found for each searched position, used for ordering
+
+    def negamax(self, me_bits, opp_bits, depth, ply, alpha, beta):
+        self.nodes += 1
+        if not self.nodes & _CHECK_INTERVAL:
+            if time.perf_counter() >= self.deadline:
+                raise _SearchTimeout
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise _SearchTimeout
+
+        game = self.game
+        if (me_bits | opp_bits) == game.full_board:
+            return 0
+        if depth == 0:
+            return game.evaluate(me_bits, opp_bits)
+
+        stats = self.stats
+        if stats is not None:
+            return self._negamax_instrumented(me_bits, opp_bits, depth, ply, alpha, beta, stats)
+
+        moves = game.candidate_moves(me_bits, opp_bits)
+        hash_move = self.best_moves.get((me_bits, opp_bits))
+        if hash_move is not None:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+
+        best_score = -WIN_SCORE - 1
+        best_move = moves[0]
+        for cell in moves:
+            bits = me_bits | (1 << cell)
+            if game.wins_through(bits, cell):
+                score = WIN_SCORE - ply - 1
+            else:
+                score = -self.negamax(opp_bits, bits, depth - 1, ply + 1, -beta, -alpha)
+            if score > best_score:
+                best_score = score
+                best_move = cell
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        self.best_moves[(me_bits, opp_bits)] = best_move
+        return best_score
+
+    def _negamax_instrumented(self, me_bits, opp_bits, depth, ply, alpha, beta, stats):
+        # Same as the body of negamax, also counting cutoffs, hash move hits, depth and root move times
+        game = self.game
+        if ply + 1 > stats.max_depth:
+            stats.max_depth = ply + 1  # The children are visited below
+        moves = game.candidate_moves(me_bits, opp_bits)
+        hash_move = self.best_moves.get((me_bits, opp_bits))
+        stats.tt_probes += 1
+        if hash_move is not None:
+            stats.tt_hits += 1
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+
+        best_score = -WIN_SCORE - 1
+        best_move = moves[0]
+        for cell in moves:
+            if ply == 0:
+                move_start = time.perf_counter()
+            bits = me_bits | (1 << cell)
+            if game.wins_through(bits, cell):
+                score = WIN_SCORE - ply - 1
+            else:
+                score = -self.negamax(opp_bits, bits, depth - 1, ply + 1, -beta, -alpha)
+            if ply == 0:
+                stats.add_root_move(cell, score, 1000 * (time.perf_counter() - move_start))
+            if score > best_score:
+                best_score = score
+                best_move = cell
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        stats.cutoffs += 1
+                        break
+        self.best_moves[(me_bits, opp_bits)] = best_move
+        return best_score
+
+
+# Function to search for the computer's move within a time budget
+def search(game, cs_bits, ps_bits, time_budget_ms=DEFAULT_TIME_BUDGET_MS, max_depth=None, stop_event=None,
+           stats=None):
+    """
+    Find the computer's move with iterative deepening Alpha-Beta Pruning.
+
+    Args:
+        game (GridGame): The board size and win length.
+        cs_bits (int): The bitboard of the computer (the side to move).
+        ps_bits (int): The bitboard of the player.
+        time_budget_ms (float): Hard limit on the search time in milliseconds.
+        max_depth (int): Optional limit on the search depth in plies.
+        stop_event (threading.Event): Optional event that ends the search early when set.
+        stats (SearchStats): Optional statistics filled in with the search work and the time per root move.
+
+    Returns:
+        tuple: (move, score, depth) with the best cell number (or None if the board is full),
+            its score for the computer and the deepest fully searched depth.
+    """
+    start = time.perf_counter()
+    deadline = start + time_budget_ms / 1000
+    empty_count = game.cell_count - bin(cs_bits | ps_bits).count('1')
+    if empty_count == 0:
+        return None, 0, 0
+    limit = empty_count if max_depth is None else min(max_depth, empty_count)
+
+    searcher = _Search(game, deadline, stop_event, stats)
+    best_move = game.candidate_moves(cs_bits, ps_bits)[0]
+    best_score = 0
+    completed = 0
+    for depth in range(1, limit + 1):
+        try:
+            score = searcher.negamax(cs_bits, ps_bits, depth, 0, -WIN_SCORE - 1, WIN_SCORE + 1)
+        except _SearchTimeout:
+            break
+        best_move = searcher.best_moves[(cs_bits, ps_bits)]
+        best_score = score
+        completed = depth
+        if abs(score) >= WIN_SCORE - limit:  # Forced result found, deeper search cannot change it
+            break
+    if stats is not None:
+        stats.nodes += searcher.nodes
+        stats.completed_depth = completed
+        stats.elapsed_ms += 1000 * (time.perf_counter() - start)
+    return best_move, best_score, completed
+
+# Function to determine the computer's move on a list board of any size
+def computer_move(board, cs, ps, win_length=None, time_budget_ms=DEFAULT_TIME_BUDGET_MS, stop_event=None,
+                  stats=None):
+    """
+    Determine the computer's move on a size x size list board.
+
+    Args:
+        board (list): The current game board.
+        cs (str): The symbol of the computer ('X' or 'O').
+        ps (str): The symbol of the player ('X' or 'O').
+        win_length (int): The number of marks in a row needed to win (defaults to the board size).
+        time_budget_ms (float): Hard limit on the search time in milliseconds.
+        stop_event (threading.Event): Optional event that ends the search early when set.
+        stats (SearchStats): Optional statistics filled in with the search work.
+
+    Returns:
+        tuple: The best move as a tuple (row, column) or None if no valid move is found.
+    """
+    game = get_game(len(board), win_length)
+    cs_bits = game.from_list(board, cs)
+    ps_bits = game.from_list(board, ps)
+    cell, _, _ = search(game, cs_bits, ps_bits, time_budget_ms, stop_event=stop_event, stats=stats)
+    if cell is None:
+        return None
+    return divmod(cell, game.size)
@@ -0,0 +1,227 @@
+"""
+Region-of-interest hand tracking
+
+MediaPipe Hands is given the whole camera frame by default, although the hand
+only moves over the play area. RoiHands wraps a Hands model and, once a hand
+has been found, passes it a crop around the play area and the last known hand
+position instead. The landmarks of the crop are mapped back to normalized
+coordinates of the full frame, so callers see the same result as without the
+wrapper. When no hand is found in the crop, and every refresh_interval frames
+(so a hand entering outside the crop is picked up), the next frame is searched
+in full.
+
+The region is kept in normalized coordinates, so it works on downscaled frames
+(see Inference_Scheduler) too. In video mode MediaPipe tracks the hand from
+the landmarks of the previous image, which are only valid while the image keeps
+its framing, so the model's tracking is reset whenever the crop or the input
+size changes.
+
+Usage:
+    hands = RoiHands(mp.solutions.hands.Hands(), play_area=(0.0, 0.0, 0.5, 0.8))
+    landmarks = hands.process(frame_rgb).multi_hand_landmarks
+"""
+
+import numpy as np
+
+
+# Function to get the bounding box of a set of hand landmarks
+def landmark_bounds(multi_hand_landmarks):
+    """
+    Get the box around every landmark of every hand.
+
+    Args:
+        multi_hand_landmarks (list): MediaPipe hand landmarks (normalized coordinates).
+
+    Returns:
+        tuple: (x0, y0, x1, y1) in normalized coordinates.
+    """
+    xs = [landmark.x for hand in multi_hand_landmarks for landmark in hand.landmark]
+    ys = [landmark.y for hand in multi_hand_landmarks for landmark in hand.landmark]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+# Function to drop the landmarks a hands model tracks from one image to the next
+def reset_tracking(hands):
+    """
+    Make the next call to the model detect hands from scratch.
+
+    Args:
+        hands (mp.solutions.hands.Hands): The hand tracking model; models without reset()
+            (static image mode or older MediaPipe releases) are left alone.
+
+    Returns:
+        bool: Whether the model was reset.
+    """
+    reset = getattr(hands, 'reset', None)
+    if reset is None:
+        return False
+    reset()
+    return True
+
+
+class RoiHands:
+    """
+    Hands model wrapper that runs inference on a crop around the play area and the hand.
+
+    Args:
+        hands (mp.solutions.hands.Hands): The hand tracking model.
+        play_area (tuple): (x0, y0, x1, y1) of the play area in normalized coordinates, always
+            kept inside the crop; None when the play area is the whole frame.
+        margin (float): Space added around the hand on each side, as a fraction of the hand's size.
+        min_size (float): Minimum crop width and height, as a fraction of the frame's.
+        max_area (float): Crops covering more of the frame than this are not worth it; the full frame is used.
+        refresh_interval (int): Cropped frames in a row before one full-frame search.
+        keep_border (float): The crop is only moved when the hand comes within this fraction
+            of the crop's size from its edge, so MediaPipe sees a steady image between moves.
+    """
+
+    def __init__(self, hands, play_area=None, margin=0.5, min_size=0.25, max_area=0.8, refresh_interval=30,
+                 keep_border=0.1):
+        self.hands = hands
+        self.play_area = play_area
+        self.margin = margin
+        self.min_size = min_size
+        self.max_area = max_area
+        self.refresh_interval = refresh_interval
+        self.keep_border = keep_border
+        self.roi = None  # Normalized crop for the next frame, None to search the full frame
+        self._crop = None  # Buffer the crop is copied into, reused while the crop keeps its size
+        self._cropped_in_row = 0
+        self._framing = None  # (input shape, pixel crop) of the last image given to the model
+        self.frames = 0
+        self.cropped = 0
+        self.lost = 0
+        self.tracking_resets = 0
+        self._pixels = 0  # Pixels passed to the model
+        self._frame_pixels = 0  # Pixels of the full frames
+
+    def _target(self, bounds):
+        x0, y0, x1, y1 = bounds  # Around the hand, at least min_size on each axis
+        pad = self.margin * max(x1 - x0, y1 - y0)
+        half_width = max(x1 - x0 + 2 * pad, self.min_size) / 2
+        half_height = max(y1 - y0 + 2 * pad, self.min_size) / 2
+        center_x, center_y = (x0 + x1) / 2, (y0 + y1) / 2
+        x0, y0, x1, y1 = center_x - half_width, center_y - half_height, center_x + half_width, center_y + half_height
+        if self.play_area is not None:
+            px0, py0, px1, py1 = self.play_area
+            x0, y0, x1, y1 = min(x0, px0), min(y0, py0), max(x1, px1), max(y1, py1)
+        x0, y0, x1, y1 = max(x0, 0.0), max(y0, 0.0), min(x1, 1.0), min(y1, 1.0)
+        if (x1 - x0) * (y1 - y0) > self.max_area:
+            return None
+        return x0, y0, x1, y1
+
+    def _inside(self, bounds, roi):
+        x0, y0, x1, y1 = roi
+        border_x = self.keep_border * (x1 - x0)
+        border_y = self.keep_border * (y1 - y0)
+        return (bounds[0] >= x0 + border_x and bounds[1] >= y0 + border_y
+                and bounds[2] <= x1 - border_x and bounds[3] <= y1 - border_y)
+
+    def _update(self, multi_hand_landmarks, cropped):
+        if not multi_hand_landmarks:
+            if cropped:
+                self.lost += 1
+            self.roi = None  # Lost the hand: search the full frame next time
+            return
+        if cropped and self._cropped_in_row >= self.refresh_interval:
+            self.roi = None  # Look for hands outside the crop once in a while
+            return
+        bounds = landmark_bounds(multi_hand_landmarks)
+        if self.roi is None or not self._inside(bounds, self.roi):
+            self.roi = self._target(bounds)
+
+    def _set_framing(self, size, crop):
+        framing = (size, crop)
+        if self._framing is not None and framing != self._framing and reset_tracking(self.hands):
+            self.tracking_resets += 1  # The tracked landmarks belong to another framing
+        self._framing = framing
+
+    def process(self, image):
+        """
+        Run hand tracking on the region of interest of one frame.
+
+        Args:
+            image (np.ndarray): The RGB frame (any resolution).
+
+        Returns:
+            The MediaPipe result, with multi_hand_landmarks in normalized coordinates of the full image.
+        """
+        height, width = image.shape[:2]
+        self.frames += 1
+        self._frame_pixels += width * height
+        roi = self.roi
+        if roi is not None:
+            left, top = int(roi[0] * width), int(roi[1] * height)
+            right, bottom = max(int(np.ceil(roi[2] * width)), left + 1), max(int(np.ceil(roi[3] * height)), top + 1)
+            if left == 0 and right == width:
+                crop = image[top:bottom]  # Whole rows are contiguous: pass a view
+            else:
+                # MediaPipe needs contiguous pixels, so copy the crop into the reused buffer
+                view = image[top:bottom, left:right]
+                if self._crop is None or self._crop.shape != view.shape:
+                    self._crop = np.empty(view.shape, view.dtype)
+                crop = self._crop
+                np.copyto(crop, view)
+            self._set_framing((height, width), (left, top, right, bottom))
+            result = self.hands.process(crop)
+            crop_width, crop_height = right - left, bottom - top
+            if result.multi_hand_landmarks:
+                # Map the landmarks from the crop back to the full frame
+                scale_x, scale_y = crop_width / width, crop_height / height
+                offset_x, offset_y = left / width, top / height
+                for hand in result.multi_hand_landmarks:
+                    for landmark in hand.landmark:
+                        landmark.x = offset_x + landmark.x * scale_x
+                        landmark.y = offset_y + landmark.y * scale_y
+                        landmark.z *= scale_x  # Depth is relative to the image width
+            self.cropped += 1
+            self._cropped_in_row += 1
+            self._pixels += crop_width * crop_height
+        else:
+            self._set_framing((height, width), None)
+            result = self.hands.process(image)
+            self._cropped_in_row = 0
+            self._pixels += width * height
+        self._update(result.multi_hand_landmarks, roi is not None)
+        return result
+
+    def reset(self):
+        """
+        Forget the hand position, so the next frame is searched in full.
+        """
+        self.roi = None
+        self._cropped_in_row = 0
+
+    def close(self):
+        """
+        Close the wrapped model.
+        """
+        self.hands.close()
+
+    def stats(self):
+        """
+        Report how much of the frames was passed to the model.
+
+        Returns:
+            dict: Frames seen, cropped frames, times the hand was lost from the crop, tracking
+                resets on framing changes and the fraction of frame pixels that went through inference.
+        """
+        return {
+            'frames': self.frames,
+            'cropped': self.cropped,
+            'lost': self.lost,
+            'tracking_resets': self.tracking_resets,
+            'pixel_ratio': self._pixels / self._frame_pixels if self._frame_pixels else 1.0,
+        }
+
+    def report(self):
+        """
+        Format the statistics as one line.
+
+        Returns:
+            str: A human-readable summary.
+        """
+        stats = self.stats()
+        return (f"Hand ROI: {stats['cropped']} of {stats['frames']} frames cropped, hand lost {stats['lost']} times, "
+                f"tracking reset {stats['tracking_resets']} times, "
+                f"{100 * stats['pixel_ratio']:.0f}% of the pixels inferred")
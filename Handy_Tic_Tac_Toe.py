@@ -1,152 +1,363 @@
 "Handy Tic Tac Toe"
-import mediapipe as mp
+import time
 import cv2 
 import numpy as np
 import Tic_Tac_Toe as ttt
 import Helper_Functions as helper
+from Search_Worker import SearchWorker
+from Pipeline import Pipeline, Stage
+from Display import WindowDisplay, HeadlessDisplay
+from Overlay import BoardOverlay
+from Inference_Scheduler import InferenceScheduler
+from Hand_ROI import RoiHands
+from Play_Session import PlaySession
+from Game_Flow import GameFlow, SPLASH, NAME_ENTRY, PLAY, RESULT, REMATCH, QUIT, ESCAPE
+from Gesture_Selection import CellSelector
+import Game_Record as gr
+from Frame_Profiler import FrameProfiler, DISABLED as PROFILING_DISABLED
 
 
 
+# Function to run hand inference on one frame (inference stage)
+def detect_hand(packet, hands, mp_hands, scheduler=None, profiler=PROFILING_DISABLED, pool=None):
+    """
+    Flip the frame in place and locate the index finger tip with MediaPipe Hands.
+
+    Args:
+        packet (dict): The pipeline packet holding the captured 'frame'.
+        hands (mp.solutions.hands.Hands): The hand tracking model, or a RoiHands wrapping it.
+        mp_hands (module): The MediaPipe hands solution module.
+        scheduler (InferenceScheduler): Optional scheduler that skips or downscales inference while the hand is still.
+        profiler (FrameProfiler): Times the colour conversion and the hand tracking.
+        pool (FramePool): Optional pool holding the RGB buffer reused for every frame.
+
+    Returns:
+        dict: The packet with the flipped 'frame', 'hand_landmarks' and 'fingertip' (pixel
+            coordinates of the index finger tip, or None when no hand was found).
+    """
+    with profiler.span('flip+cvtColor'):
+        frame = cv2.flip(packet['frame'], 1, dst=packet['frame'])  # Flip the frame horizontally in place
+        height, width = frame.shape[:2]  # Get frame dimensions
+        if pool is not None:
+            # Convert frame to RGB into the buffer kept from the previous frame
+            frame_rgb = pool.keep('rgb', cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=pool.slot('rgb')))
+        else:
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)  # Convert frame to RGB
+    with profiler.span('hands.process'):
+        if scheduler is not None:
+            multi_hand_landmarks = scheduler.process(hands, frame_rgb)  # Process hand landmarks when needed
+        else:
+            multi_hand_landmarks = hands.process(frame_rgb).multi_hand_landmarks  # Process hand landmarks
+
+    packet['frame'] = frame
+    packet['hand_landmarks'] = None
+    packet['fingertip'] = None
+    if multi_hand_landmarks:
+        hand_landmarks = multi_hand_landmarks[0]  # Get first hand landmarks
+        # Get coordinates of the tip of the index finger and convert to pixel coordinates
+        index_finger_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
+        packet['hand_landmarks'] = hand_landmarks
+        packet['fingertip'] = (int(index_finger_tip.x * width), int(index_finger_tip.y * height))
+    return packet
+
+# Function to resolve the pointed cell and confirm dwell selections (selection stage)
+def resolve_cell(packet, selector):
+    """
+    Smooth the fingertip, track which cell it points at and confirm it once it dwells there long enough.
+
+    Args:
+        packet (dict): The pipeline packet with 'frame', 'fingertip' and 'clock' (frame time in seconds).
+        selector (CellSelector): The selection state carried between frames.
+
+    Returns:
+        dict: The packet with 'pointed_cell', 'selected_cell' (the confirmed cell or None),
+            'dwell_progress' (0-1) and the smoothed 'pointer' position.
+    """
+    height, width = packet['frame'].shape[:2]
+    packet['selected_cell'] = selector.update(packet['fingertip'], packet['clock'], (width, height))
+    packet['pointed_cell'] = selector.cell
+    packet['pointer'] = selector.point
+    packet['dwell_progress'] = selector.progress(packet['clock'])
+    return packet
+
 # Main function to run the Tic Tac Toe game
-def main():
-    # Open the webcam
-    cap = helper.Open_Video_Frame()  
-    player_name = ''  # Variable to store player name
+def main(queue_depth=2, source=0, realtime=True, headless=False, output=None, on_frame=None, player_name='',
+         adaptive_inference=True, dwell_time=1.0, record_path=None, hud=False, profile=False,
+         trace_path=None, roi_tracking=True, session=None):
+    """
+    Run the webcam game.
+
+    Capture, hand inference and cell selection run as pipeline stages on their
+    own threads; game logic and rendering stay on the calling thread. The webcam
+    and hand model come from a PlaySession, opened for this game unless one is given.
+
+    Args:
+        queue_depth (int): Capacity of each pipeline stage queue.
+        source: A camera index, or a video file, image directory or 'synthetic' to replay instead
+            (ignored when a session is given).
+        realtime (bool): Pace recorded input to its frame rate; False runs it as fast as possible
+            (ignored when a session is given).
+        headless (bool): Run without windows, key input, tkinter or the splash screen, ending after the first game.
+        output (str): In headless mode, a video file to write the rendered game frames to.
+        on_frame (callable): In headless mode, called as on_frame(window_name, image) for every rendered image;
+            the image buffer is reused afterwards, so copy it to keep it.
+        player_name (str): The player's name; headless runs skip name entry and default to 'Player'.
+        adaptive_inference (bool): Skip or downscale hand inference while the fingertip holds still.
+        dwell_time (float): Seconds the finger must rest on a cell to select it.
+        record_path (str): Game record file the moves and fingertip trace are appended to, such as
+            Game_Record.DEFAULT_PATH; None (the default) records nothing.
+        hud (bool): Show FPS, latency and per-stage timings and the computer's search statistics on the webcam frame.
+        profile (bool): Time every stage of the frame loop and print the percentiles on exit (implied by hud).
+        trace_path (str): Write the stage timings to this Chrome trace file on exit (implies profile).
+        roi_tracking (bool): Run hand tracking on a crop around the last hand position instead of the whole frame.
+        session (PlaySession): Open webcam and hand model to play on; the caller must not run
+            another game on it at the same time (PlaySession.play guards this).
+    """
+    requested = time.perf_counter()  # Start of the wait for the first playable frame
+    owned = session is None
+    if owned:
+        session = PlaySession(source, realtime)  # Opened for this game only
+    warm = session.is_open  # Camera and hand tracking already running: no loading screen needed
+    session.open()  # Open the webcam and load the hand model unless already done
+    live, frames, cap = session.live, session.frames, session.cap
     player_symbol = ['X', 'O']  # Symbols for player and computer
-    typing_active = True  # Flag to manage player name input
     board, turn = ttt.initialization()  # Initialize game board and starting turn
-    window_width, window_height = helper.get_window_height_and_width()  # Get dimensions of the window
-    pointed_cell = None  # Currently pointed cell by the player's finger
-    stable_cell = None  # Stable cell selected by the player's finger
-    stable_count = 0  # Count of stable frames for finger position
-    required_stable_frames = 30  # Number of stable frames required to confirm cell selection
-
-    # Initialize MediaPipe Hands module
-    mp_hands = mp.solutions.hands  
-    hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7)  # Configure Hands instance
+    if headless:
+        display = HeadlessDisplay(output, on_frame)  # Write frames instead of showing them
+        window_width, window_height = 640, 360  # No screen to measure
+        player_name = player_name or 'Player'
+    else:
+        display = WindowDisplay()
+        window_width, window_height = helper.get_window_height_and_width()  # Get dimensions of the window
+    display.configure('Webcam Frame', window_width + 200, window_height + 200)
+    selector = CellSelector(dwell_time)  # Confirms the cell the player's finger rests on
+    worker = SearchWorker(instrument=hud)  # Runs the computer's search off the frame loop
+    pending_move = None  # Future of the computer's move while it is thinking
+    recorder = gr.GameRecorder(record_path) if record_path else None  # Logs every move of the game
+
+    # MediaPipe Hands, loaded by the session (imported there so importing this module stays cheap)
+    import mediapipe as mp
+    mp_hands = session.mp_hands
+    hands = session.hands
+    roi = RoiHands(hands) if roi_tracking else None  # The grid covers the frame, so only the hand bounds the crop
+    hands = roi or hands
     mp_draw = mp.solutions.drawing_utils  # MediaPipe drawing utilities
+    scheduler = InferenceScheduler() if adaptive_inference else None  # Relaxes inference while the hand is stable
 
-    #Loading screen
+    #Loading screen, shown while the camera and hand tracking warm up
     display_screen = np.zeros((1080, 640, 3), np.uint8)
     helper.display_message("Tic Tac Toe", display_screen, position=(50, 400), font_scale=3 )
     helper.display_message("Loading......", display_screen, position=(50, 650), font_scale=3 )
-    cv2.namedWindow('Initial Window', cv2.WINDOW_NORMAL)
-    cv2.resizeWindow('Initial Window', 1080, 640)
-    cv2.imshow('Initial Window', display_screen)
-    cv2.waitKey(5000)  
-    cv2.destroyWindow('Initial Window')
+    display.configure('Initial Window', 1080, 640)
+    # Splash -> name entry -> play -> result -> rematch, advanced once per frame without blocking
+    flow = GameFlow(splash_time=0 if headless or warm else 5.0, result_time=0 if headless else 3.0,
+                    need_name=not player_name, rematch=not headless)
+
+    # Capture -> hand inference -> cell selection, each on its own thread
+    def read_frame():
+        with profiler.span('capture'):
+            entry = cap.read_timestamped()  # Read the newest frame from webcam
+        if entry is None:
+            return None
+        frame_id, timestamp, frame = entry
+        # Recorded input is timed by its frame rate so replays select moves identically at any speed
+        clock = timestamp if live else frame_id / cap.fps
+        return {'frame_id': frame_id, 'timestamp': timestamp, 'clock': clock, 'frame': frame}
+
+    overlay = BoardOverlay()  # Grid and marks composited onto the webcam frame
+    canvas = BoardOverlay()  # Grid and marks for the Tic Tac Toe window
+    Initial_frame = np.zeros((window_height + 200, window_width + 200, 3), np.uint8)  # Name entry screen, reused
+
+    profiler = FrameProfiler(trace_path=trace_path, enabled=bool(hud or profile or trace_path))  # Per-stage timings
+    policy = 'drop_oldest' if live else 'block'
+    pipeline = Pipeline(read_frame, [
+        Stage('inference', lambda packet: detect_hand(packet, hands, mp_hands, scheduler, profiler, frames),
+              queue_depth, policy),
+        Stage('selection', lambda packet: resolve_cell(packet, selector), queue_depth),
+    ], output_depth=queue_depth, output_policy=policy, on_drop=lambda packet: frames.release(packet['frame'])).start()
 
     # Main game loop
-    while True:
-        ret, frame = cap.read()  # Read frame from webcam
-        frame = cv2.flip(frame, 1)  # Flip the frame horizontally
-        height, width = frame.shape[:2]  # Get frame dimensions
-        Initial_frame = np.zeros((window_height + 200, window_width + 200, 3), np.uint8)  # Blank initial frame
-        Canvas = np.zeros((300, 300, 3), np.uint8)  # Blank canvas for game grid
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)  # Convert frame to RGB
-        result = hands.process(frame_rgb)  # Process hand landmarks
-
-        # Draw hand landmarks on frame if detected
-        if result.multi_hand_landmarks:  
-            hand_landmarks = result.multi_hand_landmarks[0]  # Get first hand landmarks
-            mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)  # Draw hand landmarks
-
-            # Get coordinates of the tip of the index finger
-            index_finger_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-            # Convert to pixel coordinates
-            cx, cy = int(index_finger_tip.x * width), int(index_finger_tip.y * height)  
-            cv2.circle(frame, (cx, cy), 3, (0, 255, 0), -1)  # Draw circle at finger tip
-
-            # Determine which cell is pointed by the index finger
-            pointed_cell = helper.get_cell_number(frame, (cx, cy))  
-
-            # Check if the finger is pointing to the same cell stably
-            if stable_cell == pointed_cell:
-                stable_count += 1
-            else:
-                stable_cell = pointed_cell
-                stable_count = 0
+    game_started = False  # The dwell was restarted for the current game
+    frame = None  # Frame being rendered, returned to the pool once shown
+    try:
+        while True:
+            packet = pipeline.get()  # Wait for the next processed frame
+            if packet is None:
+                break
+            profiler.lap('wait')
+            frame = packet['frame']
+            playing = flow.state == PLAY
+            if not game_started and playing:
+                game_started = True
+                selector.restart_dwell(packet['clock'])  # Ignore dwells begun before the game
+            if recorder is not None and playing:
+                if not recorder.in_game:
+                    recorder.start_game(player_name, 'Computer')  # Begin the record once the player is known
+                if turn == 0 and packet['fingertip'] is not None:
+                    recorder.add_point(*packet['fingertip'])  # Trace leading up to the player's move
 
-            # Confirm cell selection if pointed stably for required frames
-            if stable_count > required_stable_frames:
-                row, col = divmod(stable_cell, 3)
+            # Draw hand landmarks on frame if detected
+            if packet['hand_landmarks'] is not None:
+                mp_draw.draw_landmarks(frame, packet['hand_landmarks'], mp_hands.HAND_CONNECTIONS)  # Draw hand landmarks
+                cv2.circle(frame, packet['fingertip'], 3, (0, 255, 0), -1)  # Draw circle at finger tip
+                if turn == 0 and playing and packet['dwell_progress'] > 0:
+                    # Draw how far the selection of the pointed cell has progressed
+                    cv2.ellipse(frame, packet['pointer'], (15, 15), -90, 0, int(360 * packet['dwell_progress']), (0, 255, 255), 3)
+            profiler.lap('draw_landmarks')
+
+            # Apply a confirmed cell selection on the player's turn; the selector keeps it until
+            # taken, so a dropped packet does not lose it
+            selected = selector.take_selection() if turn == 0 and playing else None
+            if selected is not None:
+                row, col = divmod(selected[0], 3)
                 if ttt.is_valid_move(board, row, col):
                     board[row][col] = player_symbol[turn]  # Update board with player's move
+                    if recorder is not None:
+                        recorder.record_move(selected[0])
                     turn ^= 1  # Switch turn
-                    stable_cell = None  # Reset stable cell
-                    stable_count = 0
-
-        # Draw game grid and marks on Canvas and frame
-        Canvas = helper.draw_grid(Canvas)
-        frame = helper.draw_grid(frame)
-        Canvas = helper.draw_marks(Canvas, board)
-        frame = helper.draw_marks(frame, board)
-        copy_frame = frame.copy()  # Create a copy of the frame
-
-        # Configure display window for webcam frame
-        cv2.namedWindow('Webcam Frame', cv2.WINDOW_NORMAL)
-        cv2.resizeWindow('Webcam Frame', window_width + 200, window_height + 200)
-
-        # Handle player name input
-        if typing_active:  
-            helper.display_message("Enter Your Name :", Initial_frame, position=(window_height // 5, window_width // 6), font_scale=2, color=(0, 150, 0), thickness=3)
-            helper.display_message(player_name, Initial_frame, position=(window_height // 2, window_width // 2), font_scale=1, color=(139, 0, 0), thickness=2)
-            cv2.imshow('Webcam Frame', Initial_frame)
-            key = cv2.waitKey(1)  # Wait for key press
-            if key == 13 and player_name:  # Enter key pressed and name is non-empty
-                typing_active = False  # Deactivate name input
-            elif key != -1:
-                player_name = helper.update_text(key, player_name)  # Update player name
-
-        else:  # Handle game turns
-            if turn == 0:  # Player's turn
-                helper.display_message(f"{player_name}'s Turn", frame, position=(50, 100), font_scale=2)
-                cv2.imshow('Webcam Frame', frame)
-            else:  # Computer's turn
-                helper.display_message("Computer's Turn", frame, position=(50, 100), font_scale=2)
-                computer_move_pos = ttt.computer_move(board, player_symbol[1], player_symbol[0])  # Get computer's move
-                if computer_move_pos:
-                    board[computer_move_pos[0]][computer_move_pos[1]] = player_symbol[turn]  # Update board with computer's move
-                    turn ^= 1  # Switch turn
 
-        # Display Tic Tac Toe grid
-        cv2.imshow('Tic Tac Toe', Canvas)
-
-        # Check game status for win, lose, or draw
-        if ttt.is_win(board, player_symbol[0]):  # Player wins
-            Canvas = helper.draw_marks(Canvas, board)
-            frame = helper.draw_marks(copy_frame, board)
-            helper.display_message(f"{player_name} Wins!", copy_frame, position=(50, 300), font_scale=2)
-            cv2.imshow('Webcam Frame', copy_frame) 
-            cv2.imshow('Tic Tac Toe', Canvas)
-            cv2.waitKey(5000)
-            break
-        elif ttt.is_win(board, player_symbol[1]):  # Computer wins
-            Canvas = helper.draw_marks(Canvas, board)
-            frame = helper.draw_marks(copy_frame, board)
-            helper.display_message("Computer Wins!", copy_frame, position=(50, 300), font_scale=2)
-            cv2.imshow('Webcam Frame', copy_frame)
-            cv2.imshow('Tic Tac Toe', Canvas)
-            cv2.waitKey(5000)
-            break
-        elif ttt.is_draw(board):  # Draw game
-            Canvas = helper.draw_marks(Canvas, board)
-            frame = helper.draw_marks(copy_frame, board)
-            helper.display_message("Draw!", copy_frame, position=(200, 300), font_scale=3)
-            cv2.imshow('Webcam Frame', copy_frame)
-            cv2.imshow('Tic Tac Toe', Canvas)
-            cv2.waitKey(5000)
-            break
-
-        # Exit game on 'q' key press
-        if cv2.waitKey(1) & 0xFF == ord('q'):  
-            break
-
-    # Release the webcam and close all OpenCV windows
-    cap.release()
-    cv2.destroyAllWindows()
+            # Start the computer's search on its turn and apply its move once found
+            if turn == 1 and playing:
+                if pending_move is None:
+                    pending_move = worker.submit(board, player_symbol[1], player_symbol[0])  # Start computer's search
+                elif pending_move.done():
+                    computer_move_pos = pending_move.result()  # Get computer's move
+                    pending_move = None
+                    if computer_move_pos:
+                        board[computer_move_pos[0]][computer_move_pos[1]] = player_symbol[turn]  # Update board with computer's move
+                        if recorder is not None:
+                            recorder.record_move(computer_move_pos[0] * 3 + computer_move_pos[1])
+                        turn ^= 1  # Switch turn
+                        selector.restart_dwell(packet['clock'])  # A finger left resting on a cell must dwell anew
+
+            # Check game status for win, lose, or draw
+            if playing:
+                if ttt.is_win(board, player_symbol[0]):  # Player wins
+                    result = (f"{player_name} Wins!", (50, 300), 2, gr.X_WON)
+                elif ttt.is_win(board, player_symbol[1]):  # Computer wins
+                    result = ("Computer Wins!", (50, 300), 2, gr.O_WON)
+                elif ttt.is_draw(board):  # Draw game
+                    result = ("Draw!", (200, 300), 3, gr.DRAW)
+                else:
+                    result = None
+                if result is not None:
+                    if recorder is not None:
+                        recorder.end_game(result[3])
+                    flow.finish_game(result)
+
+            profiler.lap('game')
+
+            # Draw game grid and marks from the cached layers (redrawn only when the board changes)
+            overlay.composite(frame, board)
+            if hud:
+                helper.draw_hud(frame, profiler.hud_lines() + worker.history.hud_lines())  # Frame loop and search cost
+            Canvas = canvas.render((300, 300, 3), board)
+
+            profiler.lap('draw_grid+marks')
+
+            if flow.state == SPLASH:
+                display.show('Initial Window', display_screen)
+            elif flow.state == NAME_ENTRY:  # Handle player name input
+                Initial_frame.fill(0)  # Blank initial frame
+                helper.display_message("Enter Your Name :", Initial_frame, position=(window_height // 5, window_width // 6), font_scale=2, color=(0, 150, 0), thickness=3)
+                helper.display_message(player_name, Initial_frame, position=(window_height // 2, window_width // 2), font_scale=1, color=(139, 0, 0), thickness=2)
+                display.show('Webcam Frame', Initial_frame)
+            else:
+                if flow.state in (RESULT, REMATCH):
+                    message, position, font_scale, _ = flow.result
+                    helper.display_message(message, frame, position=position, font_scale=font_scale)
+                    if flow.state == REMATCH:
+                        helper.display_message("Press 'r' for a rematch or 'q' to quit", frame, position=(50, 450),
+                                               font_scale=1)
+                elif turn == 0:  # Player's turn
+                    helper.display_message(f"{player_name}'s Turn", frame, position=(50, 100), font_scale=2)
+                else:  # Computer's turn
+                    helper.display_message("Computer is thinking...", frame, position=(50, 100), font_scale=2)
+                display.show('Webcam Frame', frame)
+                if requested is not None and flow.state == PLAY:
+                    session.first_playable_ms.append(1000 * (time.perf_counter() - requested))
+                    requested = None
+
+            # Display Tic Tac Toe grid
+            if flow.state != SPLASH:
+                display.show('Tic Tac Toe', Canvas)
+
+            key = display.wait_key(1)
+            frames.release(frame)  # Shown, so the buffer can take another capture
+            frame = None
+            frames.frame()
+            profiler.lap('imshow+waitKey')
+            profiler.frame(packet['timestamp'])
+
+            # Type the name, skip the splash, rematch or quit ('q', or Escape while typing)
+            previous_state = flow.state
+            if previous_state == NAME_ENTRY and key != -1:
+                if key == 13 and player_name:  # Enter key pressed and name is non-empty
+                    flow.finish_name()
+                elif key != ESCAPE:
+                    player_name = helper.update_text(key, player_name)  # Update player name
+            flow.update(key)
+            if session.stop_requested():
+                flow.quit()  # Stopped from the launcher
+            if previous_state == SPLASH and flow.state != SPLASH:
+                display.hide('Initial Window')
+            if flow.state == PLAY and previous_state in (NAME_ENTRY, RESULT, REMATCH):
+                requested = time.perf_counter()  # Waiting on the player is not start-up time
+            if flow.state == PLAY and previous_state in (RESULT, REMATCH):
+                board, turn = ttt.initialization()  # Rematch: start over on the same session
+                worker.cancel()
+                pending_move = None
+                game_started = False
+            if flow.state == QUIT:
+                break
+    finally:
+        # Stop the pipeline and search worker, release the webcam (unless the session outlives the game)
+        # and close all OpenCV windows, also when the game failed
+        pipeline.stop()  # Frames still in flight go back to the pool
+        frames.release(frame)
+        worker.cancel()  # Abandon the computer's search
+        worker.shutdown()
+        if recorder is not None:
+            recorder.close()  # An unfinished game is recorded as abandoned
+        if owned:
+            session.close()
+        display.close()
+
+    session.player_name = player_name
+    session.games += flow.games
+    print(pipeline.report())
+    if scheduler is not None:
+        print(scheduler.report())
+    if roi is not None:
+        print(roi.report())
+    print(frames.report())
+    print(session.report())
+    if profiler.enabled:
+        print(profiler.report())
+        if trace_path:
+            print(f"Wrote {profiler.write_trace()} trace events to {trace_path}")
 
 # Run the main function if the script is executed
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Play Tic Tac Toe with hand gestures.")
+    parser.add_argument('--source', default='0',
+                        help="camera index, video file, image directory or 'synthetic[:frames]'")
+    parser.add_argument('--fast', action='store_true',
+                        help="replay recorded input as fast as possible instead of at its frame rate")
+    parser.add_argument('--headless', action='store_true',
+                        help="run without windows or the splash screen")
+    parser.add_argument('--output', help="video file for the rendered frames in headless mode")
+    parser.add_argument('--hud', action='store_true',
+                        help="show FPS, latency, stage timings and search statistics on the webcam frame")
+    parser.add_argument('--profile', action='store_true', help="print per-stage timing percentiles on exit")
+    parser.add_argument('--trace', help="write a Chrome trace of the frame loop to this file")
+    parser.add_argument('--record', nargs='?', const=gr.DEFAULT_PATH, metavar='PATH',
+                        help=f"append the games to a game record file (default {gr.DEFAULT_PATH})")
+    parser.add_argument('--no-roi', action='store_true',
+                        help="run hand tracking on the whole frame instead of around the last hand position")
+    args = parser.parse_args()
+    main(source=int(args.source) if args.source.isdigit() else args.source, realtime=not args.fast,
+         headless=args.headless, output=args.output, hud=args.hud, profile=args.profile, trace_path=args.trace,
+         roi_tracking=not args.no_roi, record_path=args.record)
 
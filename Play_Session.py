@@ -0,0 +1,232 @@
+"""
+Long-lived play session
+
+Opening the webcam and loading MediaPipe Hands take seconds, and every game
+used to do both again. A PlaySession opens the capture source and loads the
+hand model once, then runs any number of games against them, so a launcher
+can start, rematch and stop games without paying the start-up cost again.
+
+Only one game runs on a session at a time, and a camera can only be opened by
+one session at a time, so two games never fight over the same device.
+
+Usage:
+    session = PlaySession(source=0)
+    session.start(player_name='Ada')  # Runs Handy_Tic_Tac_Toe.main on a game thread
+    ...
+    session.stop()
+    session.close()
+"""
+
+import threading
+import time
+
+import numpy as np
+
+import Helper_Functions as helper
+from Frame_Buffers import FramePool
+
+_claimed_cameras = set()  # Camera indices opened by a session
+_claim_lock = threading.Lock()
+
+
+class PlaySession:
+    """
+    Capture source and hand model shared by the games of one session.
+
+    Args:
+        source: A camera index (int or digit string), or a video file, image directory or 'synthetic' to replay instead.
+        realtime (bool): Pace recorded input to its frame rate; False runs it as fast as possible.
+        max_num_hands (int): Hands tracked by the model.
+        min_detection_confidence (float): Detection threshold of the model.
+    """
+
+    def __init__(self, source=0, realtime=True, max_num_hands=1, min_detection_confidence=0.7):
+        if isinstance(source, str) and source.isdigit():
+            source = int(source)  # A camera index given as text, as Frame_Source.open_source accepts
+        self.source = source
+        self.realtime = realtime
+        self.max_num_hands = max_num_hands
+        self.min_detection_confidence = min_detection_confidence
+        self.live = isinstance(source, int)  # Live frames may be dropped, recorded input is replayed frame by frame
+        self.frames = None  # Frame buffers recycled from the display back to the capture
+        self.cap = None
+        self.mp_hands = None
+        self.hands = None
+        self.player_name = ''  # Name typed in the last game, reused by later games
+        self.games = 0  # Games played on the session
+        self.open_ms = None  # Time spent opening the capture source
+        self.model_ms = None  # Time spent loading and warming up the hand model
+        self.first_playable_ms = []  # Time to the first playable frame of each game
+        self._lock = threading.RLock()
+        self._game_lock = threading.Lock()  # Held while a game runs
+        self._stop = threading.Event()
+        self._thread = None
+        self._claimed = False  # This session holds the camera in _claimed_cameras
+
+    @property
+    def is_open(self):
+        """
+        bool: True once the capture source and hand model are ready.
+        """
+        return self.hands is not None
+
+    @property
+    def running(self):
+        """
+        bool: True while a game runs on the session.
+        """
+        return self._game_lock.locked()
+
+    def open(self):
+        """
+        Open the capture source and load the hand model, unless already done.
+
+        Raises:
+            RuntimeError: If another session has the camera open.
+
+        Returns:
+            PlaySession: self, for chaining.
+        """
+        with self._lock:
+            if self.is_open:
+                return self
+            if self.live:
+                with _claim_lock:
+                    if self.source in _claimed_cameras:
+                        raise RuntimeError(f"Camera {self.source} is already in use by another play session")
+                    _claimed_cameras.add(self.source)
+                    self._claimed = True
+            hands = None
+            try:
+                start = time.perf_counter()
+                self.frames = FramePool()
+                self.cap = helper.Open_Video_Frame(threaded=self.live, source=self.source, realtime=self.realtime,
+                                                   pool=self.frames)
+                self.open_ms = 1000 * (time.perf_counter() - start)
+
+                # Imported here so importing this module stays cheap
+                start = time.perf_counter()
+                import mediapipe as mp
+                self.mp_hands = mp.solutions.hands
+                hands = self.mp_hands.Hands(max_num_hands=self.max_num_hands,
+                                            min_detection_confidence=self.min_detection_confidence)
+                # The first inference builds the graph; run it now on a blank frame, without using up any input
+                hands.process(np.zeros((720, 1280, 3), np.uint8))
+            except BaseException:
+                # Leave nothing half open, so a later open() can try again
+                if hands is not None:
+                    hands.close()
+                self._release()
+                raise
+            self.hands = hands
+            self.model_ms = 1000 * (time.perf_counter() - start)
+            return self
+
+    def play(self, **options):
+        """
+        Run one game (with its rematches) on the calling thread.
+
+        Args:
+            **options: Keyword arguments of Handy_Tic_Tac_Toe.main except source and realtime;
+                player_name defaults to the name typed in the last game.
+
+        Returns:
+            bool: False if a game was already running on the session.
+        """
+        if not self._game_lock.acquire(blocking=False):
+            return False
+        try:
+            self._stop.clear()
+            self.open()
+            import Handy_Tic_Tac_Toe as game
+            options.setdefault('player_name', self.player_name)
+            game.main(session=self, **options)
+        finally:
+            self._game_lock.release()
+        return True
+
+    def start(self, **options):
+        """
+        Run one game on a new game thread.
+
+        Args:
+            **options: As for play().
+
+        Returns:
+            bool: False if a game was already running on the session.
+        """
+        with self._lock:
+            if self.running or (self._thread is not None and self._thread.is_alive()):
+                return False
+            self._thread = threading.Thread(target=self.play, kwargs=options, name='game', daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, wait=False):
+        """
+        Ask the running game to end after its current frame.
+
+        Args:
+            wait (bool): Wait for the game thread to finish.
+        """
+        self._stop.set()
+        thread = self._thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def stop_requested(self):
+        """
+        Check if stop() was called during the current game.
+
+        Returns:
+            bool: True if the game should end.
+        """
+        return self._stop.is_set()
+
+    def close(self):
+        """
+        Stop the running game, release the capture source and close the hand model.
+        """
+        self.stop(wait=True)
+        with self._lock:
+            if self.hands is not None:
+                self.hands.close()
+                self.hands = None
+            self._release()
+
+    def _release(self):
+        # Release the capture source and give the camera back, if this session holds them
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        if self._claimed:
+            with _claim_lock:
+                _claimed_cameras.discard(self.source)
+            self._claimed = False
+
+    def stats(self):
+        """
+        Summarize the start-up costs paid by the session.
+
+        Returns:
+            dict: 'games' played, 'open_ms' and 'model_ms' paid once, and the 'first_playable_ms' of each game.
+        """
+        return {'games': self.games, 'open_ms': self.open_ms, 'model_ms': self.model_ms,
+                'first_playable_ms': list(self.first_playable_ms)}
+
+    def report(self):
+        """
+        Format the statistics as one line.
+
+        Returns:
+            str: A human-readable summary.
+        """
+        stats = self.stats()
+        line = (f"Play session: {stats['games']} games, capture opened in {stats['open_ms'] or 0:.0f} ms and "
+                f"hand model ready in {stats['model_ms'] or 0:.0f} ms once")
+        times = stats['first_playable_ms']
+        if times:
+            line += f", first playable frame after {times[0]:.0f} ms"
+            if len(times) > 1:
+                line += f" (then {sum(times[1:]) / len(times[1:]):.0f} ms avg)"
+        return line
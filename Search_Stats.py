@@ -0,0 +1,138 @@
+"""
+Search instrumentation
+
+A SearchStats object is passed down to Bitboard.alpha_beta or the Grid_Engine
+search and filled in as it runs. Leaving it out (the default) keeps the search
+on its uninstrumented path: the only cost is one None check per node.
+"""
+
+from collections import deque
+
+
+class SearchStats:
+    """
+    Work done by one computer move search.
+
+    Attributes:
+        nodes (int): Positions visited.
+        cutoffs (int): Alpha-beta cutoffs (moves left unsearched after a refutation).
+        max_depth (int): The deepest ply reached below the root.
+        completed_depth (int): The deepest fully searched iteration (iterative deepening only).
+        tt_probes (int): Transposition table lookups.
+        tt_hits (int): Lookups that found a stored entry.
+        root_moves (dict): Per root cell, [score, wall time in ms] spent searching it.
+        elapsed_ms (float): Wall time of the whole search.
+        source (str): 'search' or 'book' when the opening book answered without searching.
+    """
+
+    __slots__ = ('nodes', 'cutoffs', 'max_depth', 'completed_depth', 'tt_probes', 'tt_hits', 'root_moves',
+                 'elapsed_ms', 'source')
+
+    def __init__(self):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.max_depth = 0
+        self.completed_depth = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.root_moves = {}
+        self.elapsed_ms = 0.0
+        self.source = 'search'
+
+    @property
+    def prune_ratio(self):
+        """
+        float: Cutoffs per visited node.
+        """
+        return self.cutoffs / self.nodes if self.nodes else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        """
+        float: Fraction of transposition table lookups that hit.
+        """
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def add_root_move(self, cell, score, elapsed_ms):
+        """
+        Account the search of one root move; repeated searches (deeper iterations) add up.
+
+        Args:
+            cell (int): The root move.
+            score (int): Its latest score.
+            elapsed_ms (float): Wall time spent on it in milliseconds.
+        """
+        entry = self.root_moves.get(cell)
+        if entry is None:
+            self.root_moves[cell] = [score, elapsed_ms]
+        else:
+            entry[0] = score
+            entry[1] += elapsed_ms
+
+    def as_dict(self):
+        """
+        Get the statistics as plain data.
+
+        Returns:
+            dict: Every counter, the derived ratios and the root moves as {cell: {'score', 'ms'}}.
+        """
+        stats = {name: getattr(self, name) for name in self.__slots__ if name != 'root_moves'}
+        stats['prune_ratio'] = self.prune_ratio
+        stats['tt_hit_rate'] = self.tt_hit_rate
+        stats['root_moves'] = {cell: {'score': score, 'ms': ms} for cell, (score, ms) in sorted(self.root_moves.items())}
+        return stats
+
+    def summary(self):
+        """
+        Format the statistics as one line.
+
+        Returns:
+            str: A human-readable summary.
+        """
+        if self.source == 'book':
+            return f"book move in {self.elapsed_ms:.2f} ms"
+        return (f"{self.nodes} nodes, {self.cutoffs} cutoffs ({100 * self.prune_ratio:.0f}%), "
+                f"depth {self.max_depth}, TT {self.tt_hits}/{self.tt_probes}, {self.elapsed_ms:.1f} ms")
+
+
+class StatsHistory:
+    """
+    Rolling window of recent search statistics, formatted for an on-screen HUD.
+
+    Args:
+        window (int): The number of searches kept.
+    """
+
+    def __init__(self, window=20):
+        self.recent = deque(maxlen=window)
+
+    def add(self, stats):
+        """
+        Add the statistics of a finished search (may run on another thread than hud_lines).
+
+        Args:
+            stats (SearchStats): The statistics.
+        """
+        self.recent.append(stats)
+
+    def hud_lines(self):
+        """
+        Get the HUD text.
+
+        Returns:
+            list: Lines describing the last search and the window averages (empty before the first search).
+        """
+        recent = list(self.recent)  # add() runs on the search thread; aggregate a snapshot
+        if not recent:
+            return []
+        last = recent[-1]
+        count = len(recent)
+        mean_ms = sum(stats.elapsed_ms for stats in recent) / count
+        max_ms = max(stats.elapsed_ms for stats in recent)
+        mean_nodes = sum(stats.nodes for stats in recent) / count
+        lines = [f"search: {last.summary()}"]
+        if last.root_moves:
+            slowest = max(last.root_moves.items(), key=lambda item: item[1][1])
+            lines.append(f"  slowest root move {slowest[0]}: {slowest[1][1]:.1f} ms (score {slowest[1][0]})")
+        lines.append(f"  last {count}: {mean_nodes:.0f} nodes, {mean_ms:.1f} ms avg, {max_ms:.1f} ms max")
+        return lines
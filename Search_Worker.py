@@ -0,0 +1,96 @@
+"""
+Background worker for the computer's search
+
+Runs Tic_Tac_Toe.computer_move on a worker thread so the frame loop keeps
+rendering while the computer is thinking.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import Tic_Tac_Toe as ttt
+from Search_Stats import SearchStats, StatsHistory
+
+
+class SearchWorker:
+    """
+    Single-thread executor for computer move searches with cancellation.
+
+    Usage:
+        worker = SearchWorker()
+        future = worker.submit(board, 'O', 'X')
+        ...
+        if future.done():
+            move = future.result()
+
+    Args:
+        instrument (bool): Collect SearchStats for every search; the latest is self.stats and
+            finished searches are added to self.history.
+    """
+
+    def __init__(self, instrument=False):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='computer-search')
+        self._stop_event = threading.Event()
+        self.future = None
+        self.instrument = instrument
+        self.stats = None  # Statistics of the current or last search when instrumenting
+        self.history = StatsHistory()
+
+    @property
+    def busy(self):
+        """
+        bool: True while a submitted search has not finished.
+        """
+        return self.future is not None and not self.future.done()
+
+    def submit(self, board, cs, ps, callback=None, **options):
+        """
+        Start searching for the computer's move.
+
+        The board is copied, so the caller may keep drawing and editing its own board.
+
+        Args:
+            board (list): The current game board.
+            cs (str): The symbol of the computer ('X' or 'O').
+            ps (str): The symbol of the player ('X' or 'O').
+            callback (callable): Optional function called with the move when the search
+                finishes; it runs on the worker thread.
+            **options: Extra keyword arguments for Tic_Tac_Toe.computer_move (e.g. time_budget_ms).
+
+        Returns:
+            concurrent.futures.Future: Resolves to the (row, column) move or None.
+        """
+        self.cancel()
+        self._stop_event = threading.Event()
+        board_copy = [row[:] for row in board]
+        if self.instrument:
+            self.stats = options['stats'] = SearchStats()
+        future = self._executor.submit(ttt.computer_move, board_copy, cs, ps,
+                                       stop_event=self._stop_event, **options)
+        if self.instrument:
+            stats = self.stats
+            future.add_done_callback(lambda done: None if done.cancelled() else self.history.add(stats))
+        if callback is not None:
+            future.add_done_callback(lambda done: None if done.cancelled() else callback(done.result()))
+        self.future = future
+        return future
+
+    def cancel(self):
+        """
+        Stop the current search, if any. A cancelled search resolves to its best move so far
+        or is dropped before it starts.
+        """
+        self._stop_event.set()
+        if self.future is not None:
+            self.future.cancel()
+            self.future = None
+
+    def shutdown(self, wait=True):
+        """
+        Cancel any running search and stop the worker thread.
+
+        Args:
+            wait (bool): Block until the worker thread has exited.
+        """
+        self.cancel()
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,275 @@
+"""
+Self-play tournaments on all CPU cores
+
+Plays configurable matchups between computer players in a process pool and
+streams every finished game to a game record file (see Game_Record; inspect
+it with python Game_Record.py summary|export LOG).
+
+Players:
+    alphabeta   Perfect play from the opening book on 3x3 (a random choice among the best
+                moves) and a timed Grid_Engine search on larger boards
+    depth:N     Grid_Engine search limited to N plies
+    random      A uniformly random empty cell
+
+A matchup is written 'X_PLAYER-vs-O_PLAYER@SIZE' or '...@SIZExWIN_LENGTH', for
+example 'alphabeta-vs-random@3' or 'depth:2-vs-alphabeta@5x4'. X moves first.
+
+Usage:
+    python Self_Play.py [--games 100] [--matchup SPEC ...] [--workers N] [--log games.bin]
+"""
+
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import Game_Record as gr
+import Grid_Engine as grid
+import Opening_Book as book
+
+DRAW, X_WON, O_WON = gr.DRAW, gr.X_WON, gr.O_WON
+
+DEFAULT_MATCHUPS = (
+    'alphabeta-vs-alphabeta@3',
+    'alphabeta-vs-random@3',
+    'random-vs-alphabeta@3',
+    'alphabeta-vs-depth:2@3',
+    'depth:2-vs-alphabeta@3',
+    'alphabeta-vs-random@4',
+    'alphabeta-vs-depth:2@4',
+    'alphabeta-vs-alphabeta@5x4',
+)
+
+# Function to parse a matchup specification
+def parse_matchup(spec):
+    """
+    Parse 'X_PLAYER-vs-O_PLAYER@SIZE[xWIN_LENGTH]'.
+
+    Args:
+        spec (str): The matchup specification.
+
+    Returns:
+        tuple: (x_player, o_player, size, win_length).
+
+    Raises:
+        ValueError: If the specification or a player name is malformed.
+    """
+    players, _, board = spec.partition('@')
+    x_player, separator, o_player = players.partition('-vs-')
+    if not separator or not board:
+        raise ValueError(f"malformed matchup: {spec!r}")
+    size, _, win_length = board.partition('x')
+    size = int(size)
+    win_length = int(win_length) if win_length else size
+    if not 1 <= win_length <= size <= gr.MAX_SIZE:
+        raise ValueError(f"unsupported board in matchup: {spec!r}")
+    for player in (x_player, o_player):
+        _player_depth(player)  # Validate the name
+    return x_player, o_player, size, win_length
+
+# Function to get the depth limit of a player name
+def _player_depth(player):
+    if player in ('alphabeta', 'random'):
+        return None
+    name, _, depth = player.partition(':')
+    if name != 'depth' or not depth.isdigit() or int(depth) < 1:
+        raise ValueError(f"unknown player: {player!r}")
+    return int(depth)
+
+# Function to choose one move for a player
+def choose_move(player, game, me_bits, opp_bits, rng, time_budget_ms):
+    """
+    Choose the move of one player.
+
+    Args:
+        player (str): The player name.
+        game (GridGame): The board size and win length.
+        me_bits (int): The bitboard of the side to move.
+        opp_bits (int): The bitboard of the opponent.
+        rng (random.Random): The random generator of the game.
+        time_budget_ms (float): Search time limit per move.
+
+    Returns:
+        tuple: (cell, depth, from_book) with the chosen cell, the completed search depth
+            (0 when no search ran) and whether the opening book answered.
+    """
+    occupied = me_bits | opp_bits
+    if player == 'random':
+        return rng.choice([cell for cell in range(game.cell_count) if not occupied >> cell & 1]), 0, False
+    if player == 'alphabeta' and game.size == 3 and game.win_length == 3:
+        found = book.lookup(me_bits, opp_bits)
+        if found is not None:
+            return rng.choice(found[0]), 0, True
+    cell, _, depth = grid.search(game, me_bits, opp_bits, time_budget_ms, max_depth=_player_depth(player))
+    return cell, depth, False
+
+# Function to play one game
+def play_game(x_player, o_player, game, rng, time_budget_ms):
+    """
+    Play one game, X first.
+
+    Args:
+        x_player (str): The name of the X player.
+        o_player (str): The name of the O player.
+        game (GridGame): The board size and win length.
+        rng (random.Random): The random generator of the game.
+        time_budget_ms (float): Search time limit per move.
+
+    Returns:
+        tuple: (result, moves, stats) with the result (DRAW, X_WON or O_WON), the moves as
+            (cell, ms since the start) and per side [moves, think seconds, summed search depth,
+            searched moves, book moves].
+    """
+    bits = [0, 0]
+    players = (x_player, o_player)
+    stats = ([0, 0.0, 0, 0, 0], [0, 0.0, 0, 0, 0])
+    moves = []
+    side = 0
+    game_start = time.perf_counter()
+    while True:
+        start = time.perf_counter()
+        cell, depth, from_book = choose_move(players[side], game, bits[side], bits[1 - side], rng, time_budget_ms)
+        now = time.perf_counter()
+        side_stats = stats[side]
+        side_stats[0] += 1
+        side_stats[1] += now - start
+        if depth:
+            side_stats[2] += depth
+            side_stats[3] += 1
+        side_stats[4] += from_book
+        bits[side] |= 1 << cell
+        moves.append((cell, 1000 * (now - game_start)))
+        if game.wins_through(bits[side], cell):
+            return (X_WON, O_WON)[side], moves, stats
+        if game.is_draw(bits[0], bits[1]):
+            return DRAW, moves, stats
+        side = 1 - side
+
+# Function to play a batch of games in a worker process
+def play_batch(spec, games, seed, time_budget_ms):
+    """
+    Play several games of one matchup.
+
+    Args:
+        spec (str): The matchup specification.
+        games (int): The number of games.
+        seed (int): Seed of the batch's random generator.
+        time_budget_ms (float): Search time limit per move.
+
+    Returns:
+        tuple: (spec, records, stats) with the games encoded as Game_Record events and the summed
+            per-side statistics.
+    """
+    x_player, o_player, size, win_length = parse_matchup(spec)
+    game = grid.get_game(size, win_length)
+    rng = random.Random(seed)
+    records = []
+    totals = ([0, 0.0, 0, 0, 0], [0, 0.0, 0, 0, 0])
+    results = [0, 0, 0]
+    for _ in range(games):
+        result, moves, stats = play_game(x_player, o_player, game, rng, time_budget_ms)
+        results[result] += 1
+        for total, side_stats in zip(totals, stats):
+            for index, value in enumerate(side_stats):
+                total[index] += value
+        records.append(gr.encode_game(x_player, o_player, moves, result, size, win_length))
+    return spec, records, {'results': results, 'sides': totals}
+
+# Function to run a tournament
+def run(matchups=DEFAULT_MATCHUPS, games=100, workers=None, log_path=None, time_budget_ms=20,
+        batch_size=25, seed=0):
+    """
+    Play every matchup across a process pool, streaming finished games to the log.
+
+    Args:
+        matchups (tuple): Matchup specifications.
+        games (int): Games per matchup.
+        workers (int): Worker processes (defaults to the CPU count).
+        log_path (str): Optional game record file, appended to if it exists.
+        time_budget_ms (float): Search time limit per move on boards larger than 3x3.
+        batch_size (int): Games per pool task.
+        seed (int): Base random seed; each task derives its own.
+
+    Returns:
+        dict: Per matchup results and statistics, plus 'games', 'seconds' and 'games_per_second'.
+    """
+    for spec in matchups:
+        parse_matchup(spec)  # Fail before starting the pool
+    summary = {spec: {'results': [0, 0, 0], 'sides': ([0, 0.0, 0, 0, 0], [0, 0.0, 0, 0, 0])} for spec in matchups}
+    log_file = gr.open_for_append(log_path) if log_path is not None else None
+
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = []
+            task = 0
+            for spec in matchups:
+                for first in range(0, games, batch_size):
+                    futures.append(pool.submit(play_batch, spec, min(batch_size, games - first),
+                                               seed * 1000003 + task, time_budget_ms))
+                    task += 1
+            for future in as_completed(futures):
+                spec, records, stats = future.result()
+                if log_file is not None:
+                    log_file.write(b''.join(records))
+                entry = summary[spec]
+                entry['results'] = [a + b for a, b in zip(entry['results'], stats['results'])]
+                for total, side_stats in zip(entry['sides'], stats['sides']):
+                    for index, value in enumerate(side_stats):
+                        total[index] += value
+    finally:
+        if log_file is not None:
+            log_file.close()
+    elapsed = time.perf_counter() - start
+    total_games = games * len(matchups)
+    return {'matchups': summary, 'games': total_games, 'seconds': elapsed,
+            'games_per_second': total_games / elapsed if elapsed else 0.0}
+
+# Function to format a tournament summary
+def report(summary):
+    """
+    Format a tournament summary as a table.
+
+    Args:
+        summary (dict): The result of run().
+
+    Returns:
+        str: One line per matchup with win rates and per-side search statistics.
+    """
+    lines = [f"{'matchup':<30} {'X won':>6} {'O won':>6} {'draw':>6}   "
+             f"{'X ms/move':>9} {'X depth':>7} {'X book':>6}   {'O ms/move':>9} {'O depth':>7} {'O book':>6}"]
+    for spec, entry in summary['matchups'].items():
+        draws, x_won, o_won = entry['results']
+        games = max(sum(entry['results']), 1)
+        columns = []
+        for moves, seconds, depth, searched, from_book in entry['sides']:
+            columns.append(f"{1000 * seconds / max(moves, 1):9.2f} {depth / max(searched, 1):7.1f} "
+                           f"{from_book / max(moves, 1):6.0%}")
+        lines.append(f"{spec:<30} {x_won / games:6.0%} {o_won / games:6.0%} {draws / games:6.0%}   "
+                     + "   ".join(columns))
+    lines.append(f"{summary['games']} games in {summary['seconds']:.2f} s "
+                 f"({summary['games_per_second']:.1f} games/s)")
+    return "\n".join(lines)
+
+# Command line entry point
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Play self-play tournaments between computer players.")
+    parser.add_argument('--games', type=int, default=100, help="games per matchup")
+    parser.add_argument('--matchup', action='append', dest='matchups', metavar='SPEC',
+                        help="matchup such as 'alphabeta-vs-random@3' (repeatable; defaults to a standard set)")
+    parser.add_argument('--workers', type=int, help="worker processes (defaults to the CPU count)")
+    parser.add_argument('--log', help="append finished games to this game record file")
+    parser.add_argument('--time-budget-ms', type=float, default=20, help="search time per move on larger boards")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    summary = run(tuple(args.matchups or DEFAULT_MATCHUPS), args.games, args.workers, args.log,
+                  args.time_budget_ms, seed=args.seed)
+    print(report(summary))
+    return 0
+
+# Run the command line entry point if the script is executed
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,48 +2,45 @@
 Contain All Tic Tac Toe major functions
 """
 
-import numpy as np
-import mediapipe as mp
-import tkinter as tk
+import time
+
+import Bitboard as bitboard
+import Grid_Engine as grid
+import Opening_Book as book
+import Transposition_Table as tt
 
 # Function to initialize the game board and turn
-def initialization():
+def initialization(size=3):
     """
     Initialize the game board and starting turn.
 
+    Args:
+        size (int): The number of rows and columns of the board.
+
     Returns:
-        tuple: A tuple containing the initialized board (3x3 grid of None) and starting turn (0 for player).
+        tuple: A tuple containing the initialized board (size x size grid of None) and starting turn (0 for player).
     """
-    board = [[None for _ in range(3)] for _ in range(3)]  # Initialize empty board
+    board = [[None for _ in range(size)] for _ in range(size)]  # Initialize empty board
     turn = 0  # Player's turn
     return board, turn
 
 # Function to check for a win condition
-def is_win(board, player_symbol):
+def is_win(board, player_symbol, win_length=None):
     """
     Check if the given player has won the game.
 
     Args:
         board (list): The current game board.
         player_symbol (str): The symbol of the player ('X' or 'O').
+        win_length (int): The number of marks in a row needed to win (defaults to the board size).
 
     Returns:
         bool: True if the player has won, False otherwise.
     """
-    # Check rows for matching symbols
-    for ri in range(3):
-        if all(board[ri][ci] == player_symbol for ci in range(3)):
-            return True
-    # Check columns for matching symbols
-    for ci in range(3):
-        if all(board[ri][ci] == player_symbol for ri in range(3)):
-            return True
-    # Check diagonals for matching symbols
-    if all(board[i][i] == player_symbol for i in range(3)):
-        return True
-    if all(board[i][2 - i] == player_symbol for i in range(3)):
-        return True
-    return False
+    if len(board) == 3 and win_length in (None, 3):
+        return bitboard.is_win(bitboard.from_list(board, player_symbol))
+    game = grid.get_game(len(board), win_length)
+    return game.is_win(game.from_list(board, player_symbol))
 
 # Function to check if the game is a draw
 def is_draw(board):
@@ -57,6 +54,8 @@ def is_draw(board):
         bool: True if the game is a draw, False otherwise.
     """
     # Check if all cells are filled with X or O
+    if len(board) == 3:
+        return bitboard.is_draw(bitboard.from_list(board, 'X'), bitboard.from_list(board, 'O'))
     return all(all(cell is not None for cell in row) for row in board)
 
 # Function to determine if a move is valid
@@ -79,6 +78,8 @@ def alpha_beta(board, depth, alpha, beta, is_maximizing, cs, ps):
     """
     Alpha-Beta Pruning algorithm to evaluate game states and determine the optimal move.
 
+    The search itself runs on bitboards (see Bitboard.alpha_beta).
+
     Args:
         board (list): The current game board.
         depth (int): The current depth in the game tree.
@@ -91,67 +92,48 @@ def alpha_beta(board, depth, alpha, beta, is_maximizing, cs, ps):
     Returns:
         int: The evaluation score of the current game state.
     """
-    # Check for terminal states (win/loss/draw) and return their scores
-    if is_win(board, cs):
-        return 1
-    if is_win(board, ps):
-        return -1
-    if is_draw(board):
-        return 0
-
-    # Maximizing player's turn
-    if is_maximizing:
-        max_eval = -float('inf')
-        for r in range(3):
-            for c in range(3):
-                if is_valid_move(board, r, c):
-                    board[r][c] = cs
-                    eval = alpha_beta(board, depth + 1, alpha, beta, False, cs, ps)
-                    board[r][c] = None
-                    max_eval = max(max_eval, eval)
-                    alpha = max(alpha, eval)
-                    if beta <= alpha:
-                        break
-        return max_eval
-    # Minimizing player's turn
-    else:
-        min_eval = float('inf')
-        for r in range(3):
-            for c in range(3):
-                if is_valid_move(board, r, c):
-                    board[r][c] = ps
-                    eval = alpha_beta(board, depth + 1, alpha, beta, True, cs, ps)
-                    board[r][c] = None
-                    min_eval = min(min_eval, eval)
-                    beta = min(beta, eval)
-                    if beta <= alpha:
-                        break
-        return min_eval
+    cs_bits = bitboard.from_list(board, cs)
+    ps_bits = bitboard.from_list(board, ps)
+    return bitboard.alpha_beta(cs_bits, ps_bits, depth, alpha, beta, is_maximizing)
 
 # Function to determine the computer's move using Alpha-Beta Pruning
-def computer_move(board, cs, ps):
+def computer_move(board, cs, ps, table=None, use_book=True, win_length=None,
+                  time_budget_ms=grid.DEFAULT_TIME_BUDGET_MS, stop_event=None, stats=None):
     """
     Determine the optimal move for the computer using the Alpha-Beta Pruning algorithm.
 
+    Boards other than 3x3 (or 3x3 with a different win length) are searched by
+    Grid_Engine with iterative deepening under time_budget_ms.
+
     Args:
         board (list): The current game board.
         cs (str): The symbol of the computer ('X' or 'O').
         ps (str): The symbol of the player ('X' or 'O').
+        table (TranspositionTable): The transposition table to search with; defaults to the
+            process-wide table so results carry over between moves and games.
+        use_book (bool): Answer from the precomputed opening book when the position is stored.
+        win_length (int): The number of marks in a row needed to win (defaults to the board size).
+        time_budget_ms (float): Hard limit on the search time in milliseconds for larger boards.
+        stop_event (threading.Event): Optional event that ends a larger board search early when set.
+        stats (SearchStats): Optional statistics filled in with the work of this move (see Search_Stats).
 
     Returns:
         tuple: The best move as a tuple (row, column) or None if no valid move is found.
     """
-    best_score = -float('inf')
-    best_move = None
-    for r in range(3):
-        for c in range(3):
-            if is_valid_move(board, r, c):
-                board[r][c] = cs
-                score = alpha_beta(board, 0, -float('inf'), float('inf'), False, cs, ps)
-                board[r][c] = None
-                if score > best_score:
-                    best_score = score
-                    best_move = (r, c)
-    return best_move
-
-
+    if len(board) != 3 or win_length not in (None, 3):
+        return grid.computer_move(board, cs, ps, win_length, time_budget_ms, stop_event, stats)
+
+    start = time.perf_counter()
+    cs_bits = bitboard.from_list(board, cs)
+    ps_bits = bitboard.from_list(board, ps)
+    cell = book.best_move(cs_bits, ps_bits) if use_book else None
+    if cell is not None and stats is not None:
+        stats.source = 'book'
+        stats.elapsed_ms += 1000 * (time.perf_counter() - start)
+    if cell is None:
+        if table is None:
+            table = tt.get_shared_table()
+        cell = bitboard.computer_move(cs_bits, ps_bits, table, stats)
+    if cell is None:
+        return None
+    return divmod(cell, 3)
@@ -0,0 +1,169 @@
+"""
+Transposition table for the bitboard Alpha-Beta search
+
+Positions are keyed on a canonical hash shared by all 8 rotations and
+reflections of the board, so symmetric positions are searched only once.
+"""
+
+from collections import OrderedDict
+
+# Bound flags stored with each score
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+EVICTION_POLICIES = ('lru', 'fifo')
+
+# Cell permutations of the 8 board symmetries (new cell -> old cell)
+_CELL_MAPS = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),  # Identity
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),  # Rotate 90
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),  # Rotate 180
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),  # Rotate 270
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),  # Mirror left-right
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),  # Mirror top-bottom
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),  # Transpose
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),  # Anti-transpose
+)
+
+# Function to build the lookup table of one symmetry
+def _symmetry_table(cell_map):
+    """
+    Precompute a symmetry applied to every possible 9-bit bitboard.
+
+    Args:
+        cell_map (tuple): For every target cell, the source cell it takes its mark from.
+
+    Returns:
+        tuple: 512 entries mapping a bitboard to its transformed bitboard.
+    """
+    table = []
+    for bits in range(1 << 9):
+        transformed = 0
+        for cell, source in enumerate(cell_map):
+            if bits >> source & 1:
+                transformed |= 1 << cell
+        table.append(transformed)
+    return tuple(table)
+
+SYMMETRIES = tuple(_symmetry_table(cell_map) for cell_map in _CELL_MAPS)
+
+# Function to compute the canonical key of a position
+def canonical_key(cs_bits, ps_bits, is_maximizing):
+    """
+    Compute the symmetry-independent key of a position.
+
+    Args:
+        cs_bits (int): The bitboard of the computer.
+        ps_bits (int): The bitboard of the player.
+        is_maximizing (bool): Flag indicating if the computer is to move.
+
+    Returns:
+        int: The smallest key among the 8 symmetric variants of the position.
+    """
+    side = 1 if is_maximizing else 0
+    return min((sym[cs_bits] << 10) | (sym[ps_bits] << 1) | side for sym in SYMMETRIES)
+
+
+class TranspositionTable:
+    """
+    Bounded table of searched positions with hit/miss counters.
+
+    Args:
+        size (int): The maximum number of stored positions.
+        policy (str): The eviction policy, 'lru' or 'fifo'.
+    """
+
+    def __init__(self, size=1 << 16, policy='lru'):
+        if size <= 0:
+            raise ValueError("size must be positive")
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy!r}")
+        self.size = size
+        self.policy = policy
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Look up a stored position.
+
+        Args:
+            key (int): The canonical key of the position.
+
+        Returns:
+            tuple: The stored (score, flag) pair or None if the position is unknown.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == 'lru':
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key, score, flag):
+        """
+        Store the result of a search, evicting an old entry when the table is full.
+
+        Args:
+            key (int): The canonical key of the position.
+            score (int): The score found by the search.
+            flag (int): EXACT, LOWER or UPPER depending on how the score relates to the window.
+        """
+        entries = self._entries
+        if key in entries:
+            if self.policy == 'lru':
+                entries.move_to_end(key)
+        elif len(entries) >= self.size:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = (score, flag)
+
+    def clear(self):
+        """
+        Remove all stored positions and reset the counters.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Report the table usage counters.
+
+        Returns:
+            dict: Entry count, capacity, hits, misses, evictions and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'size': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+_shared_table = None
+
+# Function to get the process-wide table
+def get_shared_table():
+    """
+    Get the transposition table shared by all games in this process.
+
+    Returns:
+        TranspositionTable: The shared table, created on first use.
+    """
+    global _shared_table
+    if _shared_table is None:
+        _shared_table = TranspositionTable()
+    return _shared_table
@@ -0,0 +1,147 @@
+"""
+Threaded camera capture with latest-frame semantics
+
+A background thread reads frames as fast as the source delivers them into a
+small ring buffer. When the consumer falls behind, the oldest frames are
+dropped, so the frame handed out is never older than one capture interval.
+Given a FramePool, frames are read into pooled buffers and dropped frames go
+back to the pool; the consumer releases the frames it reads.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class ThreadedCapture:
+    """
+    Capture frames on a background thread into a bounded ring buffer.
+
+    The object can be used in place of cv2.VideoCapture: read() returns
+    (ret, frame) with the newest frame not yet returned.
+
+    Args:
+        source: Any object with read() -> (ret, frame), isOpened() and release(),
+            such as cv2.VideoCapture.
+        buffer_size (int): The number of frames kept; older frames are dropped.
+        pool (FramePool): Optional pool to read frames into; the source's read() must accept a buffer.
+    """
+
+    def __init__(self, source, buffer_size=2, pool=None):
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+        self.source = source
+        self.pool = pool
+        self._frames = deque(maxlen=buffer_size)
+        self._handed_out = set()  # Ids of buffered frames returned to the consumer
+        self._condition = threading.Condition()
+        self._running = False
+        self._ended = False
+        self._thread = None
+        self._last_id = -1
+        self.captured = 0  # Frames read from the source
+        self.dropped = 0  # Frames skipped because a newer one was available
+
+    def start(self):
+        """
+        Start the capture thread.
+
+        Returns:
+            ThreadedCapture: self, for chaining.
+        """
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='video-capture', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        pool = self.pool
+        while self._running:
+            buffer = pool.acquire() if pool is not None else None
+            if buffer is not None:
+                ret, frame = self.source.read(buffer)
+            else:
+                ret, frame = self.source.read()
+            timestamp = time.perf_counter()
+            if ret and pool is not None:
+                pool.track(frame, buffer)
+            with self._condition:
+                if not ret:
+                    self._ended = True
+                    self._condition.notify_all()
+                    return
+                if len(self._frames) == self._frames.maxlen:
+                    frame_id, _, dropped_frame = self._frames[0]
+                    if frame_id in self._handed_out:
+                        self._handed_out.discard(frame_id)
+                    elif pool is not None:
+                        pool.release(dropped_frame)  # Never read, so nothing else refers to it
+                self._frames.append((self.captured, timestamp, frame))
+                self.captured += 1
+                self._condition.notify_all()
+
+    def isOpened(self):
+        """
+        Check if the source is open and still delivering frames.
+
+        Returns:
+            bool: True while frames can be read.
+        """
+        return self.source.isOpened() and not self._ended
+
+    def latest(self):
+        """
+        Get the newest captured frame without waiting.
+
+        Returns:
+            tuple: (frame_id, timestamp, frame) or None if nothing has been captured yet.
+        """
+        with self._condition:
+            return self._frames[-1] if self._frames else None
+
+    def read_timestamped(self, timeout=None):
+        """
+        Wait for a frame newer than the last one returned and return the newest.
+
+        Args:
+            timeout (float): Seconds to wait; None waits until a frame arrives or the source ends.
+
+        Returns:
+            tuple: (frame_id, timestamp, frame) where timestamp is the time.perf_counter()
+                value when the frame was captured, or None on timeout or end of stream.
+        """
+        with self._condition:
+            ready = self._condition.wait_for(
+                lambda: (self._frames and self._frames[-1][0] > self._last_id) or self._ended,
+                timeout,
+            )
+            if not ready or not self._frames or self._frames[-1][0] <= self._last_id:
+                return None
+            entry = self._frames[-1]
+            self.dropped += entry[0] - self._last_id - 1
+            self._last_id = entry[0]
+            self._handed_out.add(entry[0])
+            return entry
+
+    def read(self):
+        """
+        Read the newest frame, like cv2.VideoCapture.read().
+
+        Returns:
+            tuple: (ret, frame) where ret is False once the source has ended.
+        """
+        entry = self.read_timestamped()
+        if entry is None:
+            return False, None
+        return True, entry[2]
+
+    def release(self):
+        """
+        Stop the capture thread and release the source.
+        """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.source.release()
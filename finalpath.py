@@ -4,11 +4,24 @@ import threading
 import os
 
 # Import your game functions
-import Handy_Tic_Tac_Toe as game
+from Play_Session import PlaySession
 
-# Start the game in a new thread
+# Webcam and hand model stay open between games, so only the first launch waits for them
+session = PlaySession()
+
+# Start the game in a new thread, unless one is already running
 def start_game():
-    threading.Thread(target=game.main).start()
+    if not session.start():
+        messagebox.showinfo("Handy Tic Tac Toe", "A game is already running.")
+
+# End the running game
+def stop_game():
+    session.stop()
+
+# End the running game, release the webcam and close the launcher
+def quit_app():
+    session.close()
+    root.quit()
 
 # Show game instructions
 def show_instructions():
@@ -18,7 +31,7 @@ def show_instructions():
     1. Use your index finger to point to the grid cells.
     2. Keep your finger steady for a few seconds to select a cell.
     3. Your goal is to align three symbols (X or O) in a row, column, or diagonal.
-    4. You can quit anytime by pressing 'quit'.
+    4. You can quit anytime by pressing 'q' or 'Stop Game'.
     
     Have fun playing!
     """
@@ -29,7 +42,7 @@ def show_instructions():
 # Main window setup
 root = tk.Tk()
 root.title("Handy Tic Tac Toe")
-root.geometry("400x300")
+root.geometry("400x350")
 root.resizable(False, False)
 
 # Title
@@ -43,11 +56,17 @@ start_button.pack(pady=10)
 instructions_button = tk.Button(root, text="Instructions", command=show_instructions, width=15, bg="#2196F3", fg="white")
 instructions_button.pack(pady=10)
 
+stop_button = tk.Button(root, text="Stop Game", command=stop_game, width=15, bg="#FF9800", fg="white")
+stop_button.pack(pady=10)
 
 
 
-quit_button = tk.Button(root, text="Quit", command=root.quit, width=15, bg="#F44336", fg="white")
+
+quit_button = tk.Button(root, text="Quit", command=quit_app, width=15, bg="#F44336", fg="white")
 quit_button.pack(pady=10)
 
+# Open the webcam and load the hand model while the launcher is shown
+threading.Thread(target=session.open, name='session-warmup', daemon=True).start()
+
 # Run the frontend
 root.mainloop()
@@ -1,16 +1,25 @@
 import cv2
-import numpy as np
 import mediapipe as mp
 import time
+import Grid_Engine as grid
+from Gesture_Selection import PinchDetector, assign_hands
+from Game_Flow import GameFlow, NAME_ENTRY, PLAY, RESULT, REMATCH, QUIT, ESCAPE
+import Game_Record as gr
+from Hand_ROI import RoiHands
+from Frame_Buffers import FramePool
 
 # Initialize MediaPipe hands model
 mp_hands = mp.solutions.hands
 mp_drawing = mp.solutions.drawing_utils
-hands = mp_hands.Hands(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+hands = mp_hands.Hands(max_num_hands=2, min_detection_confidence=0.5, min_tracking_confidence=0.5)  # Both players' hands
+roi_tracking = True  # Track hands on a crop around the grid and the hands instead of the whole frame
+if roi_tracking:
+    hands = RoiHands(hands)
 
 # Game variables
 cell_size = 200  # Size of each cell for display
 grid_size = 3  # Size of the grid (3x3)
+win_length = grid_size  # Marks in a row needed to win
 symbols = ['X', 'O']
 
 # Game board
@@ -18,6 +27,11 @@ board = [[None for _ in range(grid_size)] for _ in range(grid_size)]
 current_turn = 0  # 0 for Player 1, 1 for Player 2
 players = ["Player 1", "Player 2"]  # Placeholder for player names
 last_move = None  # To track the last move
+recorder = None  # Game record of the session, opened in main
+record_path = None  # Game record file to append every game to (e.g. gr.DEFAULT_PATH); None records nothing
+hand_assignment = 'side'  # 'side': Player 1 stands on the left of the picture; 'handedness': Player 1 plays left-handed
+pinch_detectors = [PinchDetector(), PinchDetector()]  # Debounced pinches of each player's hand
+frames = FramePool()  # Capture and RGB buffers reused for every frame
 
 # Define colors
 colors = {
@@ -29,14 +43,8 @@ colors = {
 }
 
 def is_win(board, player_symbol):
-    for i in range(grid_size):
-        if all(board[i][j] == player_symbol for j in range(grid_size)) or \
-           all(board[j][i] == player_symbol for j in range(grid_size)):
-            return True
-    if all(board[i][i] == player_symbol for i in range(grid_size)) or \
-       all(board[i][grid_size - 1 - i] == player_symbol for i in range(grid_size)):
-        return True
-    return False
+    game = grid.get_game(grid_size, win_length)
+    return game.is_win(game.from_list(board, player_symbol))
 
 def is_draw(board):
     return all(all(cell is not None for cell in row) for row in board)
@@ -49,28 +57,69 @@ def play_turn(row, col):
     if is_valid_move(board, row, col):
         board[row][col] = symbols[current_turn]
         last_move = (row, col)  # Track the last move
+        if recorder is not None:
+            recorder.record_move(row * grid_size + col)
         if is_win(board, symbols[current_turn]):
+            if recorder is not None:
+                recorder.end_game(gr.X_WON if current_turn == 0 else gr.O_WON)
             return f"{players[current_turn]} wins!"
         elif is_draw(board):
+            if recorder is not None:
+                recorder.end_game(gr.DRAW)
             return "It's a Draw!"
         current_turn = 1 - current_turn  # Switch turn
     return None
 
-# Helper function to detect gestures
-def detect_gesture(hand_landmarks):
-    index_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-    thumb_tip = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_TIP]
-
-    distance = np.sqrt((index_tip.x - thumb_tip.x) ** 2 + (index_tip.y - thumb_tip.y) ** 2)
-    pinch_threshold = 0.05  # Adjust based on your requirements
+# Draw the grid and the current board state onto the frame
+def draw_board(frame):
+    for i in range(1, grid_size):
+        cv2.line(frame, (0, i * cell_size), (grid_size * cell_size, i * cell_size), colors["grid"], 2)
+        cv2.line(frame, (i * cell_size, 0), (i * cell_size, grid_size * cell_size), colors["grid"], 2)
 
-    if distance < pinch_threshold:
-        return "pinch"
-    return None
+    for i in range(grid_size):
+        for j in range(grid_size):
+            if board[i][j] == 'X':
+                cv2.putText(frame, 'X', (j * cell_size + 20, i * cell_size + 80),
+                            cv2.FONT_HERSHEY_SIMPLEX, 3, colors["X"], 5)
+            elif board[i][j] == 'O':
+                cv2.putText(frame, 'O', (j * cell_size + 20, i * cell_size + 80),
+                            cv2.FONT_HERSHEY_SIMPLEX, 3, colors["O"], 5)
+
+# Give each player their own hand and pinch state; only the player whose turn it is can place a mark
+def track_players(frame, results, flow, w, h):
+    now = time.monotonic()
+    player_hands = assign_hands(results.multi_hand_landmarks, results.multi_handedness, hand_assignment,
+                                single=current_turn)  # The grid sits left of centre, so a lone hand is the mover's
+    for player, hand_landmarks in enumerate(player_hands):
+        pinched = pinch_detectors[player].update(hand_landmarks, now)
+        if hand_landmarks is None:
+            continue
+        mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+        finger_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
+        x, y = int(finger_tip.x * w), int(finger_tip.y * h)
+        cv2.putText(frame, players[player], (x + 10, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                    colors[symbols[player]], 2)  # Show whose hand this is
+        if player != current_turn or flow.state != PLAY:
+            continue
+        if recorder is not None:
+            recorder.add_point(x, y)  # Fingertip trace leading up to the next move
+        row, col = y // cell_size, x // cell_size
+
+        # Highlight cell for the index finger position
+        if 0 <= row < grid_size and 0 <= col < grid_size:
+            cv2.rectangle(frame, (col * cell_size, row * cell_size),
+                          ((col + 1) * cell_size, (row + 1) * cell_size), colors["highlight"], 2)
+
+            # Place symbol only when a new pinch begins over an empty cell
+            if pinched and is_valid_move(board, row, col):
+                result = play_turn(row, col)
+                if result:
+                    flow.finish_game(result)
+                return  # At most one move per frame
 
 # Main function
 def main():
-    global current_turn, last_move  # Ensure last_move is recognized as global
+    global current_turn, last_move, recorder  # Ensure last_move is recognized as global
     cap = cv2.VideoCapture(0)
 
     # Set camera resolution
@@ -80,115 +129,86 @@ def main():
     if not cap.isOpened():
         print("Error: Camera not accessible.")
         return
+    if record_path:
+        recorder = gr.GameRecorder(record_path)  # Append every game to the record file
 
-    input_phase = True
+    flow = GameFlow(splash_time=0, result_time=2.0)  # Name entry -> play -> result -> rematch, never blocking
     player_input_index = 0
     temp_name = ""
 
     while True:
-        ret, frame = cap.read()
+        ret, frame = cap.read(frames.slot('capture'))  # Read into the previous frame's buffer
         if not ret:
             print("Error: Failed to capture image.")
             break
+        frames.keep('capture', frame)
+        frames.frame()
 
-        frame = cv2.flip(frame, 1)
+        cv2.flip(frame, 1, dst=frame)  # Mirror in place
         h, w, _ = frame.shape
+        if roi_tracking:
+            # The grid occupies the top left grid_size * cell_size pixels
+            hands.play_area = (0.0, 0.0, min(grid_size * cell_size / w, 1.0), min(grid_size * cell_size / h, 1.0))
+
+        # Detect hands on the camera image before anything is drawn over it, on every screen so
+        # tracking is already locked on when play starts
+        frame_rgb = frames.keep('rgb', cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frames.slot('rgb')))
+        results = hands.process(frame_rgb)
 
         # Handle name input phase
-        if input_phase:
+        if flow.state == NAME_ENTRY:
             prompt_text = f"Enter {players[player_input_index]} Name: {temp_name}_"
             cv2.putText(frame, prompt_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, colors["text"], 2)
-            cv2.imshow("Tic Tac Toe", frame)
+        else:
+            draw_board(frame)
+            track_players(frame, results, flow, w, h)
+
+            if flow.state in (RESULT, REMATCH):
+                # Show the result of the game and highlight the last move
+                cv2.putText(frame, flow.result, (10, 350), cv2.FONT_HERSHEY_SIMPLEX, 1, colors["text"], 2)
+                if flow.state == REMATCH:
+                    cv2.putText(frame, "Press 'r' to play again or 'q' to quit", (10, 400), cv2.FONT_HERSHEY_SIMPLEX, 0.7, colors["text"], 2)
+                if last_move:
+                    row, col = last_move
+                    cv2.rectangle(frame, (col * cell_size, row * cell_size),
+                                  ((col + 1) * cell_size, (row + 1) * cell_size), colors["highlight"], 2)
+            else:
+                # Show current player turn
+                instruction_text = f"{players[current_turn]}'s Turn ({symbols[current_turn]})"
+                cv2.putText(frame, instruction_text, (10, grid_size * cell_size + 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, colors["text"], 2)
 
-            key = cv2.waitKey(1) & 0xFF
+        # Show the frame
+        cv2.imshow("Tic Tac Toe", frame)
+        key = cv2.waitKey(1)
+
+        # Type names, rematch with 'r', quit with 'q' (Escape while typing)
+        previous_state = flow.state
+        if previous_state == NAME_ENTRY and key != -1:
+            key &= 0xFF
             if key == ord('\r') or key == ord('\n'):  # Enter key to submit name
                 players[player_input_index] = temp_name
                 player_input_index += 1
                 temp_name = ""
                 if player_input_index >= 2:
-                    input_phase = False
+                    flow.finish_name()
             elif key == ord('\b') and len(temp_name) > 0:  # Backspace to edit
                 temp_name = temp_name[:-1]
-            elif key != 255:  # Typing letters
+            elif key != ESCAPE:  # Typing letters
                 temp_name += chr(key)
-            continue
-
-        # Draw tic-tac-toe grid
-        for i in range(1, grid_size):
-            cv2.line(frame, (0, i * cell_size), (grid_size * cell_size, i * cell_size), colors["grid"], 2)
-            cv2.line(frame, (i * cell_size, 0), (i * cell_size, grid_size * cell_size), colors["grid"], 2)
-
-        # Draw current board state
-        for i in range(grid_size):
-            for j in range(grid_size):
-                if board[i][j] == 'X':
-                    cv2.putText(frame, 'X', (j * cell_size + 20, i * cell_size + 80),
-                                cv2.FONT_HERSHEY_SIMPLEX, 3, colors["X"], 5)
-                elif board[i][j] == 'O':
-                    cv2.putText(frame, 'O', (j * cell_size + 20, i * cell_size + 80),
-                                cv2.FONT_HERSHEY_SIMPLEX, 3, colors["O"], 5)
-
-        # Detect hands and track finger positions
-        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-
-                # Detect gesture
-                gesture = detect_gesture(hand_landmarks)
-                finger_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                x, y = int(finger_tip.x * w), int(finger_tip.y * h)
-                row, col = y // cell_size, x // cell_size
-
-                # Highlight cell for the index finger position
-                if 0 <= row < grid_size and 0 <= col < grid_size:
-                    cv2.rectangle(frame, (col * cell_size, row * cell_size),
-                                  ((col + 1) * cell_size, (row + 1) * cell_size), colors["highlight"], 2)
-
-                    # Place symbol only if pinch gesture detected over an empty cell
-                    if gesture == "pinch" and is_valid_move(board, row, col):
-                        result = play_turn(row, col)
-                        time.sleep(0.5)  # Add delay to prevent multiple placements
-
-                        if result:
-                            # Show the result of the game
-                            cv2.putText(frame, result, (10, 350), cv2.FONT_HERSHEY_SIMPLEX, 1, colors["text"], 2)
-                            cv2.putText(frame, "Press 'r' to play again or 'q' to quit", (10, 400), cv2.FONT_HERSHEY_SIMPLEX, 0.7, colors["text"], 2)
-                            cv2.imshow("Tic Tac Toe", frame)
-                            cv2.waitKey(2000)  # Wait to show the result
-
-                            # Highlight the last move
-                            if last_move:
-                                row, col = last_move
-                                cv2.rectangle(frame, (col * cell_size, row * cell_size),
-                                              ((col + 1) * cell_size, (row + 1) * cell_size), colors["highlight"], 2)
-                                cv2.putText(frame, symbols[current_turn], (col * cell_size + 20, row * cell_size + 80),
-                                            cv2.FONT_HERSHEY_SIMPLEX, 3, colors[symbols[current_turn]], 5)
-                            cv2.imshow("Tic Tac Toe", frame)
-
-                            # Ask for user input to play again or quit
-                            while True:
-                                key = cv2.waitKey(1) & 0xFF
-                                if key == ord('r'):  # Reset game
-                                    board[:] = [[None for _ in range(grid_size)] for _ in range(grid_size)]
-                                    current_turn = 0
-                                    last_move = None  # Reset last_move when starting a new game
-                                    break
-                                elif key == ord('q'):  # Quit game
-                                    cap.release()
-                                    cv2.destroyAllWindows()
-                                    return
-
-        # Show current player turn
-        instruction_text = f"{players[current_turn]}'s Turn ({symbols[current_turn]})"
-        cv2.putText(frame, instruction_text, (10, grid_size * cell_size + 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, colors["text"], 2)
-
-        # Show the frame
-        cv2.imshow("Tic Tac Toe", frame)
-
-        if cv2.waitKey(1) & 0xFF == ord('q'):
+        flow.update(key)
+        if flow.state == PLAY and previous_state != PLAY:
+            if previous_state in (RESULT, REMATCH):  # Reset game
+                board[:] = [[None for _ in range(grid_size)] for _ in range(grid_size)]
+                current_turn = 0
+                last_move = None  # Reset last_move when starting a new game
+            if recorder is not None:
+                recorder.start_game(players[0], players[1], grid_size, win_length)
+        if flow.state == QUIT:
             break
 
+    if recorder is not None:
+        recorder.close()  # An unfinished game is recorded as abandoned
+    print(frames.report())
     cap.release()
     cv2.destroyAllWindows()
 
@@ -0,0 +1,117 @@
+"""
+Tests for the assignment of detected hands to players and for dwell cell selection
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from Gesture_Selection import CellSelector, assign_hands
+
+FRAME_SIZE = (300, 300)  # Cells of 100 x 100 pixels
+
+
+# Function to build hand landmarks with the wrist at a given x coordinate
+def make_hand(wrist_x):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=wrist_x, y=0.5, z=0.0) for _ in range(21)])
+
+
+def test_two_hands_go_by_side():
+    left, right = make_hand(0.2), make_hand(0.7)
+    assert assign_hands([right, left]) == [left, right]
+
+
+def test_single_hand_goes_by_split_by_default():
+    hand = make_hand(0.3)
+    assert assign_hands([hand]) == [hand, None]
+    assert assign_hands([hand], split=0.25) == [None, hand]
+
+
+def test_single_hand_goes_to_the_given_player():
+    # Player 2 playing alone over a grid on the left half of the frame
+    hand = make_hand(0.3)
+    assert assign_hands([hand], single=1) == [None, hand]
+    assert assign_hands([hand], single=0) == [hand, None]
+
+
+def test_no_hands():
+    assert assign_hands(None, single=1) == [None, None]
+
+
+# Function to build a selector whose filter follows the fingertip without lag
+def make_selector():
+    return CellSelector(dwell_time=1.0, hysteresis=0.15, lost_grace=0.25, min_cutoff=1000.0)
+
+
+def test_dwell_confirms_after_dwell_time():
+    selector = make_selector()
+    assert selector.update((150, 150), 0.0, FRAME_SIZE) is None
+    assert selector.update((150, 150), 0.9, FRAME_SIZE) is None
+    assert selector.take_selection() is None
+    assert selector.update((150, 150), 1.0, FRAME_SIZE) == 4
+    assert selector.take_selection() == (4, 1.0)
+    assert selector.take_selection() is None
+
+
+def test_confirmation_is_kept_until_taken():
+    selector = make_selector()
+    selector.update((150, 150), 0.0, FRAME_SIZE)
+    selector.update((150, 150), 1.0, FRAME_SIZE)
+    # Later frames neither confirm again nor clear the pending selection
+    assert selector.update((150, 150), 1.5, FRAME_SIZE) is None
+    assert selector.take_selection() == (4, 1.0)
+
+
+def test_hysteresis_keeps_the_cell_near_a_border():
+    selector = make_selector()
+    selector.update((150, 150), 0.0, FRAME_SIZE)
+    # 10 pixels past the border is within the 15 pixel margin: the dwell goes on
+    assert selector.update((210, 150), 0.5, FRAME_SIZE) is None
+    assert selector.cell == 4
+    assert selector.update((210, 150), 1.0, FRAME_SIZE) == 4
+
+
+def test_moving_past_the_margin_restarts_the_dwell():
+    selector = make_selector()
+    selector.update((150, 150), 0.0, FRAME_SIZE)
+    assert selector.update((220, 150), 0.5, FRAME_SIZE) is None
+    assert selector.cell == 5
+    assert selector.update((220, 150), 1.0, FRAME_SIZE) is None
+    assert selector.update((220, 150), 1.5, FRAME_SIZE) == 5
+
+
+def test_short_loss_of_the_hand_keeps_the_dwell():
+    selector = make_selector()
+    selector.update((150, 150), 0.0, FRAME_SIZE)
+    selector.update((150, 150), 0.5, FRAME_SIZE)
+    assert selector.update(None, 0.6, FRAME_SIZE) is None
+    assert selector.update((150, 150), 0.7, FRAME_SIZE) is None
+    assert selector.update((150, 150), 1.0, FRAME_SIZE) == 4
+    selector.update(None, 1.5, FRAME_SIZE)
+    assert selector.cell is None  # Lost for longer than lost_grace
+
+
+def test_restart_dwell_delays_confirmation():
+    selector = make_selector()
+    selector.update((150, 150), 0.0, FRAME_SIZE)
+    selector.restart_dwell(0.6)
+    assert selector.update((150, 150), 1.0, FRAME_SIZE) is None
+    assert selector.progress(1.0) == pytest.approx(0.4)
+    assert selector.update((150, 150), 1.6, FRAME_SIZE) == 4
+
+
+def test_restart_dwell_drops_an_untaken_confirmation():
+    selector = make_selector()
+    selector.update((150, 150), 0.0, FRAME_SIZE)
+    selector.update((150, 150), 1.0, FRAME_SIZE)
+    selector.restart_dwell(1.0)
+    assert selector.take_selection() is None
+    assert selector.update((150, 150), 1.5, FRAME_SIZE) is None
+    assert selector.update((150, 150), 2.0, FRAME_SIZE) == 4
+
+
+def test_restart_dwell_before_the_dwell_started_is_ignored():
+    selector = make_selector()
+    selector.update((150, 150), 0.5, FRAME_SIZE)
+    selector.restart_dwell(0.2)
+    assert selector.update((150, 150), 1.5, FRAME_SIZE) == 4